@@ -0,0 +1,165 @@
+"""Benchmarks for the SvnModel layer against a generated local repository.
+
+    python -m benchmarks.bench_model --files 2000 --revisions 300 -o results.json
+    python -m benchmarks.bench_model --compare results.json -o new.json
+
+Everything runs against file:// URLs, so no network or server is involved.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.repo_generator import RepoShape, generate_working_copy
+from lazysvn.svn_model import SvnModel
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the lazysvn model layer")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--dirs", type=int, default=20)
+    parser.add_argument("--modified", type=int, default=100)
+    parser.add_argument("--unversioned", type=int, default=50)
+    parser.add_argument("--revisions", type=int, default=200)
+    parser.add_argument("--paths-per-commit", type=int, default=5)
+    parser.add_argument("--commit-files", type=int, default=10,
+                        help="files staged and committed per commit_staged run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--log-page", type=int, default=100)
+    parser.add_argument("-o", "--output", default=None, metavar="FILE",
+                        help="write results as JSON")
+    parser.add_argument("--compare", default=None, metavar="FILE",
+                        help="previous results to compare against")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the generated repository and print its path")
+    return parser.parse_args()
+
+
+def time_runs(repeat: int, func: Callable[[], object],
+              setup: Optional[Callable[[], object]] = None) -> List[float]:
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def summarize(runs: List[float]) -> Dict[str, object]:
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.fmean(runs),
+        "max": max(runs),
+    }
+
+
+def run_benchmarks(wc_path: str, modified: List[str], args) -> Dict[str, Dict[str, object]]:
+    model = SvnModel(wc_path, None, None)
+    results: Dict[str, Dict[str, object]] = {}
+
+    results["fetch_status"] = summarize(time_runs(args.repeat, model.fetch_status))
+    results["fetch_log"] = summarize(time_runs(
+        args.repeat, lambda: model.fetch_log(limit=args.log_page)))
+    results["fetch_more_logs"] = summarize(time_runs(
+        args.repeat,
+        lambda: model.fetch_more_logs(args.log_page),
+        setup=lambda: model.fetch_log(limit=args.log_page)))
+
+    diff_target = modified[0] if modified else None
+    if diff_target is not None:
+        results["diff_file"] = summarize(time_runs(
+            args.repeat,
+            lambda: model.diff_file(diff_target),
+            setup=model.refresh_status))
+
+    results["is_up_to_date"] = summarize(time_runs(args.repeat, model.is_up_to_date))
+
+    commit_round = [0]
+
+    def stage_commit_batch():
+        commit_round[0] += 1
+        batch = modified[:args.commit_files]
+        for rel_path in batch:
+            with open(os.path.join(wc_path, rel_path), "a", encoding="utf-8") as f:
+                f.write(f"bench commit {commit_round[0]}\n")
+        model.stage_files(batch)
+        model.fetch_status()
+
+    if modified:
+        results["commit_staged"] = summarize(time_runs(
+            args.repeat,
+            lambda: model.commit_staged(f"bench commit {commit_round[0]}"),
+            setup=stage_commit_batch))
+    return results
+
+
+def svn_version() -> str:
+    try:
+        return subprocess.run(["svn", "--version", "--quiet"], check=True,
+                              stdout=subprocess.PIPE, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results, previous=None):
+    print(f"{'benchmark':<18}{'median ms':>12}{'min ms':>12}{'max ms':>12}"
+          + (f"{'vs prev':>10}" if previous else ""))
+    for name, result in results.items():
+        line = (f"{name:<18}{result['median'] * 1000:>12.1f}"
+                f"{result['min'] * 1000:>12.1f}{result['max'] * 1000:>12.1f}")
+        if previous and name in previous:
+            ratio = result["median"] / previous[name]["median"]
+            line += f"{ratio:>9.2f}x"
+        print(line)
+
+
+def main():
+    args = parse_args()
+    shape = RepoShape(args.files, args.dirs, args.modified, args.unversioned,
+                      args.revisions, args.paths_per_commit)
+
+    base_dir = tempfile.mkdtemp(prefix="lazysvn-bench-")
+    print(f"generating repository {shape} in {base_dir}", file=sys.stderr)
+    repo = generate_working_copy(base_dir, shape)
+    results = run_benchmarks(repo.wc_path, repo.modified, args)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)["results"]
+    print_results(results, previous)
+
+    if args.output:
+        report = {
+            "shape": shape._asdict(),
+            "repeat": args.repeat,
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "svn": svn_version(),
+            },
+            "timestamp": time.time(),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.keep:
+        print(f"repository kept at {base_dir}", file=sys.stderr)
+    else:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Parser benchmarks over recorded svn output.
+
+Feeds every `svn status --xml` and `svn log --xml` response in a fixture
+directory recorded with `lazysvn --record DIR` through the model's parsers:
+
+    python -m benchmarks.bench_parsers fixtures/ --repeat 5 -o parsers.json
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from lazysvn.svn_backend import INDEX_FILE, WC_PLACEHOLDER
+from lazysvn.svn_model import SvnModel
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark lazysvn XML parsing")
+    parser.add_argument("fixtures", metavar="DIR", help="fixture directory from --record")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", default=None, metavar="FILE",
+                        help="write results as JSON")
+    return parser.parse_args()
+
+
+def load_outputs(fixture_dir: str, wc_path: str) -> Dict[str, List[str]]:
+    outputs: Dict[str, List[str]] = {"status": [], "log": []}
+    with open(os.path.join(fixture_dir, INDEX_FILE), encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            argv = record["argv"]
+            subcommand = next((arg for arg in argv[1:] if not arg.startswith("-")), None)
+            if record["returncode"] != 0 or subcommand not in outputs or "-u" in argv:
+                continue
+            with open(os.path.join(fixture_dir, record["stdout_file"]), encoding="utf-8") as out:
+                outputs[subcommand].append(out.read().replace(WC_PLACEHOLDER, wc_path))
+    return outputs
+
+
+def main():
+    args = parse_args()
+    wc_path = tempfile.mkdtemp(prefix="lazysvn-parsebench-")
+    outputs = load_outputs(args.fixtures, wc_path)
+    model = SvnModel(wc_path, None, None)
+    parsers = {"status": model._parse_status, "log": model._parse_log}
+
+    results = {}
+    for name, raw_results in outputs.items():
+        if not raw_results:
+            continue
+        runs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for raw_result in raw_results:
+                parsers[name](raw_result)
+            runs.append(time.perf_counter() - start)
+        results[name] = {
+            "responses": len(raw_results),
+            "bytes": sum(len(raw_result) for raw_result in raw_results),
+            "runs": runs,
+            "median": statistics.median(runs),
+        }
+        mb = results[name]["bytes"] / 1_000_000
+        print(f"{name:<8}{len(raw_results):>6} responses {mb:>9.1f} MB "
+              f"{results[name]['median'] * 1000:>10.1f} ms")
+    os.rmdir(wc_path)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"fixtures": args.fixtures, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
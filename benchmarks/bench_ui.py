@@ -0,0 +1,178 @@
+"""Key-to-settled-screen latency benchmarks for the LazySvn UI.
+
+Drives the real app headlessly through Textual's pilot against a generated
+file:// repository and reports p50/p95/p99 latency per interaction:
+
+    python -m benchmarks.bench_ui --files 2000 --presses 50 -o ui.json
+    python -m benchmarks.bench_ui --replay fixtures/ --replay-latency-scale 0.5
+
+A key press counts as settled once Textual has processed every pending
+message, no worker is running and neither screen reports background work.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.repo_generator import RepoShape, generate_working_copy
+from lazysvn.app import LazySvn
+from lazysvn.svn_backend import ReplayBackend
+from lazysvn.svn_model import SvnModel
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark lazysvn UI latency")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--dirs", type=int, default=20)
+    parser.add_argument("--modified", type=int, default=200)
+    parser.add_argument("--unversioned", type=int, default=0)
+    parser.add_argument("--revisions", type=int, default=300)
+    parser.add_argument("--paths-per-commit", type=int, default=5)
+    parser.add_argument("--presses", type=int, default=30,
+                        help="key presses sampled per interaction")
+    parser.add_argument("--size", default="160x50", help="terminal size, COLSxROWS")
+    parser.add_argument("--settle-timeout", type=float, default=30.0)
+    parser.add_argument("--replay", default=None, metavar="DIR",
+                        help="replay fixtures recorded with `lazysvn --record` "
+                             "instead of generating a repository")
+    parser.add_argument("--replay-latency-scale", type=float, default=1.0)
+    parser.add_argument("-o", "--output", default=None, metavar="FILE",
+                        help="write results as JSON")
+    return parser.parse_args()
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value, "count": len(samples)}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "max": max(samples),
+        "count": len(samples),
+    }
+
+
+async def settle(app, pilot, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while True:
+        await pilot.pause()
+        busy = any(worker.is_running for worker in app.workers)
+        busy = busy or getattr(app.screen, "is_busy", False)
+        if not busy:
+            return
+        if time.perf_counter() > deadline:
+            raise TimeoutError("UI did not settle")
+        await asyncio.sleep(0.001)
+
+
+async def timed_press(app, pilot, key: str, timeout: float) -> float:
+    start = time.perf_counter()
+    await pilot.press(key)
+    await settle(app, pilot, timeout)
+    return time.perf_counter() - start
+
+
+async def run_scenarios(svn_model: SvnModel, args) -> Dict[str, Dict[str, float]]:
+    cols, rows = (int(value) for value in args.size.split("x"))
+    app = LazySvn(svn_model)
+    samples: Dict[str, List[float]] = {}
+
+    def add(name: str, value: float):
+        samples.setdefault(name, []).append(value)
+
+    async with app.run_test(size=(cols, rows)) as pilot:
+        await settle(app, pilot, args.settle_timeout)
+
+        # an unbound key measures what the pilot and settle loop cost on their own
+        for _ in range(args.presses):
+            add("harness_overhead", await timed_press(
+                app, pilot, "f12", args.settle_timeout))
+
+        for idx in range(args.presses):
+            add("status_navigate", await timed_press(
+                app, pilot, "j" if idx % 2 == 0 else "k", args.settle_timeout))
+        for _ in range(args.presses):
+            add("status_switch_panel", await timed_press(
+                app, pilot, "tab", args.settle_timeout))
+        for _ in range(args.presses):
+            # alternate panels so rows keep moving back and forth
+            add("stage_unstage", await timed_press(
+                app, pilot, "space", args.settle_timeout))
+            await timed_press(app, pilot, "tab", args.settle_timeout)
+        for _ in range(min(args.presses, 10)):
+            add("open_commit_view", await timed_press(
+                app, pilot, "c", args.settle_timeout))
+            await timed_press(app, pilot, "escape", args.settle_timeout)
+
+        add("switch_to_log", await timed_press(app, pilot, "2", args.settle_timeout))
+        for idx in range(args.presses):
+            add("log_navigate", await timed_press(
+                app, pilot, "j" if idx % 4 != 3 else "k", args.settle_timeout))
+        for _ in range(args.presses):
+            add("log_switch_panel", await timed_press(
+                app, pilot, "tab", args.settle_timeout))
+        for _ in range(min(args.presses, 5)):
+            add("log_load_page", await timed_press(
+                app, pilot, "n", args.settle_timeout))
+        add("switch_to_status", await timed_press(app, pilot, "1", args.settle_timeout))
+
+    return {name: percentiles(values) for name, values in samples.items()}
+
+
+def print_results(results):
+    print(f"{'interaction':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'n':>6}")
+    for name, result in results.items():
+        print(f"{name:<22}{result['p50'] * 1000:>10.1f}{result['p95'] * 1000:>10.1f}"
+              f"{result['p99'] * 1000:>10.1f}{result['count']:>6}")
+
+
+def main():
+    args = parse_args()
+    shape = RepoShape(args.files, args.dirs, args.modified, args.unversioned,
+                      args.revisions, args.paths_per_commit)
+    base_dir = tempfile.mkdtemp(prefix="lazysvn-uibench-")
+    # don't let a status snapshot from an earlier run skew startup
+    os.environ["XDG_CACHE_HOME"] = os.path.join(base_dir, "cache")
+    try:
+        if args.replay:
+            wc_path = os.path.join(base_dir, "wc")
+            os.makedirs(wc_path)
+            backend = ReplayBackend(args.replay, wc_path, args.replay_latency_scale)
+            svn_model = SvnModel(wc_path, None, None, backend=backend)
+        else:
+            print(f"generating repository {shape} in {base_dir}", file=sys.stderr)
+            repo = generate_working_copy(base_dir, shape)
+            svn_model = SvnModel(repo.wc_path, None, None)
+        results = asyncio.run(run_scenarios(svn_model, args))
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    print_results(results)
+    if args.output:
+        report = {
+            "shape": None if args.replay else shape._asdict(),
+            "replay": args.replay,
+            "size": args.size,
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "timestamp": time.time(),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
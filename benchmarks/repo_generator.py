@@ -0,0 +1,72 @@
+import os
+import subprocess
+from collections import namedtuple
+from typing import List
+
+
+GeneratedRepo = namedtuple("GeneratedRepo", ["repo_url", "wc_path", "files", "modified"])
+
+RepoShape = namedtuple(
+    "RepoShape",
+    ["files", "dirs", "modified", "unversioned", "revisions", "paths_per_commit"]
+)
+
+
+def _svn(*args, cwd=None) -> str:
+    result = subprocess.run(
+        ["svn", "--non-interactive", *args],
+        cwd=cwd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    return result.stdout
+
+
+def _write(path: str, content: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _file_content(idx: int, revision: int, lines: int = 40) -> str:
+    return "".join(f"file {idx} line {line} rev {revision if line % 7 == 0 else 0}\n"
+                   for line in range(lines))
+
+
+def generate_working_copy(base_dir: str, shape: RepoShape) -> GeneratedRepo:
+    """Create a file:// repository and a working copy with the given shape.
+
+    The history gets `shape.revisions` commits touching `shape.paths_per_commit`
+    files each, then `shape.modified` files are modified and
+    `shape.unversioned` files are created without being added.
+    """
+    repo_path = os.path.join(base_dir, "repo")
+    wc_path = os.path.join(base_dir, "wc")
+    subprocess.run(["svnadmin", "create", repo_path], check=True)
+    repo_url = "file://" + os.path.abspath(repo_path)
+    _svn("checkout", repo_url, wc_path)
+
+    dirs = [f"dir{d:04d}" for d in range(max(shape.dirs, 1))]
+    for directory in dirs:
+        os.makedirs(os.path.join(wc_path, directory))
+    files: List[str] = []
+    for idx in range(shape.files):
+        rel_path = os.path.join(dirs[idx % len(dirs)], f"file{idx:06d}.txt")
+        _write(os.path.join(wc_path, rel_path), _file_content(idx, 0))
+        files.append(rel_path)
+    _svn("add", "--force", ".", cwd=wc_path)
+    _svn("commit", "-m", "initial import", cwd=wc_path)
+
+    touched = 0
+    for revision in range(1, shape.revisions):
+        for _ in range(shape.paths_per_commit):
+            idx = touched % len(files)
+            _write(os.path.join(wc_path, files[idx]), _file_content(idx, revision))
+            touched += 1
+        _svn("commit", "-m", f"change {revision}", cwd=wc_path)
+    _svn("update", cwd=wc_path)
+
+    modified = files[:shape.modified]
+    for idx, rel_path in enumerate(modified):
+        _write(os.path.join(wc_path, rel_path), _file_content(idx, -1))
+    for idx in range(shape.unversioned):
+        _write(os.path.join(wc_path, dirs[idx % len(dirs)], f"unversioned{idx:06d}.txt"),
+               "unversioned\n")
+
+    return GeneratedRepo(repo_url, wc_path, files, modified)
@@ -5,7 +5,11 @@ import argparse
 from textual.app import App
 from lazysvn.status_view import StatusView
 from lazysvn.log_view import LogView
-from lazysvn.svn_model import SvnModel
+from lazysvn.diagnostics_view import DiagnosticsView
+from lazysvn.browse_view import BrowseView
+from lazysvn.svn_model import DEFAULT_DIFF_SIZE_LIMIT, SvnModel, SVNCommandError
+from lazysvn.svn_backend import SubprocessBackend, RecordingBackend, ReplayBackend
+from lazysvn.profiling import SessionProfiler
 
 
 def parse_args():
@@ -39,6 +43,87 @@ def parse_args():
         type=str,
         help="Subversion password",
     )
+
+    parser.add_argument(
+        "--trace",
+        dest="trace",
+        default=None,
+        type=str,
+        metavar="FILE",
+        help="Write a Chrome trace (JSON) of svn commands and UI updates on exit",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        dest="metrics",
+        default=None,
+        type=str,
+        metavar="FILE",
+        help="Write an OpenMetrics text snapshot of command timings on exit",
+    )
+
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        action="store_true",
+        help="Profile the session and write PREFIX.txt, PREFIX.pstats and "
+             "PREFIX.collapsed on exit",
+    )
+
+    parser.add_argument(
+        "--profile-prefix",
+        dest="profile_prefix",
+        default="lazysvn-profile",
+        type=str,
+        metavar="PREFIX",
+        help="Path prefix of the --profile output files (default: lazysvn-profile)",
+    )
+
+    parser.add_argument(
+        "--parse-process",
+        dest="parse_process",
+        action="store_true",
+        help="Run svn status/log and parse their XML in a separate process "
+             "so large responses don't stall the UI",
+    )
+
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument(
+        "--record",
+        dest="record",
+        default=None,
+        type=str,
+        metavar="DIR",
+        help="Save every svn command's output and latency as fixtures in DIR",
+    )
+
+    replay_group.add_argument(
+        "--replay",
+        dest="replay",
+        default=None,
+        type=str,
+        metavar="DIR",
+        help="Serve svn commands from fixtures recorded with --record",
+    )
+
+    parser.add_argument(
+        "--replay-latency-scale",
+        dest="replay_latency_scale",
+        default=1.0,
+        type=float,
+        metavar="SCALE",
+        help="Multiply recorded latencies when replaying (0 for no delay)",
+    )
+
+    parser.add_argument(
+        "--diff-limit",
+        dest="diff_limit",
+        default=DEFAULT_DIFF_SIZE_LIMIT / (1024 * 1024),
+        type=float,
+        metavar="MB",
+        help="Show a summary instead of the diff for files larger than this "
+             "(default: %(default)g MB)",
+    )
     args = parser.parse_args()
     return args
 
@@ -47,13 +132,19 @@ class LazySvn(App):
     BINDINGS = [
         ("1", "switch_mode('status')", "Status"),
         ("2", "switch_mode('log')", "Log"),
+        ("3", "switch_mode('diagnostics')", "Diagnostics"),
+        ("4", "switch_mode('browse')", "Browse"),
         ("q", "quit", "Quit"),
     ]
     def __init__(self, svn_model: SvnModel):
         super().__init__()
         self._svn_model = svn_model
-        self.add_mode("status", StatusView(svn_model))
-        self.add_mode("log", LogView(svn_model))
+        status_view = StatusView(svn_model)
+        log_view = LogView(svn_model)
+        self.add_mode("status", status_view)
+        self.add_mode("log", log_view)
+        self.add_mode("diagnostics", DiagnosticsView(svn_model, [status_view, log_view]))
+        self.add_mode("browse", BrowseView(svn_model))
 
 
     def on_mount(self) -> None:
@@ -65,14 +156,44 @@ def main():
     os.environ["COLORTERM"] = "truecolor"
     args = parse_args()
 
+    backend = SubprocessBackend()
+    if args.record:
+        backend = RecordingBackend(backend, args.record, args.path)
+    elif args.replay:
+        backend = ReplayBackend(args.replay, args.path, args.replay_latency_scale)
+
     svn_model = SvnModel(
         local_path=args.path,
         username=args.username,
         password=args.password,
+        backend=backend,
+        parse_in_process=args.parse_process,
+        diff_size_limit=int(args.diff_limit * 1024 * 1024),
     )
 
+    profiler = SessionProfiler(args.profile_prefix) if args.profile else None
+    if profiler:
+        profiler.start()
+
     app = LazySvn(svn_model)
-    app.run()
+    try:
+        app.run()
+    finally:
+        if profiler:
+            profiler.stop()
+            print("profile written to " + ", ".join(profiler.write()))
+        svn_model.close()
+
+    try:
+        svn_model.save_status_snapshot()
+    except (SVNCommandError, OSError):
+        # a missing snapshot only costs the next launch its head start
+        pass
+
+    if args.trace:
+        svn_model.metrics.write_chrome_trace(args.trace)
+    if args.metrics:
+        svn_model.metrics.write_openmetrics(args.metrics)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+import threading
+from typing import List, Tuple
+from lazysvn.blame_view import BlameView, split_lines
+from lazysvn.svn_model import SVNCommandError
+
+
+class BlamePresenter:
+    def __init__(self, blame_view, svn_model, rel_path: str):
+        self._blame_view: BlameView = blame_view
+        self._svn_model = svn_model
+        self._rel_path = rel_path
+        self._cancelled = threading.Event()
+        self._line_count = 0
+        self._blamed_lines = 0
+
+
+    def on_view_mount(self):
+        self._blame_view.set_blame_title(self._rel_path, "loading")
+        self._blame_view.run_worker(self.load_blame, thread=True)
+
+
+    def on_view_unmount(self):
+        self._cancelled.set()
+
+
+    def revision_label(self, revision: int) -> Tuple[str, str]:
+        info = self._svn_model.revision_info(revision)
+        return info if info is not None else ("", "")
+
+
+    def load_blame(self):
+        call_from_thread = self._blame_view.app.call_from_thread
+        try:
+            base = self._svn_model.fetch_base(self._rel_path)
+            text = self._svn_model.base_text(self._rel_path)
+            if self._cancelled.is_set():
+                return
+            call_from_thread(self.show_text, text, base[1])
+            finished = self._svn_model.stream_blame(
+                    self._rel_path, base,
+                    lambda batch: call_from_thread(self.show_revisions, batch),
+                    self._cancelled)
+        except SVNCommandError as e:
+            if not self._cancelled.is_set():
+                call_from_thread(self.show_error, e)
+            return
+        if finished and not self._cancelled.is_set():
+            call_from_thread(self.show_finished, base[1])
+
+
+    def show_text(self, text: str, base_revision: int):
+        self._line_count = len(split_lines(text))
+        self._blame_view.set_blame_text(text)
+        self._blame_view.set_blame_title(
+                f"{self._rel_path}@{base_revision}", f"0/{self._line_count} lines")
+
+
+    def show_revisions(self, batch: List[Tuple[int, int]]):
+        self._blamed_lines += len(batch)
+        self._blame_view.set_blame_revisions(batch)
+        self._blame_view.set_blame_title(
+                self._blame_view.blame_title,
+                f"{min(self._blamed_lines, self._line_count)}/{self._line_count} lines")
+
+
+    def show_finished(self, base_revision: int):
+        self._blame_view.set_blame_title(
+                f"{self._rel_path}@{base_revision}", f"{self._line_count} lines")
+
+
+    def show_error(self, error: SVNCommandError):
+        self._blame_view.set_blame_title(self._rel_path, "failed")
+        self._blame_view.app.notify(
+            str(error),
+            title="Blame failed",
+            severity="error",
+            timeout=10
+        )
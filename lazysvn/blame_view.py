@@ -0,0 +1,197 @@
+import re
+from array import array
+from typing import Callable, List, Optional, Tuple
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.screen import Screen
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Footer
+
+
+_sub_control = re.compile("[\u0000-\u0008\u000b-\u001f]").sub
+
+REVISION_STYLE = Style(color="#eb6f92")
+AUTHOR_STYLE = Style(color="#9ccfd8")
+DATE_STYLE = Style(color="#8ec07c")
+PENDING_STYLE = Style(color="#6e6a86")
+GUTTER_WIDTH = 34
+
+
+def split_lines(text: str) -> List[str]:
+    """Lines as svn blame counts them, split at line feeds only and without
+    the carriage return of a CRLF line."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+
+class BlameView(Screen):
+    BINDINGS = [
+        ("escape", "app.pop_screen", "back"),
+        ("▼/j,j", "on_key_down", "scroll down"),
+        ("▲/k,k", "on_key_up", "scroll up"),
+        Binding("pagedown,ctrl+d", "on_key_page_down", "page down", show=False),
+        Binding("pageup,ctrl+u", "on_key_page_up", "page up", show=False),
+    ]
+
+    DEFAULT_CSS = """
+    BlameView Widget {
+        scrollbar-color: grey;
+        scrollbar-color-hover: grey;
+        scrollbar-background: #1f1d2e;
+        scrollbar-corner-color: #1f1d2e;
+        scrollbar-size: 1 1;
+        background: #1f1d2e;
+    }
+
+    BlameView Footer > .footer--key {
+        background: #383838;
+    }
+
+    BlamePanel {
+        border: solid #8ec07c;
+        padding: 0 1;
+    }
+    """
+
+
+    def __init__(self, svn_model, rel_path: str, *args, **kwargs):
+        from lazysvn.blame_presenter import BlamePresenter
+        super().__init__(*args, **kwargs)
+        self.title = "Blame"
+        self._presenter = BlamePresenter(self, svn_model, rel_path)
+
+        # initalized later in on_mount
+        self._blame_panel: Optional[BlamePanel] = None
+
+
+    def compose(self) -> ComposeResult:
+        yield BlamePanel(self._presenter.revision_label)
+        yield Footer()
+
+
+    def on_mount(self) -> None:
+        self._blame_panel = self.query_one(BlamePanel)
+        self._blame_panel.focus()
+        self._presenter.on_view_mount()
+
+
+    def on_unmount(self) -> None:
+        self._presenter.on_view_unmount()
+
+
+    ############################ Keybindings #############################
+
+
+    def action_on_key_down(self):
+        if self._blame_panel:
+            self._blame_panel.scroll_down(animate=False)
+
+
+    def action_on_key_up(self):
+        if self._blame_panel:
+            self._blame_panel.scroll_up(animate=False)
+
+
+    def action_on_key_page_down(self):
+        if self._blame_panel:
+            self._blame_panel.scroll_page_down(animate=False)
+
+
+    def action_on_key_page_up(self):
+        if self._blame_panel:
+            self._blame_panel.scroll_page_up(animate=False)
+
+
+    ############################ Blame Panel #############################
+
+
+    def set_blame_title(self, title: str, subtitle: str = ""):
+        if not self._blame_panel:
+            return
+        self._blame_panel.border_title = title
+        self._blame_panel.border_subtitle = subtitle
+
+
+    @property
+    def blame_title(self) -> str:
+        if not self._blame_panel:
+            return ""
+        return str(self._blame_panel.border_title or "")
+
+
+    def set_blame_text(self, text: str):
+        if not self._blame_panel:
+            return
+        self._blame_panel.set_text(text)
+
+
+    def set_blame_revisions(self, line_revisions: List[Tuple[int, int]]):
+        if not self._blame_panel:
+            return
+        self._blame_panel.set_revisions(line_revisions)
+
+
+    ######################### Custom Widgets #############################
+
+
+class BlamePanel(ScrollView):
+    """The BASE text of a file with the revision of each line in a gutter.
+
+    Lines keep a pending gutter until their revision arrives, and authors and
+    dates are looked up per revision when a line is drawn.
+    """
+
+    def __init__(self, revision_label: Callable[[int], Tuple[str, str]], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._revision_label = revision_label
+        self._lines: List[str] = []
+        # -1 while the line's revision hasn't arrived yet
+        self._revisions = array("q")
+
+
+    def set_text(self, text: str):
+        self._lines = [_sub_control("�", line).expandtabs() for line in split_lines(text)]
+        self._revisions = array("q", [-1]) * len(self._lines)
+        width = max((cell_len(line) for line in self._lines), default=0)
+        self.virtual_size = Size(GUTTER_WIDTH + width, len(self._lines))
+        self.refresh()
+
+
+    def set_revisions(self, line_revisions: List[Tuple[int, int]]):
+        for line_idx, revision in line_revisions:
+            if 0 <= line_idx < len(self._revisions):
+                self._revisions[line_idx] = revision
+        self.refresh()
+
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        line_idx = scroll_y + y
+        rich_style = self.rich_style
+        width = self.size.width
+        if line_idx >= len(self._lines):
+            return Strip.blank(width, rich_style)
+
+        revision = self._revisions[line_idx]
+        if revision < 0:
+            gutter = [Segment(f"{'…':>7}".ljust(GUTTER_WIDTH), rich_style + PENDING_STYLE)]
+        elif revision == 0:
+            gutter = [Segment(f"{'-':>7}".ljust(GUTTER_WIDTH), rich_style + PENDING_STYLE)]
+        else:
+            author, date = self._revision_label(revision)
+            gutter = [
+                Segment(f"{revision:>7} ", rich_style + REVISION_STYLE),
+                Segment(f"{author[:12]:<12} ", rich_style + AUTHOR_STYLE),
+                Segment(f"{date[:10]:<10}", rich_style + DATE_STYLE),
+                Segment(" │ ", rich_style + PENDING_STYLE),
+            ]
+        line = self._lines[line_idx]
+        strip = Strip(gutter + [Segment(line, rich_style)], GUTTER_WIDTH + cell_len(line))
+        return strip.crop_extend(scroll_x, scroll_x + width, rich_style)
@@ -0,0 +1,161 @@
+from functools import partial
+from typing import List, Optional, Set
+from rich.text import Text
+from textual.timer import Timer
+from textual.widgets.tree import TreeNode
+from textual.worker import get_current_worker
+from lazysvn.browse_view import BrowseView
+from lazysvn.caches import format_bytes
+from lazysvn.svn_model import SVNCommandError
+from lazysvn.svn_xml import ListEntry
+
+
+# how long the cursor has to rest on a directory before its children are fetched
+PREFETCH_DELAY = 0.3
+
+
+class BrowsePresenter:
+    def __init__(self, browse_view, svn_model):
+        self._browse_view: BrowseView = browse_view
+        self._svn_model = svn_model
+        # every listing is fetched at this revision until the next refresh
+        self._revision: Optional[int] = None
+        # bumped by every refresh, which replaces all the tree nodes, so
+        # listings requested for the old nodes are dropped when they arrive
+        self._generation = 0
+        # ids of the tree nodes whose children are shown or being fetched
+        self._loaded: Set[int] = set()
+        self._prefetch_timer: Optional[Timer] = None
+
+
+    def on_view_mount(self):
+        self.refresh()
+
+
+    def on_key_r(self):
+        self.refresh()
+
+
+    def refresh(self):
+        self._generation += 1
+        self._revision = None
+        self._loaded.clear()
+        self._browse_view.reset_tree("^/", "resolving HEAD")
+        self._browse_view.run_worker(self.fetch_revision, group="browse-head",
+                                     exclusive=True, thread=True)
+
+
+    def fetch_revision(self):
+        try:
+            revision = self._svn_model.fetch_youngest_revision()
+        except SVNCommandError as e:
+            self._browse_view.app.call_from_thread(self.show_error, e)
+            return
+        if not get_current_worker().is_cancelled:
+            self._browse_view.app.call_from_thread(self.show_revision, revision)
+
+
+    def show_revision(self, revision: int):
+        self._revision = revision
+        self._browse_view.set_tree_subtitle(f"r{revision}")
+        self._browse_view.expand_tree_root()
+
+
+    def show_error(self, error: SVNCommandError):
+        self._browse_view.set_tree_subtitle("failed")
+        self._browse_view.app.notify(
+            str(error),
+            title="Browse failed",
+            severity="error",
+            timeout=10
+        )
+
+
+    def on_node_expanded(self, node: TreeNode):
+        if self._revision is None or node.id in self._loaded:
+            return
+        self._loaded.add(node.id)
+        repo_path = node.data[0]
+        if not self._svn_model.has_listing(repo_path, self._revision):
+            self._browse_view.set_node_placeholder(node, "loading…")
+        self._browse_view.run_worker(
+                partial(self.load_children, node, repo_path, self._revision, self._generation),
+                thread=True)
+
+
+    def load_children(self, node: TreeNode, repo_path: str, revision: int, generation: int):
+        try:
+            entries = self._svn_model.list_directory(repo_path, revision)
+        except SVNCommandError as e:
+            self._browse_view.app.call_from_thread(
+                    self.show_children_error, node, generation, e)
+            return
+        self._browse_view.app.call_from_thread(self.show_children, node, generation, entries)
+
+
+    def show_children(self, node: TreeNode, generation: int, entries: List[ListEntry]):
+        if generation != self._generation:
+            return
+        if entries:
+            self._browse_view.set_node_children(node, entries)
+        else:
+            self._browse_view.set_node_placeholder(node, "empty")
+
+
+    def show_children_error(self, node: TreeNode, generation: int, error: SVNCommandError):
+        if generation != self._generation:
+            return
+        # expanding again retries
+        self._loaded.discard(node.id)
+        self._browse_view.set_node_placeholder(node, "failed")
+        self.show_error(error)
+
+
+    def on_node_highlighted(self, node: TreeNode):
+        if node.data is None:
+            return
+        repo_path, entry = node.data
+        self._browse_view.set_details(self.format_details(repo_path, entry))
+
+        if self._prefetch_timer is not None:
+            self._prefetch_timer.stop()
+            self._prefetch_timer = None
+        is_dir = entry is None or entry.kind == "dir"
+        if is_dir and self._revision is not None and node.id not in self._loaded:
+            self._prefetch_timer = self._browse_view.set_timer(
+                    PREFETCH_DELAY, partial(self.start_prefetch, repo_path, self._revision))
+
+
+    def start_prefetch(self, repo_path: str, revision: int):
+        self._prefetch_timer = None
+        if self._svn_model.has_listing(repo_path, revision):
+            return
+        self._browse_view.run_worker(
+                partial(self.prefetch_children, repo_path, revision),
+                group="browse-prefetch", exclusive=True, thread=True)
+
+
+    def prefetch_children(self, repo_path: str, revision: int):
+        try:
+            self._svn_model.list_directory(repo_path, revision)
+        except SVNCommandError:
+            # expanding the directory reports the error
+            pass
+
+
+    def format_details(self, repo_path: str, entry: Optional[ListEntry]) -> Text:
+        details = Text()
+        details.append(f"{repo_path}\n\n", style="bold")
+        if entry is None:
+            return details
+        details.append(f"Kind:     {entry.kind}\n")
+        if entry.size is not None:
+            details.append(f"Size:     {format_bytes(entry.size)}\n")
+        if entry.revision is not None:
+            details.append("Revision: ")
+            details.append(f"r{entry.revision}\n", style="#eb6f92")
+        if entry.author:
+            details.append(f"Author:   {entry.author}\n")
+        if entry.date:
+            details.append(f"Date:     {entry.date[:19].replace('T', ' ')}\n")
+        return details
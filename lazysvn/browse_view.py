@@ -0,0 +1,195 @@
+from typing import List, Optional
+from textual import on
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.widgets import Footer, Static, Tree
+from textual.widgets.tree import TreeNode
+from textual.binding import Binding
+from rich.text import Text
+from lazysvn.svn_xml import ListEntry
+
+
+class BrowseView(Screen):
+    BINDINGS = [
+        ("▼/j,j", "on_key_down", "next entry"),
+        ("▲/k,k", "on_key_up", "prev entry"),
+        ("◄ ►/hl,l", "on_key_right", "expand"),
+        Binding("h", "on_key_left", "collapse", show=False),
+        ("r", "on_key_r", "refresh to HEAD"),
+    ]
+
+    DEFAULT_CSS = """
+    BrowseView {
+        layout: grid;
+        grid-size: 5 1;
+    }
+
+    BrowseView Widget {
+        scrollbar-color: grey;
+        scrollbar-color-hover: grey;
+        scrollbar-background: #1f1d2e;
+        scrollbar-corner-color: #1f1d2e;
+        scrollbar-size: 1 1;
+        background: #1f1d2e;
+    }
+
+    BrowseView Footer > .footer--key {
+        background: #383838;
+    }
+
+    BrowseView Tree {
+        border: solid grey;
+        column-span: 3;
+    }
+
+    BrowseView Tree:focus {
+        border: solid #8ec07c;
+    }
+
+    BrowseView Tree > .tree--cursor {
+        background: #403d52;
+    }
+
+    BrowseView .entry-details {
+        border: solid grey;
+        column-span: 2;
+        padding: 0 1;
+    }
+    """
+
+
+    def __init__(self, svn_model, *args, **kwargs):
+        from lazysvn.browse_presenter import BrowsePresenter
+        super().__init__(*args, **kwargs)
+        self.title = "Browse"
+        self._presenter = BrowsePresenter(self, svn_model)
+
+        # initalized later in on_mount
+        self._tree: Optional[Tree] = None
+        self._details: Optional[Static] = None
+
+
+    def compose(self) -> ComposeResult:
+        yield Tree("^/", data=("/", None))
+        yield Static(classes="entry-details")
+        yield Footer()
+
+
+    def on_mount(self) -> None:
+        self._tree = self.query_one(Tree)
+        self._tree.guide_depth = 2
+        self._details = self.query_one(".entry-details", Static)
+        self._details.border_title = "Details"
+        self._tree.focus()
+        self._presenter.on_view_mount()
+
+
+    ############################ Keybindings #############################
+
+
+    def action_on_key_down(self):
+        if self._tree:
+            self._tree.action_cursor_down()
+
+
+    def action_on_key_up(self):
+        if self._tree:
+            self._tree.action_cursor_up()
+
+
+    def action_on_key_right(self):
+        node = self.cursor_node
+        if node is not None and node.allow_expand and not node.is_expanded:
+            node.expand()
+
+
+    def action_on_key_left(self):
+        node = self.cursor_node
+        if node is None:
+            return
+        if node.is_expanded:
+            node.collapse()
+        elif node.parent is not None and self._tree:
+            self._tree.select_node(node.parent)
+            self._tree.scroll_to_node(node.parent)
+
+
+    def action_on_key_r(self):
+        self._presenter.on_key_r()
+
+
+    @on(Tree.NodeExpanded)
+    def on_node_expanded(self, event: Tree.NodeExpanded):
+        self._presenter.on_node_expanded(event.node)
+
+
+    @on(Tree.NodeHighlighted)
+    def on_node_highlighted(self, event: Tree.NodeHighlighted):
+        self._presenter.on_node_highlighted(event.node)
+
+
+    ############################## Tree ##################################
+
+
+    @property
+    def cursor_node(self) -> Optional[TreeNode]:
+        if not self._tree:
+            return None
+        return self._tree.cursor_node
+
+
+    def reset_tree(self, title: str, subtitle: str = ""):
+        if not self._tree:
+            return
+        self._tree.clear()
+        self._tree.border_title = title
+        self._tree.border_subtitle = subtitle
+
+
+    def set_tree_subtitle(self, subtitle: str):
+        if not self._tree:
+            return
+        self._tree.border_subtitle = subtitle
+
+
+    def expand_tree_root(self):
+        if not self._tree:
+            return
+        self._tree.root.expand()
+
+
+    def set_node_children(self, node: TreeNode, entries: List[ListEntry]):
+        node.remove_children()
+        parent_path = node.data[0].rstrip("/")
+        for entry in entries:
+            data = (f"{parent_path}/{entry.name}", entry)
+            if entry.kind == "dir":
+                node.add(self.entry_label(entry), data=data)
+            else:
+                node.add_leaf(self.entry_label(entry), data=data)
+
+
+    def set_node_placeholder(self, node: TreeNode, text: str):
+        node.remove_children()
+        node.add_leaf(Text(text, style="italic grey50"))
+
+
+    @staticmethod
+    def entry_label(entry: ListEntry) -> Text:
+        label = Text()
+        if entry.kind == "dir":
+            label.append(f"{entry.name}/", style="#9ccfd8")
+        else:
+            label.append(entry.name)
+        if entry.revision is not None:
+            label.append(f"  r{entry.revision}", style="#eb6f92")
+        return label
+
+
+    ########################### Details Panel ############################
+
+
+    def set_details(self, details: Text):
+        if not self._details:
+            return
+        self._details.update(details)
@@ -0,0 +1,8 @@
+import os
+
+
+def cache_dir(*parts: str) -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "lazysvn", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,112 @@
+import random
+import sys
+from collections import OrderedDict, namedtuple
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+
+CacheStats = namedtuple(
+    "CacheStats",
+    ["name", "entries", "approx_bytes", "hits", "misses", "evictions", "drops"]
+)
+
+
+def approx_size(obj: Any, _depth: int = 0) -> int:
+    """sys.getsizeof including the contents of containers, a few levels deep."""
+    size = sys.getsizeof(obj)
+    if _depth > 4:
+        return size
+    if isinstance(obj, dict):
+        size += sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+                    for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approx_size(item, _depth + 1) for item in obj)
+    return size
+
+
+def format_bytes(size: int) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def estimate_size(items: Iterable[Any], count: int, sample: int = 200) -> int:
+    """Extrapolates approx_size from a random sample so large caches stay cheap
+    to measure."""
+    if count == 0:
+        return 0
+    items = list(items) if count <= sample else random.sample(list(items), sample)
+    return sum(approx_size(item) for item in items) * count // len(items)
+
+
+class StatsCache:
+    """Dict-backed cache that counts hits, misses, evictions and drops.
+
+    With max_entries set it evicts the least recently used entry.
+    """
+
+    def __init__(self, name: str, max_entries: Optional[int] = None):
+        self.name = name
+        self._max_entries = max_entries
+        self._entries: Dict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.drops = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+    def get(self, key: Hashable, default=None):
+        if key in self._entries:
+            self.hits += 1
+            if self._max_entries is not None:
+                self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        return default
+
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        if self._max_entries is not None:
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+    def pop(self, key: Hashable, default=None):
+        return self._entries.pop(key, default)
+
+
+    def items(self):
+        return list(self._entries.items())
+
+
+    def clear(self):
+        self._entries.clear()
+
+
+    def drop(self):
+        self.drops += 1
+        self.clear()
+
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.name,
+            len(self._entries),
+            estimate_size(self._entries.items(), len(self._entries)),
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.drops,
+        )
@@ -0,0 +1,106 @@
+import os
+import sys
+import tracemalloc
+from lazysvn.caches import format_bytes
+from lazysvn.diagnostics_view import DiagnosticsView
+from lazysvn.svn_model import SvnModel
+from rich.text import Text
+
+
+def process_rss() -> int | None:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        # Unix only
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class DiagnosticsPresenter:
+    def __init__(self, diagnostics_view, svn_model):
+        self._diagnostics_view: DiagnosticsView = diagnostics_view
+        self._svn_model: SvnModel = svn_model
+
+
+    def on_view_mount(self):
+        self._diagnostics_view.set_columns(
+            ("Name", "Entries", "Approx size", "Hits", "Misses", "Hit rate",
+             "Evictions", "Drops"))
+        self.refresh()
+
+
+    def refresh(self):
+        rows = []
+        for stats in self._svn_model.cache_stats():
+            lookups = stats.hits + stats.misses
+            hit_rate = f"{stats.hits / lookups:.0%}" if lookups else "-"
+            rows.append((
+                Text(stats.name, style="#f6c177"),
+                str(stats.entries),
+                format_bytes(stats.approx_bytes),
+                str(stats.hits),
+                str(stats.misses),
+                hit_rate,
+                str(stats.evictions),
+                str(stats.drops),
+            ))
+        for name, count, approx_bytes in self._diagnostics_view.table_rows():
+            rows.append((
+                Text(name, style="#9ccfd8"),
+                str(count),
+                format_bytes(approx_bytes),
+                "-", "-", "-", "-", "-",
+            ))
+        self._diagnostics_view.set_table_data(rows)
+        self._diagnostics_view.set_memory_text(self.memory_text())
+
+
+    def memory_text(self) -> Text:
+        grey = "#908caa"
+        text = Text()
+        rss = process_rss()
+        text.append("RSS: ", style=grey)
+        text.append(format_bytes(rss) if rss is not None else "n/a")
+        text.append("   Peak RSS: ", style=grey)
+        peak_bytes = peak_rss()
+        text.append(format_bytes(peak_bytes) if peak_bytes is not None else "n/a")
+        text.append("   tracemalloc: ", style=grey)
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            text.append(f"{format_bytes(current)} (peak {format_bytes(peak)})")
+        else:
+            text.append("off")
+        text.append("   pid: ", style=grey)
+        text.append(str(os.getpid()))
+        return text
+
+
+    def on_key_x(self):
+        name = self._diagnostics_view.selected_name
+        if self._svn_model.drop_cache(name):
+            self._diagnostics_view.notify(f"Dropped the {name} cache", timeout=2)
+        else:
+            self._diagnostics_view.notify(
+                "Only caches can be dropped", severity="warning", timeout=2)
+        self.refresh()
+
+
+    def on_key_m(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        else:
+            tracemalloc.start()
+        self.refresh()
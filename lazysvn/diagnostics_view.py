@@ -0,0 +1,163 @@
+import random
+from typing import List, Optional, Tuple
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.widgets import DataTable, Footer, Static
+from textual.timer import Timer
+from rich.text import Text
+from lazysvn.caches import approx_size
+
+
+class DiagnosticsView(Screen):
+    BINDINGS = [
+        ("▼/j,j", "on_key_down", "next entry"),
+        ("▲/k,k", "on_key_up", "prev entry"),
+        ("x", "on_key_x", "drop cache"),
+        ("m", "on_key_m", "toggle tracemalloc"),
+        ("r", "on_key_r", "refresh"),
+    ]
+
+    DEFAULT_CSS = """
+    DiagnosticsView Widget{
+        scrollbar-color: grey;
+        scrollbar-color-hover: grey;
+        scrollbar-background: #1f1d2e;
+        scrollbar-corner-color: #1f1d2e;
+        scrollbar-size: 1 1;
+        background: #1f1d2e;
+    }
+
+    DiagnosticsView Footer > .footer--key {
+        background: #383838;
+    }
+
+    DiagnosticsView .memory-panel {
+        height: auto;
+        border: solid grey;
+        padding: 0 1;
+    }
+
+    DiagnosticsView DataTable {
+        height: 1fr;
+        border: solid #8ec07c;
+    }
+
+    DiagnosticsView .datatable--cursor {
+        background: #403d52;
+    }
+    """
+
+    def __init__(self, svn_model, inspected_screens: List[Screen], *args, **kwargs):
+        from lazysvn.diagnostics_presenter import DiagnosticsPresenter
+        super().__init__(*args, **kwargs)
+        self.title = "Diagnostics"
+        self._inspected_screens = inspected_screens
+        self._presenter = DiagnosticsPresenter(self, svn_model)
+        self._table: Optional[DataTable] = None
+        self._memory_text: Optional[Static] = None
+        self._timer: Optional[Timer] = None
+
+
+    def compose(self) -> ComposeResult:
+        yield Static(classes="memory-panel")
+        yield DataTable(cursor_foreground_priority="renderable")
+        yield Footer()
+
+
+    def on_mount(self) -> None:
+        self._memory_text = self.query_one(".memory-panel", Static)
+        self._memory_text.border_title = "Process"
+        self._table = self.query_one(DataTable)
+        self._table.cursor_type = "row"
+        self._table.border_title = "Caches and tables"
+        self._presenter.on_view_mount()
+        self._timer = self.set_interval(1.0, self._presenter.refresh)
+
+
+    def on_screen_resume(self) -> None:
+        if self._timer:
+            self._timer.resume()
+        self._presenter.refresh()
+
+
+    def on_screen_suspend(self) -> None:
+        if self._timer:
+            self._timer.pause()
+
+
+    ############################ Keybindings #############################
+
+
+    def action_on_key_down(self):
+        if self._table:
+            self._table.action_cursor_down()
+
+
+    def action_on_key_up(self):
+        if self._table:
+            self._table.action_cursor_up()
+
+
+    def action_on_key_x(self):
+        self._presenter.on_key_x()
+
+
+    def action_on_key_m(self):
+        self._presenter.on_key_m()
+
+
+    def action_on_key_r(self):
+        self._presenter.refresh()
+
+
+    ############################ General ###############################
+
+
+    def set_columns(self, columns):
+        if not self._table:
+            return
+        for col in columns:
+            self._table.add_column(col, key=col)
+
+
+    def set_table_data(self, rows):
+        if not self._table:
+            return
+        prev_idx = self._table.cursor_row
+        self._table.clear()
+        for row in rows:
+            self._table.add_row(*row)
+        self._table.move_cursor(row=prev_idx)
+
+
+    @property
+    def selected_name(self) -> str:
+        if not self._table or self._table.row_count == 0:
+            return ""
+        cell = self._table.get_row_at(self._table.cursor_row)[0]
+        return cell.plain if isinstance(cell, Text) else str(cell)
+
+
+    def set_memory_text(self, text: Text):
+        if not self._memory_text:
+            return
+        self._memory_text.update(text)
+
+
+    def table_rows(self) -> List[Tuple[str, int, int]]:
+        """(name, row count, approx bytes) for every DataTable on the inspected
+        screens. Bytes are extrapolated from a sample of rows."""
+        tables = []
+        for screen in self._inspected_screens:
+            if not screen.is_mounted:
+                continue
+            for table in screen.query(DataTable):
+                owner = table.parent
+                name = (getattr(owner, "border_title", None) or owner.id
+                        or owner.__class__.__name__)
+                rows = table.row_count
+                sample = random.sample(range(rows), min(rows, 100))
+                sampled = sum(approx_size(table.get_row_at(idx)) for idx in sample)
+                approx_bytes = sampled * rows // len(sample) if sample else 0
+                tables.append((f"{screen.title}: {name} rows", rows, approx_bytes))
+        return tables
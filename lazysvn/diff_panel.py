@@ -1,34 +1,324 @@
+import re
+from array import array
+from bisect import bisect_right
+from difflib import SequenceMatcher
+from itertools import accumulate
+from typing import Dict, Hashable, List, Optional, Tuple
 
-from textual.containers import VerticalScroll
-from textual.app import ComposeResult
-from textual.widget import Widget
-from textual.reactive import reactive
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
 from rich.text import Text
-from rich.console import RenderableType
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 
+from lazysvn.caches import StatsCache
 
-class DiffText(Widget):
-    output = reactive("")
 
-    def render(self) -> RenderableType:
-        text = Text()
-        for line in self.output.splitlines():
-            if line.startswith("+"):
-                text.append(line + "\n", style="#8ec07c")
-            elif line.startswith("-"):
-                text.append(line + "\n", style="#eb6f92")
-            elif line.startswith("@"):
-                text.append(line + "\n", style="#56949f")
-            else:
-                text.append(line + "\n")
-        return text
+_sub_control = re.compile("[\u0000-\u0008\u000b-\u001f]").sub
+_hunk_header = re.compile(r"^@@ -\d+(?:,(\d+))? \+\d+(?:,(\d+))? @@", re.MULTILINE)
+_word = re.compile(r"\w+|\s+|[^\w\s]")
 
+ADDED_STYLE = Style(color="#8ec07c")
+REMOVED_STYLE = Style(color="#eb6f92")
+HUNK_STYLE = Style(color="#56949f")
+ADDED_WORD_STYLE = Style(color="#8ec07c", bgcolor="#2f4a3a", bold=True)
+REMOVED_WORD_STYLE = Style(color="#eb6f92", bgcolor="#4f2a3a", bold=True)
+
+# lines styled together and cached as one window
+WINDOW_LINES = 128
+# hunks and lines past these sizes are left to whole-line colouring
+MAX_WORD_DIFF_HUNK_LINES = 2000
+MAX_WORD_DIFF_LINE_LENGTH = 500
+
+# line index -> changed (start, end) character spans
+WordSpans = Dict[int, List[Tuple[int, int]]]
+
+
+def _display_line(line: str) -> str:
+    """A diff line as the panel draws it, without the \r of a CRLF line."""
+    if line.endswith("\r"):
+        line = line[:-1]
+    return _sub_control("�", line).expandtabs()
+
+
+def word_spans(old: str, new: str) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """Character spans that differ between two lines, compared word by word.
+    Both are empty when the lines have too little in common to be worth it."""
+    old_words = _word.findall(old)
+    new_words = _word.findall(new)
+    matcher = SequenceMatcher(None, old_words, new_words, autojunk=False)
+    if matcher.ratio() < 0.4:
+        return [], []
+
+    old_offsets = list(accumulate((len(w) for w in old_words), initial=0))
+    new_offsets = list(accumulate((len(w) for w in new_words), initial=0))
+    old_spans: List[Tuple[int, int]] = []
+    new_spans: List[Tuple[int, int]] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if i1 < i2:
+            old_spans.append((old_offsets[i1], old_offsets[i2]))
+        if j1 < j2:
+            new_spans.append((new_offsets[j1], new_offsets[j2]))
+    return old_spans, new_spans
+
+
+class DiffDocument:
+    """Diff text split into chunks of whole lines, with the offset of every line
+    indexed once so single lines can be sliced out without splitting the text."""
+
+    def __init__(self, text: str = ""):
+        self._chunks: List[str] = []
+        self._chunk_first_line = array("q")
+        # per chunk, the start offset of each line plus an end sentinel
+        self._line_starts: List[array] = []
+        self._line_count = 0
+        # line index of every @@ hunk header
+        self._hunk_starts = array("q")
+        # trailing text of a streamed diff that doesn't end a line yet
+        self._pending = ""
+        self.max_width = 0
+        if text:
+            self.add_chunk(text if text.endswith("\n") else text + "\n")
+
+
+    @property
+    def line_count(self) -> int:
+        return self._line_count
+
+
+    def append(self, text: str):
+        text = self._pending + text
+        end = text.rfind("\n") + 1
+        self._pending = text[end:]
+        if end > 0:
+            self.add_chunk(text[:end])
+
+
+    def finish(self):
+        if self._pending:
+            self.add_chunk(self._pending + "\n")
+            self._pending = ""
+
+
+    def add_chunk(self, chunk: str):
+        # chunk must end on a line break
+        lines = chunk.split("\n")[:-1]
+        if len(lines) == 0:
+            return
+        lengths = [len(line) + 1 for line in lines]
+        starts = array("q", accumulate(lengths, initial=0))
+        self._chunks.append(chunk)
+        self._chunk_first_line.append(self._line_count)
+        self._line_starts.append(starts)
+        for match in _hunk_header.finditer(chunk):
+            self._hunk_starts.append(
+                    self._line_count + bisect_right(starts, match.start()) - 1)
+        self._line_count += len(lengths)
+        # measured in cells as drawn, so horizontal scrolling reaches line ends
+        if chunk.isascii() and "\t" not in chunk:
+            width = max(len(line) - line.endswith("\r") for line in lines)
+        else:
+            width = max(cell_len(_display_line(line)) for line in lines)
+        self.max_width = max(self.max_width, width)
+
+
+    def line(self, index: int) -> str:
+        chunk_idx = bisect_right(self._chunk_first_line, index) - 1
+        starts = self._line_starts[chunk_idx]
+        local = index - self._chunk_first_line[chunk_idx]
+        line = self._chunks[chunk_idx][starts[local]:starts[local + 1] - 1]
+        # lines of CRLF files keep their \r after splitting on \n
+        return line[:-1] if line.endswith("\r") else line
+
+
+    def hunk_start(self, hunk_idx: int) -> int:
+        """Line index of a hunk's header."""
+        return self._hunk_starts[hunk_idx]
+
+
+    def hunk_of(self, index: int) -> Optional[int]:
+        """Index of the last hunk header at or before line index."""
+        hunk_idx = bisect_right(self._hunk_starts, index) - 1
+        return hunk_idx if hunk_idx >= 0 else None
+
+
+    def hunk_word_spans(self, hunk_idx: int) -> Optional[WordSpans]:
+        """Pairs up the removed and added lines of each change in a hunk and
+        finds the spans that differ. None while the hunk is still incomplete."""
+        header_line = self._hunk_starts[hunk_idx]
+        match = _hunk_header.match(self.line(header_line))
+        if match is None:
+            return {}
+        old_left = int(match.group(1) or 1)
+        new_left = int(match.group(2) or 1)
+        if old_left + new_left > MAX_WORD_DIFF_HUNK_LINES:
+            return {}
+
+        spans: WordSpans = {}
+        removed: List[int] = []
+        added: List[int] = []
+        index = header_line + 1
+        while old_left > 0 or new_left > 0:
+            if index >= self._line_count:
+                return None
+            line = self.line(index)
+            kind = line[:1]
+            if kind == "-":
+                if added:
+                    self._pair_lines(removed, added, spans)
+                    removed, added = [], []
+                old_left -= 1
+                removed.append(index)
+            elif kind == "+":
+                new_left -= 1
+                added.append(index)
+            elif kind != "\\":
+                # context line, closes the current change
+                old_left -= 1
+                new_left -= 1
+                self._pair_lines(removed, added, spans)
+                removed, added = [], []
+            index += 1
+        self._pair_lines(removed, added, spans)
+        return spans
+
+
+    def _pair_lines(self, removed: List[int], added: List[int], spans: WordSpans):
+        for old_idx, new_idx in zip(removed, added):
+            old_line = self.line(old_idx)[1:]
+            new_line = self.line(new_idx)[1:]
+            if len(old_line) > MAX_WORD_DIFF_LINE_LENGTH \
+                    or len(new_line) > MAX_WORD_DIFF_LINE_LENGTH:
+                continue
+            old_spans, new_spans = word_spans(old_line, new_line)
+            if old_spans:
+                spans[old_idx] = [(start + 1, end + 1) for start, end in old_spans]
+            if new_spans:
+                spans[new_idx] = [(start + 1, end + 1) for start, end in new_spans]
+
+
+class DiffPanel(ScrollView):
+    """Renders only the visible lines of a diff, styling them a window at a time."""
 
-class DiffPanel(VerticalScroll):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._document = DiffDocument()
+        self._source: Hashable = None
+        self._window_cache = StatsCache("diff window", max_entries=16)
+        # (source, hunk) -> WordSpans, worked out only once a hunk is on screen
+        self._word_span_cache = StatsCache("word diff", max_entries=512)
+        # a streamed hunk that was styled before all of it had arrived
+        self._incomplete_hunk: Optional[int] = None
+
+
+    def set_text(self, text: str, source: Hashable = None):
+        """source identifies the diff for the word diff memo; None disables it."""
+        self._document = DiffDocument(text)
+        self._source = source
+        self._incomplete_hunk = None
+        self._window_cache.clear()
+        self.virtual_size = Size(self._document.max_width, self._document.line_count)
+        self.scroll_home(animate=False)
+        self.refresh()
+
+
+    def append_text(self, text: str):
+        first_new_line = self._document.line_count
+        self._document.append(text)
+        self._update_appended(first_new_line)
+
+
+    def finish_text(self):
+        first_new_line = self._document.line_count
+        self._document.finish()
+        self._update_appended(first_new_line)
+
+
+    def _update_appended(self, first_new_line: int):
+        if self._document.line_count == first_new_line:
+            return
+        # the last window may have been styled while it was still short, and
+        # every window of a hunk that was incomplete lacks its word spans
+        first_window = last_window = first_new_line // WINDOW_LINES
+        if self._incomplete_hunk is not None:
+            first_window = self._document.hunk_start(self._incomplete_hunk) // WINDOW_LINES
+            self._incomplete_hunk = None
+        for window_idx in range(first_window, last_window + 1):
+            self._window_cache.pop(window_idx)
+        self.virtual_size = Size(self._document.max_width, self._document.line_count)
+        self.refresh()
+
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._window_cache.clear()
+
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        line_idx = scroll_y + y
+        rich_style = self.rich_style
+        width = self.size.width
+        if line_idx >= self._document.line_count:
+            return Strip.blank(width, rich_style)
+
+        window = self._window(line_idx // WINDOW_LINES, rich_style)
+        strip = window[line_idx % WINDOW_LINES]
+        return strip.crop_extend(scroll_x, scroll_x + width, rich_style)
+
+
+    def _window(self, window_idx: int, rich_style: Style) -> List[Strip]:
+        window = self._window_cache.get(window_idx)
+        if window is None:
+            first = window_idx * WINDOW_LINES
+            last = min(first + WINDOW_LINES, self._document.line_count)
+            window = [self._style_line(i, rich_style) for i in range(first, last)]
+            self._window_cache.put(window_idx, window)
+        return window
+
+
+    def _line_word_spans(self, line_idx: int) -> List[Tuple[int, int]]:
+        if self._source is None:
+            return []
+        hunk_idx = self._document.hunk_of(line_idx)
+        if hunk_idx is None:
+            return []
+        key = (self._source, hunk_idx)
+        spans = self._word_span_cache.get(key)
+        if spans is None:
+            spans = self._document.hunk_word_spans(hunk_idx)
+            if spans is None:
+                self._incomplete_hunk = hunk_idx
+                return []
+            self._word_span_cache.put(key, spans)
+        return spans.get(line_idx, [])
+
 
+    def _style_line(self, line_idx: int, rich_style: Style) -> Strip:
+        line = _sub_control("�", self._document.line(line_idx))
+        word_style = None
+        if line.startswith("+"):
+            style = rich_style + ADDED_STYLE
+            word_style = ADDED_WORD_STYLE
+        elif line.startswith("-"):
+            style = rich_style + REMOVED_STYLE
+            word_style = REMOVED_WORD_STYLE
+        elif line.startswith("@"):
+            style = rich_style + HUNK_STYLE
+        else:
+            style = rich_style
 
-    def compose(self) -> ComposeResult:
-        yield DiffText()
+        spans = self._line_word_spans(line_idx) if word_style else []
+        if not spans:
+            line = line.expandtabs()
+            return Strip([Segment(line, style)], cell_len(line))
 
+        text = Text(line, style=style, no_wrap=True, end="")
+        for start, end in spans:
+            text.stylize(word_style, start, end)
+        text.expand_tabs()
+        return Strip(text.render(self.app.console), text.cell_len)
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import threading
+import zlib
+from typing import Dict, Hashable, Tuple
+from lazysvn.cache_dir import cache_dir
+from lazysvn.caches import CacheStats
+
+
+class DiskCache:
+    """zlib-compressed text entries under the lazysvn cache directory.
+
+    Meant for values that never change once written, such as the diff of a
+    committed revision. Reads refresh an entry's mtime and writes evict the
+    least recently used entries once the directory grows past max_bytes.
+    """
+
+    SUFFIX = ".z"
+
+    def __init__(self, name: str, subdir: str, max_bytes: int):
+        self.name = name
+        self._max_bytes = max_bytes
+        self._dir = cache_dir(subdir)
+        self._lock = threading.Lock()
+        # file name -> (size, mtime), loaded on first use
+        self._index: Dict[str, Tuple[int, float]] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.drops = 0
+
+
+    def _file_name(self, key: Hashable) -> str:
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + self.SUFFIX
+
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._index is None:
+            self._index = {}
+            with os.scandir(self._dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.SUFFIX):
+                        stat = entry.stat()
+                        self._index[entry.name] = (stat.st_size, stat.st_mtime)
+        return self._index
+
+
+    def get(self, key: Hashable, default=None):
+        file_name = self._file_name(key)
+        path = os.path.join(self._dir, file_name)
+        try:
+            with open(path, "rb") as f:
+                value = zlib.decompress(f.read()).decode("utf-8")
+            os.utime(path)
+        except (OSError, zlib.error):
+            with self._lock:
+                self.misses += 1
+            return default
+
+        with self._lock:
+            self.hits += 1
+            index = self._load_index()
+            if file_name in index:
+                index[file_name] = (index[file_name][0], os.path.getmtime(path))
+        return value
+
+
+    def put(self, key: Hashable, value: str):
+        data = zlib.compress(value.encode("utf-8"))
+        if len(data) > self._max_bytes:
+            return
+        file_name = self._file_name(key)
+        path = os.path.join(self._dir, file_name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            index = self._load_index()
+            index[file_name] = (len(data), os.path.getmtime(path))
+            self._evict(index)
+
+
+    def _evict(self, index: Dict[str, Tuple[int, float]]):
+        total = sum(size for size, _ in index.values())
+        if total <= self._max_bytes:
+            return
+        for file_name in sorted(index, key=lambda name: index[name][1]):
+            if total <= self._max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self._dir, file_name))
+            except OSError:
+                pass
+            total -= index.pop(file_name)[0]
+            self.evictions += 1
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        return os.path.exists(os.path.join(self._dir, self._file_name(key)))
+
+
+    def drop(self):
+        with self._lock:
+            for file_name in self._load_index():
+                try:
+                    os.remove(os.path.join(self._dir, file_name))
+                except OSError:
+                    pass
+            self._index = {}
+            self.drops += 1
+
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            index = self._load_index()
+            return CacheStats(
+                self.name,
+                len(index),
+                sum(size for size, _ in index.values()),
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.drops,
+            )
@@ -0,0 +1,77 @@
+from bisect import bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from lazysvn.svn_xml import Copy
+
+
+class CopyIndex:
+    """Copies seen in the log, indexed by the path they created.
+
+    Answers where a path came from, e.g. which trunk revision a branch was
+    made from, from log data already fetched rather than another query.
+    """
+
+    # guards against a cycle in malformed history
+    MAX_HOPS = 64
+
+    def __init__(self):
+        # destination path -> copies to it, oldest first
+        self._by_path: Dict[str, List[Copy]] = {}
+        self._by_revision: Dict[int, List[Copy]] = {}
+
+
+    def __len__(self) -> int:
+        return sum(len(copies) for copies in self._by_revision.values())
+
+
+    def add(self, copies: Iterable[Copy]):
+        for copy in copies:
+            known = self._by_revision.setdefault(copy.revision, [])
+            if copy in known:
+                continue
+            known.append(copy)
+            insort(self._by_path.setdefault(copy.path, []), copy,
+                   key=lambda c: c.revision)
+
+
+    def copies_in(self, revision: int) -> List[Copy]:
+        return self._by_revision.get(revision, [])
+
+
+    def copies_from(self, path: str) -> List[Copy]:
+        """Copies made from path itself, newest first."""
+        return sorted((copy for copies in self._by_revision.values() for copy in copies
+                       if copy.from_path == path),
+                      key=lambda c: c.revision, reverse=True)
+
+
+    def origin(self, path: str, revision: int) -> Optional[Tuple[Copy, str]]:
+        """The newest copy at or before revision that created path or one of
+        its parents, with path translated to where it was copied from."""
+        prefix = path
+        while True:
+            copies = self._by_path.get(prefix)
+            if copies:
+                idx = bisect_right(copies, revision, key=lambda c: c.revision)
+                if idx > 0:
+                    copy = copies[idx - 1]
+                    return copy, copy.from_path + path[len(prefix):]
+            if prefix in ("", "/"):
+                return None
+            prefix = prefix.rsplit("/", 1)[0] or "/"
+
+
+    def lineage(self, path: str, revision: int) -> List[Tuple[str, int]]:
+        """(path, revision) for path and every copy source before it, newest first."""
+        hops = [(path, revision)]
+        for _ in range(self.MAX_HOPS):
+            found = self.origin(*hops[-1])
+            if found is None:
+                break
+            copy, from_path = found
+            hops.append((from_path, copy.from_revision))
+        return hops
+
+
+    def clear(self):
+        self._by_path.clear()
+        self._by_revision.clear()
@@ -1,12 +1,23 @@
 
 from enum import Enum
+from functools import partial
+from textual.worker import get_current_worker
 from lazysvn.log_view import LogView
+from lazysvn.poller import AdaptivePoller
+from lazysvn.svn_model import SVNCommandError
+
+
+# revisions on either side of the cursor whose diffs are fetched ahead
+PREFETCH_RADIUS = 2
+# only revisions touching at most this many paths count as small
+PREFETCH_MAX_PATHS = 10
 
 
 class LogPanel(Enum):
     LOGS = 1
     MESSAGE = 2
     CHANGELIST = 3
+    DIFF = 4
 
 
 class LogPresenter:
@@ -15,6 +26,20 @@ class LogPresenter:
         self._svn_model = svn_model
         self._selected_panel = LogPanel.LOGS
         self._loading = False
+        self._new_revision_count = 0
+        # (revision, path) the last jump to a copy origin landed on, so the
+        # next jump keeps following that path
+        self._followed_copy = None
+        # the result shown last in the merge info screen, kept current as
+        # new revisions arrive
+        self._merge_info = None
+        self._log_poller = AdaptivePoller(
+                self.poll_new_log_entries, min_interval=15.0, max_interval=300.0)
+
+
+    @property
+    def is_busy(self) -> bool:
+        return self._loading
 
 
     def on_view_mount(self):
@@ -23,6 +48,10 @@ class LogPresenter:
         self._log_view.run_worker(self.fetch_log_entries, thread=True)
 
 
+    def on_view_unmount(self):
+        self._log_poller.stop()
+
+
     def refresh(self):
         pass
 
@@ -33,8 +62,12 @@ class LogPresenter:
         if self._selected_panel == LogPanel.LOGS:
             self._log_view.next_log_panel_row()
             self.update_logentry_panels()
+            self.update_new_revisions_indicator()
         elif self._selected_panel == LogPanel.CHANGELIST:
             self._log_view.next_changelist_panel_row()
+            self.update_revision_diff()
+        elif self._selected_panel == LogPanel.DIFF:
+            self._log_view.scroll_diff_panel_down()
 
 
     def on_key_up(self):
@@ -43,8 +76,12 @@ class LogPresenter:
         if self._selected_panel == LogPanel.LOGS:
             self._log_view.prev_log_panel_row()
             self.update_logentry_panels()
+            self.update_new_revisions_indicator()
         elif self._selected_panel == LogPanel.CHANGELIST:
             self._log_view.prev_changelist_panel_row()
+            self.update_revision_diff()
+        elif self._selected_panel == LogPanel.DIFF:
+            self._log_view.scroll_diff_panel_up()
 
 
     def on_key_left(self):
@@ -70,13 +107,85 @@ class LogPresenter:
         )
 
 
+    def on_key_v(self):
+        if self._loading:
+            return
+        self._log_view.toggle_log_panel_mark()
+
+
+    def on_key_r(self):
+        marked = self._log_view.marked_revisions
+        if len(marked) < 2:
+            self._log_view.app.notify(
+                "Mark two revisions with v first",
+                severity="warning",
+                timeout=3
+            )
+            return
+        self._log_view.show_range_diff(marked[0], marked[1])
+
+
+    def on_key_o(self):
+        if self._loading:
+            return
+        revision = int(self._log_view.log_panel_rich_row[0].plain)
+        path = None
+        if self._followed_copy is not None and self._followed_copy[0] == revision:
+            path = self._followed_copy[1]
+        found = self._svn_model.copy_origin(revision, path)
+        if found is None:
+            self._log_view.app.notify(
+                f"No copy found behind r{revision} in the loaded log",
+                severity="warning",
+                timeout=3
+            )
+            return
+
+        copy, from_path = found
+        if not self._log_view.select_log_panel_revision(copy.from_revision):
+            self._log_view.app.notify(
+                f"{copy.path} was copied from {copy.from_path}@{copy.from_revision}, "
+                "which isn't loaded yet (n loads more)",
+                severity="warning",
+                timeout=5
+            )
+            return
+        self._followed_copy = (copy.from_revision, from_path)
+        self.update_logentry_panels()
+        self.update_new_revisions_indicator()
+        lineage = self._svn_model.copy_lineage(from_path, copy.from_revision)
+        self._log_view.app.notify(
+            " ← ".join(f"{hop_path}@{hop_revision}" for hop_path, hop_revision in lineage),
+            title=f"Origin of {copy.path}",
+            severity="information",
+            timeout=5
+        )
+
+
+    def on_key_i(self):
+        if self._merge_info is not None:
+            target = f"^{self._merge_info.target}"
+        else:
+            target = self._svn_model.suggested_merge_target()
+        self._log_view.show_merge_info(target, self.on_merge_info)
+
+
+    def on_merge_info(self, merge_info):
+        if merge_info is None:
+            return
+        self._merge_info = merge_info
+        self._log_view.set_log_panel_merged(merge_info.merged)
+
+
     def select_prev_panel(self):
         if self._selected_panel == LogPanel.LOGS:
-            self.focus_changelist_panel()
+            self.focus_diff_panel()
         elif self._selected_panel == LogPanel.MESSAGE:
             self.focus_log_panel()
         elif self._selected_panel == LogPanel.CHANGELIST:
             self.focus_msg_panel()
+        elif self._selected_panel == LogPanel.DIFF:
+            self.focus_changelist_panel()
 
 
     def select_next_panel(self):
@@ -85,19 +194,74 @@ class LogPresenter:
         elif self._selected_panel == LogPanel.MESSAGE:
             self.focus_changelist_panel()
         elif self._selected_panel == LogPanel.CHANGELIST:
+            self.focus_diff_panel()
+        elif self._selected_panel == LogPanel.DIFF:
             self.focus_log_panel()
 
 
     def update_logentry_panels(self):
-        rich_log_row = self._log_view.log_panel_rich_row
-        self._log_view.set_info_text(
-            rich_log_row[1].plain,
-            rich_log_row[2].plain,
-            rich_log_row[0].plain
-        )
-        self._log_view.set_msg_text(rich_log_row[3].plain)
-        log_cache_entry = self._svn_model.get_log_cache_entry(int(rich_log_row[0].plain))
-        self._log_view.set_changelist_panel_data(log_cache_entry[1])
+        with self._svn_model.metrics.span("LogPresenter.update_logentry_panels"):
+            rich_log_row = self._log_view.log_panel_rich_row
+            copies = self._svn_model.copies_in(int(rich_log_row[0].plain))
+            self._log_view.set_info_text(
+                rich_log_row[1].plain,
+                rich_log_row[2].plain,
+                rich_log_row[0].plain,
+                ", ".join(f"{copy.from_path}@{copy.from_revision}" for copy in copies)
+            )
+            self._log_view.set_msg_text(rich_log_row[3].plain)
+            log_cache_entry = self._svn_model.get_log_cache_entry(int(rich_log_row[0].plain))
+            # the log cache can be dropped from the diagnostics screen
+            changelist = log_cache_entry[1] if log_cache_entry is not None else []
+            self._log_view.set_changelist_panel_data(changelist, int(rich_log_row[0].plain))
+            self.update_revision_diff()
+            self.prefetch_revision_diffs()
+
+
+    def update_revision_diff(self):
+        revision = int(self._log_view.log_panel_rich_row[0].plain)
+        action, path = self._log_view.changelist_panel_row
+        if path == "":
+            self._log_view.set_diff_text("")
+            return
+        self._log_view.run_worker(
+                partial(self.load_revision_diff, revision, action, path),
+                group="revision-diff", exclusive=True, thread=True)
+
+
+    def load_revision_diff(self, revision: int, action: str, path: str):
+        worker = get_current_worker()
+        try:
+            diff = self._svn_model.revision_diff(revision, path, action)
+        except SVNCommandError as e:
+            diff = e.stderr
+        if not worker.is_cancelled:
+            self._log_view.app.call_from_thread(
+                    self._log_view.set_diff_text, diff, (revision, path), f"r{revision} {path}")
+
+
+    def prefetch_revision_diffs(self):
+        revisions = self._log_view.log_panel_revisions_near(PREFETCH_RADIUS)
+        self._log_view.run_worker(
+                partial(self.fetch_revision_diffs, revisions),
+                group="revision-diff-prefetch", exclusive=True, thread=True)
+
+
+    def fetch_revision_diffs(self, revisions):
+        worker = get_current_worker()
+        for revision in revisions:
+            log_cache_entry = self._svn_model.get_log_cache_entry(revision)
+            if log_cache_entry is None or len(log_cache_entry[1]) > PREFETCH_MAX_PATHS:
+                continue
+            for action, path in log_cache_entry[1]:
+                if worker.is_cancelled:
+                    return
+                if self._svn_model.has_revision_diff(revision, path):
+                    continue
+                try:
+                    self._svn_model.revision_diff(revision, path, action)
+                except SVNCommandError:
+                    pass
 
 
     def focus_log_panel(self):
@@ -115,6 +279,11 @@ class LogPresenter:
         self._log_view.give_changelist_panel_focus()
 
 
+    def focus_diff_panel(self):
+        self._selected_panel = LogPanel.DIFF
+        self._log_view.give_diff_panel_focus()
+
+
     def fetch_log_entries(self):
         self._loading = True
         self._log_view.set_log_loading(True)
@@ -125,6 +294,36 @@ class LogPresenter:
                 "Revision")
         self._log_view.set_log_loading(False)
         self._loading = False
+        self._log_poller.start()
+
+
+    def poll_new_log_entries(self) -> bool:
+        log_entries = self._svn_model.fetch_new_logs()
+        if len(log_entries) == 0:
+            return False
+        if self._merge_info is not None:
+            try:
+                self._merge_info = self._svn_model.extend_merge_info(self._merge_info)
+            except SVNCommandError:
+                # picked up the next time merge info is opened
+                pass
+        self._log_view.app.call_from_thread(self.prepend_log_entries, log_entries)
+        return True
+
+
+    def prepend_log_entries(self, log_entries):
+        self._log_view.prepend_log_panel_data(log_entries)
+        self._new_revision_count += len(log_entries)
+        self._log_view.set_new_revisions_indicator(self._new_revision_count)
+
+
+    def update_new_revisions_indicator(self):
+        # new revisions count as seen once the cursor reaches them
+        if self._new_revision_count == 0:
+            return
+        if self._log_view.log_panel_cursor_row < self._new_revision_count:
+            self._new_revision_count = 0
+            self._log_view.set_new_revisions_indicator(0)
 
 
     def fetch_more_log_entries(self, quantity=100):
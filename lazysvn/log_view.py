@@ -1,5 +1,6 @@
 
-from typing import Optional
+from typing import Hashable, List, Optional, Tuple
+from textual import on
 from textual.app import ComposeResult
 from textual.widget import Widget
 from textual.screen import Screen
@@ -9,6 +10,9 @@ from textual.binding import Binding
 from rich.text import Text
 from rich.console import RenderableType
 from lazysvn.svn_log_panel import SvnLogPanel
+from lazysvn.diff_panel import DiffPanel
+from lazysvn.caches import StatsCache
+from lazysvn.path_tree import PathNode, PathTree
 
 
 class LogView(Screen):
@@ -21,6 +25,10 @@ class LogView(Screen):
         Binding("shift+tab", "on_key_left", "", show=False),
         ("n", "on_key_n", "next 100"),
         ("M", "on_key_shift_m", "grab commit msg"),
+        ("v", "on_key_v", "mark"),
+        ("r", "on_key_r", "diff marked range"),
+        ("o", "on_key_o", "go to copy origin"),
+        ("i", "on_key_i", "merge info"),
     ]
 
     DEFAULT_CSS = """
@@ -78,6 +86,7 @@ class LogView(Screen):
 
     .details-panel {
         column-span: 3;
+        grid-rows: 8 1fr 1fr 2fr;
     }
 
     .details-panel:focus-within {
@@ -106,8 +115,14 @@ class LogView(Screen):
         background: #403d52;
     }
 
+    .revision-diff {
+        border: solid grey;
+        padding: 0 1;
+    }
+
     ChangelistPanel:focus-within,
-    VerticalScroll:focus-within {
+    VerticalScroll:focus-within,
+    .revision-diff:focus {
         border: solid #8ec07c;
     }
 
@@ -141,6 +156,7 @@ class LogView(Screen):
                     classes="msg-panel"
             )
             yield ChangelistPanel()
+            yield DiffPanel(classes="revision-diff")
         # loading layer
         with Horizontal(classes="loading -hidden"):
             yield Label(" Loading...")
@@ -157,13 +173,25 @@ class LogView(Screen):
         self._msg_text = self.query_one(".msg-text", Static)
 
         self._changelist_panel = self.query_one(ChangelistPanel)
+        self._diff_panel = self.query_one(".revision-diff", DiffPanel)
+        self._diff_panel.border_title = "Diff"
+        self._diff_panel.can_focus = True
         self._loading_indicator = self.query_one(".loading", Horizontal)
         self._presenter.on_view_mount()
 
 
+    def on_unmount(self) -> None:
+        self._presenter.on_view_unmount()
+
+
     ############################ General ###############################
 
 
+    @property
+    def is_busy(self) -> bool:
+        return self._presenter.is_busy
+
+
     ############################ Keybindings #############################
 
 
@@ -191,6 +219,22 @@ class LogView(Screen):
         self._presenter.on_key_shift_m()
 
 
+    def action_on_key_v(self):
+        self._presenter.on_key_v()
+
+
+    def action_on_key_r(self):
+        self._presenter.on_key_r()
+
+
+    def action_on_key_o(self):
+        self._presenter.on_key_o()
+
+
+    def action_on_key_i(self):
+        self._presenter.on_key_i()
+
+
     ############################ Logs Panel ##############################
 
 
@@ -206,6 +250,50 @@ class LogView(Screen):
         self._log_panel.append_table_data(data)
 
 
+    def prepend_log_panel_data(self, data):
+        self._log_panel.prepend_table_data(data)
+
+
+    def set_new_revisions_indicator(self, count: int):
+        self._log_panel.border_subtitle = f"{count} new" if count else ""
+
+
+    @property
+    def log_panel_cursor_row(self) -> int:
+        return self._log_panel.cursor_row
+
+
+    def toggle_log_panel_mark(self):
+        self._log_panel.toggle_mark()
+
+
+    @property
+    def marked_revisions(self):
+        return self._log_panel.marked_revisions
+
+
+    def show_range_diff(self, rev_a: int, rev_b: int):
+        from lazysvn.range_diff_view import RangeDiffView
+        self.app.push_screen(RangeDiffView(self._svn_model, rev_a, rev_b))
+
+
+    def show_merge_info(self, suggested_target: str, on_dismiss):
+        from lazysvn.merge_info_view import MergeInfoView
+        self.app.push_screen(MergeInfoView(self._svn_model, suggested_target), on_dismiss)
+
+
+    def set_log_panel_merged(self, merged):
+        self._log_panel.set_merged_revisions(merged)
+
+
+    def select_log_panel_revision(self, revision: int) -> bool:
+        return self._log_panel.select_revision(revision)
+
+
+    def log_panel_revisions_near(self, radius: int):
+        return self._log_panel.revisions_near(radius)
+
+
     def give_log_panel_focus(self):
         self._log_panel.give_focus()
 
@@ -239,8 +327,8 @@ class LogView(Screen):
     ############################ Info Panel ##############################
 
 
-    def set_info_text(self, author: str, date: str, revision: str):
-        self._info_panel.set_info_text(author, date, revision)
+    def set_info_text(self, author: str, date: str, revision: str, copied_from: str = ""):
+        self._info_panel.set_info_text(author, date, revision, copied_from)
 
 
     ############################ Msg Panel ###############################
@@ -269,8 +357,8 @@ class LogView(Screen):
     ######################## Changelist Panel ############################
 
 
-    def set_changelist_panel_data(self, table_data):
-        self._changelist_panel.set_table_data(table_data)
+    def set_changelist_panel_data(self, table_data, key=None):
+        self._changelist_panel.set_table_data(table_data, key)
 
 
     def give_changelist_panel_focus(self):
@@ -285,6 +373,35 @@ class LogView(Screen):
         self._changelist_panel.prev_row()
 
 
+    @property
+    def changelist_panel_row(self):
+        return self._changelist_panel.row
+
+
+    ########################### Diff Panel ###############################
+
+
+    def set_diff_text(self, text: str, source=None, title: str = ""):
+        if not self._diff_panel:
+            return
+        self._diff_panel.set_text(text, source)
+        self._diff_panel.border_subtitle = title
+
+
+    def give_diff_panel_focus(self):
+        if not self._diff_panel:
+            return
+        self._diff_panel.focus()
+
+
+    def scroll_diff_panel_down(self):
+        self._diff_panel.scroll_down(animate=False)
+
+
+    def scroll_diff_panel_up(self):
+        self._diff_panel.scroll_up(animate=False)
+
+
     ######################### Custom Widgets #############################
 
 
@@ -295,6 +412,7 @@ class InfoPanel(Widget):
         self._author = ""
         self._date = ""
         self._revision = ""
+        self._copied_from = ""
 
     def render(self) -> RenderableType:
         grey = "#908caa"
@@ -305,20 +423,34 @@ class InfoPanel(Widget):
         text.append(f"{self._date}\n")
         text.append(f"Revision: ", style=grey)
         text.append(f"{self._revision}\n")
+        if self._copied_from:
+            text.append(f"Copied from: ", style=grey)
+            text.append(f"{self._copied_from}\n", style="#f6c177")
         return text
 
-    def set_info_text(self, author: str, date: str, revision: str):
+    def set_info_text(self, author: str, date: str, revision: str, copied_from: str = ""):
         self._author = author
         self._date = date
         self._revision = revision
+        self._copied_from = copied_from
         self.refresh()
 
 
 class ChangelistPanel(Widget):
+    """Changed paths as a tree of directories, built a level at a time as
+    directories are expanded with enter."""
+
+    # changelists up to this size start fully expanded
+    AUTO_EXPAND_LIMIT = 50
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.border_title = "Changelist"
         self._table: Optional[DataTable] = None
+        self._tree = PathTree([])
+        self._rows: List[Tuple[int, str, PathNode]] = []
+        # key given with the data (a revision) -> its PathTree, expansions included
+        self._tree_cache = StatsCache("changelist trees", max_entries=32)
 
 
     def compose(self) -> ComposeResult:
@@ -332,13 +464,56 @@ class ChangelistPanel(Widget):
         self._table.add_column("File")
 
 
-    def set_table_data(self, table_data) -> None:
+    def set_table_data(self, table_data, key: Hashable = None) -> None:
         if not self._table:
             raise Exception("ChangelistPanel not mounted")
+        tree = self._tree_cache.get(key) if key is not None else None
+        if tree is None:
+            tree = PathTree(table_data, expanded=len(table_data) <= self.AUTO_EXPAND_LIMIT)
+            if key is not None and len(table_data) > 0:
+                self._tree_cache.put(key, tree)
+        self._tree = tree
+        self.border_subtitle = f"{tree.root.count} paths" if tree.root.count else ""
+        self._build_rows()
+        # start on the first changed file, as a flat list would
+        first_file = next((idx for idx, (_, _, node) in enumerate(self._rows)
+                           if not node.is_dir), 0)
+        self._table.move_cursor(row=first_file)
+
+
+    def _build_rows(self):
+        if not self._table:
+            return
         self._table.clear()
-        for entry in table_data:
-            row = [entry[0], entry[1]]
-            self._table.add_row(*row)
+        self._rows = self._tree.rows()
+        for depth, label, node in self._rows:
+            indent = "  " * depth
+            if node.is_dir:
+                marker = "▾" if self._tree.is_expanded(node) else "▸"
+                name = Text(f"{indent}{marker} {label}/", style="#9ccfd8")
+                name.append(f"  {node.count}", style="#6e6a86")
+            else:
+                name = Text(f"{indent}  {label}")
+            status = node.change.status if node.change is not None else ""
+            self._table.add_row(status, name)
+
+
+    @on(DataTable.RowSelected)
+    def on_row_selected(self, event: DataTable.RowSelected):
+        event.stop()
+        self.toggle_row()
+
+
+    def toggle_row(self) -> None:
+        if not self._table or self._table.row_count == 0:
+            return
+        cursor_row = self._table.cursor_row
+        node = self._rows[cursor_row][2]
+        if not node.is_dir:
+            return
+        self._tree.toggle(node)
+        self._build_rows()
+        self._table.move_cursor(row=cursor_row)
 
 
     def next_row(self) -> None:
@@ -356,11 +531,15 @@ class ChangelistPanel(Widget):
 
 
     @property
-    def row(self) -> str:
+    def row(self) -> Tuple[str, str]:
+        """(action, path) of the change on the cursor row; a directory that
+        wasn't changed itself has none."""
         if not self._table or self._table.row_count == 0:
-            return ""
-        rich_row = self._table.get_row_at(self._table.cursor_row)
-        return rich_row[0].plain
+            return ("", "")
+        change = self._rows[self._table.cursor_row][2].change
+        if change is None:
+            return ("", "")
+        return (change.status, change.path)
 
 
     def is_focused(self) -> bool:
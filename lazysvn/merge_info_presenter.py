@@ -0,0 +1,59 @@
+from functools import partial
+from typing import Optional
+from textual.worker import get_current_worker
+from lazysvn.merge_info_view import MergeInfoView
+from lazysvn.svn_model import MergeInfo, SVNCommandError
+
+
+class MergeInfoPresenter:
+    def __init__(self, merge_info_view, svn_model):
+        self._merge_info_view: MergeInfoView = merge_info_view
+        self._svn_model = svn_model
+        self.merge_info: Optional[MergeInfo] = None
+
+
+    def on_submit(self, target: str):
+        target = target.strip()
+        if target.startswith("^"):
+            target = target[1:]
+        target = "/" + target.strip("/")
+        if target == "/":
+            return
+        self._merge_info_view.set_target_subtitle("loading")
+        self._merge_info_view.run_worker(
+                partial(self.fetch_merge_info, target),
+                group="merge-info", exclusive=True, thread=True)
+
+
+    def fetch_merge_info(self, target: str):
+        worker = get_current_worker()
+        try:
+            info = self._svn_model.merge_info(target)
+        except SVNCommandError as e:
+            if not worker.is_cancelled:
+                self._merge_info_view.app.call_from_thread(self.show_error, e)
+            return
+        if not worker.is_cancelled:
+            self._merge_info_view.app.call_from_thread(self.show_merge_info, info)
+
+
+    def show_merge_info(self, info: MergeInfo):
+        self.merge_info = info
+        self._merge_info_view.set_target_subtitle(
+                f"^{info.source} → ^{info.target}@{info.target_revision}")
+        self._merge_info_view.set_eligible(
+                info.eligible.format() or "nothing left to merge",
+                f"{len(info.eligible)} revisions")
+        self._merge_info_view.set_merged(
+                info.merged.format() or "nothing merged yet",
+                f"{len(info.merged)} revisions")
+
+
+    def show_error(self, error: SVNCommandError):
+        self._merge_info_view.set_target_subtitle("failed")
+        self._merge_info_view.app.notify(
+            str(error),
+            title="Merge info failed",
+            severity="error",
+            timeout=10
+        )
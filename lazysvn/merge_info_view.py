@@ -0,0 +1,120 @@
+from typing import Optional
+from textual import on
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.containers import VerticalScroll
+from textual.widgets import Footer, Input, Static
+
+
+class MergeInfoView(Screen):
+    """Shows which revisions of the working copy's branch have been merged into
+    a target branch. Dismissing it hands the last result back to the Log."""
+
+    BINDINGS = [
+        ("escape", "on_key_escape", "back"),
+    ]
+
+    DEFAULT_CSS = """
+    MergeInfoView {
+        layout: grid;
+        grid-size: 2 2;
+        grid-rows: 3 1fr;
+    }
+
+    MergeInfoView Widget {
+        scrollbar-color: grey;
+        scrollbar-color-hover: grey;
+        scrollbar-background: #1f1d2e;
+        scrollbar-corner-color: #1f1d2e;
+        scrollbar-size: 1 1;
+        background: #1f1d2e;
+    }
+
+    MergeInfoView Footer > .footer--key {
+        background: #383838;
+    }
+
+    MergeInfoView Input {
+        column-span: 2;
+        border: solid grey;
+        padding: 0 1;
+    }
+
+    MergeInfoView Input:focus {
+        border: solid #8ec07c;
+    }
+
+    MergeInfoView VerticalScroll {
+        border: solid grey;
+        padding: 0 1;
+    }
+    """
+
+
+    def __init__(self, svn_model, suggested_target: str = "", *args, **kwargs):
+        from lazysvn.merge_info_presenter import MergeInfoPresenter
+        super().__init__(*args, **kwargs)
+        self.title = "Merge info"
+        self._suggested_target = suggested_target
+        self._presenter = MergeInfoPresenter(self, svn_model)
+
+        # initalized later in on_mount
+        self._target_input: Optional[Input] = None
+        self._eligible_panel: Optional[VerticalScroll] = None
+        self._eligible_text: Optional[Static] = None
+        self._merged_panel: Optional[VerticalScroll] = None
+        self._merged_text: Optional[Static] = None
+
+
+    def compose(self) -> ComposeResult:
+        yield Input(value=self._suggested_target, placeholder="^/branches/...")
+        yield VerticalScroll(Static(classes="eligible-text"), classes="eligible-panel")
+        yield VerticalScroll(Static(classes="merged-text"), classes="merged-panel")
+        yield Footer()
+
+
+    def on_mount(self) -> None:
+        self._target_input = self.query_one(Input)
+        self._target_input.border_title = "Merge target"
+        self._eligible_panel = self.query_one(".eligible-panel", VerticalScroll)
+        self._eligible_panel.border_title = "Eligible"
+        self._eligible_text = self.query_one(".eligible-text", Static)
+        self._merged_panel = self.query_one(".merged-panel", VerticalScroll)
+        self._merged_panel.border_title = "Merged"
+        self._merged_text = self.query_one(".merged-text", Static)
+        self._target_input.focus()
+
+
+    ############################ Keybindings #############################
+
+
+    @on(Input.Submitted)
+    def on_target_submitted(self, event: Input.Submitted):
+        self._presenter.on_submit(event.value)
+
+
+    def action_on_key_escape(self):
+        self.dismiss(self._presenter.merge_info)
+
+
+    ########################### Result Panels ############################
+
+
+    def set_target_subtitle(self, subtitle: str):
+        if not self._target_input:
+            return
+        self._target_input.border_subtitle = subtitle
+
+
+    def set_eligible(self, text: str, subtitle: str = ""):
+        if not self._eligible_panel or not self._eligible_text:
+            return
+        self._eligible_text.update(text)
+        self._eligible_panel.border_subtitle = subtitle
+
+
+    def set_merged(self, text: str, subtitle: str = ""):
+        if not self._merged_panel or not self._merged_text:
+            return
+        self._merged_text.update(text)
+        self._merged_panel.border_subtitle = subtitle
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from typing import Deque, Dict, List
+
+
+# start and duration are in seconds, start relative to Metrics creation
+Span = namedtuple("Span", ["name", "category", "start", "duration", "thread_id", "args"])
+
+
+class _Aggregate:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.failures = 0
+        self.stdout_bytes = 0
+
+
+class Metrics:
+    """Collects timing spans for svn invocations, parsing and UI updates.
+
+    Spans are kept in a bounded buffer for the Chrome trace export, while the
+    per-name aggregates used by the OpenMetrics snapshot cover the whole session.
+    """
+
+    def __init__(self, max_spans: int = 100_000):
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._aggregates: Dict[tuple, _Aggregate] = {}
+
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+
+    def record(self, name: str, category: str, start: float, duration: float, **args):
+        span = Span(name, category, start - self._origin, duration,
+                    threading.get_ident(), args)
+        with self._lock:
+            self._spans.append(span)
+            aggregate = self._aggregates.setdefault((category, name), _Aggregate())
+            aggregate.count += 1
+            aggregate.total += duration
+            aggregate.max = max(aggregate.max, duration)
+            if args.get("exit_code", 0) != 0:
+                aggregate.failures += 1
+            aggregate.stdout_bytes += args.get("stdout_bytes", 0)
+
+
+    @contextmanager
+    def span(self, name: str, category: str = "ui", **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter() - start, **args)
+
+
+    def write_chrome_trace(self, path: str):
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1_000_000, 3),
+                "dur": round(span.duration * 1_000_000, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+    def write_openmetrics(self, path: str):
+        with self._lock:
+            aggregates = sorted(self._aggregates.items())
+
+        lines = [
+            "# TYPE lazysvn_span_seconds summary",
+            "# UNIT lazysvn_span_seconds seconds",
+            "# HELP lazysvn_span_seconds Wall time of svn commands, parsing and UI updates.",
+        ]
+        for (category, name), aggregate in aggregates:
+            labels = f'category="{category}",name="{_escape(name)}"'
+            lines.append(f"lazysvn_span_seconds_count{{{labels}}} {aggregate.count}")
+            lines.append(f"lazysvn_span_seconds_sum{{{labels}}} {aggregate.total:.6f}")
+
+        lines.append("# TYPE lazysvn_span_max_seconds gauge")
+        lines.append("# UNIT lazysvn_span_max_seconds seconds")
+        for (category, name), aggregate in aggregates:
+            labels = f'category="{category}",name="{_escape(name)}"'
+            lines.append(f"lazysvn_span_max_seconds{{{labels}}} {aggregate.max:.6f}")
+
+        svn_aggregates = [(name, aggregate) for (category, name), aggregate in aggregates
+                          if category == "svn"]
+        lines.append("# TYPE lazysvn_svn_failures counter")
+        for name, aggregate in svn_aggregates:
+            labels = f'subcommand="{_escape(name)}"'
+            lines.append(f"lazysvn_svn_failures_total{{{labels}}} {aggregate.failures}")
+
+        lines.append("# TYPE lazysvn_svn_stdout_bytes counter")
+        lines.append("# UNIT lazysvn_svn_stdout_bytes bytes")
+        for name, aggregate in svn_aggregates:
+            labels = f'subcommand="{_escape(name)}"'
+            lines.append(f"lazysvn_svn_stdout_bytes_total{{{labels}}} {aggregate.stdout_bytes}")
+        lines.append("# EOF")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,102 @@
+import threading
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional
+
+
+STAGE = "stage"
+UNSTAGE = "unstage"
+
+
+# change is the row as it was displayed before the operation was queued
+StagingOperation = namedtuple("StagingOperation", ["kind", "change"])
+
+
+class OperationQueue:
+    """Write-behind queue for stage/unstage operations.
+
+    Operations are coalesced per path while they wait: a stage followed by an
+    unstage of the same path (or the reverse) cancels out. A background worker
+    drains the queue one batch at a time and reports each batch, with the
+    exception it raised if any and whether the queue is now drained, through
+    on_batch_done on the worker thread.
+    """
+
+    def __init__(self,
+                 apply_batch: Callable[[List[StagingOperation]], None],
+                 on_batch_done: Callable[
+                     [List[StagingOperation], Optional[Exception], bool], None]):
+        self._apply_batch = apply_batch
+        self._on_batch_done = on_batch_done
+        self._lock = threading.Lock()
+        self._pending: Dict[str, StagingOperation] = {}
+        self._in_flight: List[StagingOperation] = []
+        self._running = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+
+    @property
+    def outstanding(self) -> List[StagingOperation]:
+        with self._lock:
+            return self._in_flight + list(self._pending.values())
+
+
+    @property
+    def is_idle(self) -> bool:
+        return self._idle.is_set()
+
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        return self._idle.wait(timeout)
+
+
+    def enqueue(self, operations: List[StagingOperation]) -> List[StagingOperation]:
+        """Returns the queued operations that the new ones cancelled out; their
+        change is the row as it was before either was applied."""
+        cancelled: List[StagingOperation] = []
+        with self._lock:
+            for operation in operations:
+                path = operation.change.path
+                queued = self._pending.get(path)
+                if queued is not None and queued.kind != operation.kind:
+                    del self._pending[path]
+                    cancelled.append(queued)
+                else:
+                    self._pending[path] = operation
+            if self._running or len(self._pending) == 0:
+                return cancelled
+            self._running = True
+            self._idle.clear()
+        threading.Thread(target=self._run, daemon=True).start()
+        return cancelled
+
+
+    def _run(self):
+        with self._lock:
+            batch = self._take_batch()
+        while True:
+            error: Optional[Exception] = None
+            try:
+                self._apply_batch(batch)
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                if len(self._pending) == 0:
+                    next_batch = None
+                    self._in_flight = []
+                    self._running = False
+                    self._idle.set()
+                else:
+                    next_batch = self._take_batch()
+            self._on_batch_done(batch, error, next_batch is None)
+            if next_batch is None:
+                return
+            batch = next_batch
+
+
+    def _take_batch(self) -> List[StagingOperation]:
+        batch = list(self._pending.values())
+        self._pending = {}
+        self._in_flight = batch
+        return batch
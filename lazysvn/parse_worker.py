@@ -0,0 +1,155 @@
+import array
+import json
+import multiprocessing
+import struct
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from lazysvn.svn_xml import Change, Copy, LogEntry, StatusResult, parse_log, parse_status
+
+
+# XML 1.0 cannot contain either character, so they are safe in packed text
+_SEP = "\x00"
+_NONE = "\x01"
+
+# (returncode, stderr, stdout size, packed columns)
+WorkerResult = Tuple[int, str, int, bytes]
+
+
+def pack_columns(columns: List[Tuple[str, list]]) -> bytes:
+    """Packs named columns into one buffer: a length-prefixed JSON header
+    followed by the raw column data. Text columns are NUL separated UTF-8,
+    integer columns are native int64 arrays."""
+    header = []
+    sections = []
+    for name, values in columns:
+        if values and isinstance(values[0], int):
+            data = array.array("q", values).tobytes()
+            kind = "i"
+        else:
+            data = _SEP.join(_NONE if value is None else value for value in values).encode()
+            kind = "s"
+        header.append([name, kind, len(values), len(data)])
+        sections.append(data)
+    header_bytes = json.dumps(header).encode()
+    return struct.pack("<I", len(header_bytes)) + header_bytes + b"".join(sections)
+
+
+def unpack_columns(blob: bytes) -> Dict[str, list]:
+    (header_len,) = struct.unpack_from("<I", blob)
+    header = json.loads(blob[4:4 + header_len])
+    offset = 4 + header_len
+    columns: Dict[str, list] = {}
+    for name, kind, count, nbytes in header:
+        data = blob[offset:offset + nbytes]
+        offset += nbytes
+        if count == 0:
+            columns[name] = []
+        elif kind == "i":
+            columns[name] = array.array("q", data)
+        else:
+            columns[name] = [None if value == _NONE else value
+                             for value in data.decode().split(_SEP)]
+    return columns
+
+
+def _run(cmd: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def run_log(cmd: List[str]) -> WorkerResult:
+    result = _run(cmd)
+    if result.returncode != 0:
+        return result.returncode, result.stderr, len(result.stdout), b""
+    log_entries = parse_log(result.stdout)
+    changes = [change for log_entry in log_entries for change in log_entry.changelist]
+    copies = [copy for log_entry in log_entries for copy in log_entry.copies]
+    blob = pack_columns([
+        ("revision", [log_entry.revision for log_entry in log_entries]),
+        ("author", [log_entry.author for log_entry in log_entries]),
+        ("date", [log_entry.date for log_entry in log_entries]),
+        ("msg", [log_entry.msg for log_entry in log_entries]),
+        ("path_count", [len(log_entry.changelist) for log_entry in log_entries]),
+        ("action", [change.status for change in changes]),
+        ("path", [change.path for change in changes]),
+        ("copy_count", [len(log_entry.copies) for log_entry in log_entries]),
+        ("copy_path", [copy.path for copy in copies]),
+        ("copy_from_path", [copy.from_path for copy in copies]),
+        ("copy_from_revision", [copy.from_revision for copy in copies]),
+    ])
+    return 0, result.stderr, len(result.stdout), blob
+
+
+def run_status(cmd: List[str], local_path: str, hide_unversioned: bool) -> WorkerResult:
+    result = _run(cmd)
+    if result.returncode != 0:
+        return result.returncode, result.stderr, len(result.stdout), b""
+    status = parse_status(result.stdout, local_path, hide_unversioned)
+    groups = [("u", status.unstaged_changes), ("a", status.added_dirs),
+              ("s", status.staged_changes)]
+    blob = pack_columns([
+        ("group", [group for group, changes in groups for _ in changes]),
+        ("status", [change.status for _, changes in groups for change in changes]),
+        ("path", [change.path for _, changes in groups for change in changes]),
+    ])
+    return 0, result.stderr, len(result.stdout), blob
+
+
+def unpack_log(blob: bytes) -> List[LogEntry]:
+    columns = unpack_columns(blob)
+    actions = columns["action"]
+    paths = columns["path"]
+    log_entries: List[LogEntry] = []
+    start = 0
+    copy_start = 0
+    for idx, revision in enumerate(columns["revision"]):
+        end = start + columns["path_count"][idx]
+        changelist = [Change(actions[i], paths[i]) for i in range(start, end)]
+        start = end
+        copy_end = copy_start + columns["copy_count"][idx]
+        copies = [Copy(int(revision), columns["copy_path"][i], columns["copy_from_path"][i],
+                       columns["copy_from_revision"][i])
+                  for i in range(copy_start, copy_end)]
+        copy_start = copy_end
+        log_entries.append(LogEntry(
+            revision, columns["author"][idx], columns["date"][idx], columns["msg"][idx],
+            changelist, copies))
+    return log_entries
+
+
+def unpack_status(blob: bytes) -> StatusResult:
+    columns = unpack_columns(blob)
+    groups: Dict[str, List[Change]] = {"u": [], "a": [], "s": []}
+    for group, status, path in zip(columns["group"], columns["status"], columns["path"]):
+        groups[group].append(Change(status, path))
+    return StatusResult(groups["u"], groups["a"], groups["s"])
+
+
+class ParseWorker:
+    """Runs svn and parses its XML in a separate process, so large responses
+    never hold the UI process's GIL. Results come back as packed columns."""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+
+    def _submit(self, fn, *args) -> WorkerResult:
+        if self._executor is None:
+            # spawn, forking a process that runs threads is not safe
+            self._executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor.submit(fn, *args).result()
+
+
+    def log(self, cmd: List[str]) -> WorkerResult:
+        return self._submit(run_log, cmd)
+
+
+    def status(self, cmd: List[str], local_path: str, hide_unversioned: bool) -> WorkerResult:
+        return self._submit(run_status, cmd, local_path, hide_unversioned)
+
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
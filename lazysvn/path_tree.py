@@ -0,0 +1,188 @@
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from lazysvn.svn_xml import Change
+
+
+class PathNode:
+    """A path in a PathTree. A directory groups the changes below it into
+    child nodes only the first time its children are asked for."""
+
+    __slots__ = ("name", "path", "change", "count", "counts", "_pending", "_children", "_sorted")
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        # the change to this path itself, if it was changed
+        self.change: Optional[Change] = None
+        # changes at or below this path, in total and per status
+        self.count = 0
+        self.counts: Counter = Counter()
+        # path relative to this node -> change, not grouped into children yet
+        self._pending: Dict[str, Change] = {}
+        self._children: Optional[Dict[str, PathNode]] = None
+        self._sorted: Optional[List[PathNode]] = None
+
+
+    @property
+    def is_dir(self) -> bool:
+        return bool(self._pending) or bool(self._children)
+
+
+    @property
+    def children(self) -> List["PathNode"]:
+        if self._children is None:
+            self._children = {}
+            for rel_path, change in self._pending.items():
+                self._place(rel_path, change)
+            self._pending = {}
+        if self._sorted is None:
+            # directories first, then by name
+            self._sorted = sorted(self._children.values(), key=lambda c: (not c.is_dir, c.name))
+        return self._sorted
+
+
+    def _place(self, rel_path: str, change: Change):
+        name, _, rest = rel_path.partition("/")
+        child = self._children.get(name)
+        if child is None:
+            child = self._children[name] = PathNode(name, f"{self.path}/{name}")
+            self._sorted = None
+        was_dir = child.is_dir
+        child._add(rest, change)
+        if child.is_dir != was_dir:
+            self._sorted = None
+
+
+    def _add(self, rel_path: str, change: Change):
+        self.count += 1
+        self.counts[change.status] += 1
+        if not rel_path:
+            self.change = change
+        elif self._children is None:
+            self._pending[rel_path] = change
+        else:
+            self._place(rel_path, change)
+
+
+    def _remove(self, rel_path: str, change: Change):
+        self.count -= 1
+        self.counts[change.status] -= 1
+        if not rel_path:
+            self.change = None
+        elif self._children is None:
+            self._pending.pop(rel_path, None)
+        else:
+            name, _, rest = rel_path.partition("/")
+            child = self._children.get(name)
+            if child is None:
+                return
+            was_dir = child.is_dir
+            child._remove(rest, change)
+            if child.count == 0:
+                del self._children[name]
+                self._sorted = None
+            elif child.is_dir != was_dir:
+                self._sorted = None
+
+
+    def changes(self) -> Iterator[Change]:
+        """Every change at or below this path."""
+        if self.change is not None:
+            yield self.change
+        if self._children is None:
+            yield from self._pending.values()
+            return
+        for child in self._children.values():
+            yield from child.changes()
+
+
+class PathTree:
+    """Changed paths grouped into directories that expand on demand, so only
+    the rows of expanded directories are ever built. Changes can be added and
+    removed in place, keeping every directory's counts current."""
+
+    def __init__(self, changes: Iterable[Change] = (), expanded: bool = False):
+        self.root = PathNode("", "")
+        # path -> change, for working out what an update changed
+        self._changes: Dict[str, Change] = {}
+        for change in changes:
+            self.add(change)
+        # paths of the expanded directories
+        self._expanded: Set[str] = set()
+        self._expand_all = expanded
+
+
+    @staticmethod
+    def _key(change: Change) -> str:
+        return change.path.replace("\\", "/").strip("/")
+
+
+    def add(self, change: Change):
+        key = self._key(change)
+        if key in self._changes:
+            self.remove(self._changes[key])
+        self._changes[key] = change
+        self.root._add(key, change)
+
+
+    def remove(self, change: Change):
+        key = self._key(change)
+        if self._changes.get(key) != change:
+            return
+        del self._changes[key]
+        self.root._remove(key, change)
+
+
+    def update(self, changes: Iterable[Change]):
+        """Makes the tree hold exactly changes, touching only what differs."""
+        new_changes = {self._key(change): change for change in changes}
+        for key, change in list(self._changes.items()):
+            if new_changes.get(key) != change:
+                self.remove(change)
+        for key, change in new_changes.items():
+            if key not in self._changes:
+                self.add(change)
+
+
+    def is_expanded(self, node: PathNode) -> bool:
+        return self._expand_all or node.path in self._expanded
+
+
+    def toggle(self, node: PathNode):
+        if not node.is_dir:
+            return
+        if self._expand_all:
+            # from here on track each directory on its own, starting from
+            # every directory shown while all of them were expanded
+            self._expanded = {row_node.path for _, _, row_node in self.rows() if row_node.is_dir}
+            self._expand_all = False
+        if node.path in self._expanded:
+            self._expanded.discard(node.path)
+        else:
+            self._expanded.add(node.path)
+
+
+    def rows(self) -> List[Tuple[int, str, PathNode]]:
+        """(depth, label, node) for every visible row, top to bottom."""
+        rows: List[Tuple[int, str, PathNode]] = []
+        stack = [(0, child) for child in reversed(self.root.children)]
+        while stack:
+            depth, node = stack.pop()
+            label, node = self._collapse_chain(node)
+            rows.append((depth, label, node))
+            if node.is_dir and self.is_expanded(node):
+                stack.extend((depth + 1, child) for child in reversed(node.children))
+        return rows
+
+
+    @staticmethod
+    def _collapse_chain(node: PathNode) -> Tuple[str, PathNode]:
+        # a directory holding nothing but one other directory shows as a/b
+        label = node.name
+        while node.change is None and node.is_dir:
+            children = node.children
+            if len(children) != 1 or not children[0].is_dir:
+                break
+            node = children[0]
+            label = f"{label}/{node.name}"
+        return label, node
@@ -0,0 +1,55 @@
+import threading
+from typing import Callable
+
+
+class AdaptivePoller:
+    """Calls poll() on a background thread with a backing-off interval.
+
+    poll returns True when it saw something new, which resets the interval to
+    min_interval; otherwise the interval grows by backoff up to max_interval.
+    """
+
+    def __init__(self, poll: Callable[[], bool], min_interval: float = 30.0,
+                 max_interval: float = 600.0, backoff: float = 2.0):
+        self._poll = poll
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._interval = min_interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+
+    def start(self):
+        self._thread.start()
+
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+
+    def poll_now(self):
+        self._interval = self._min_interval
+        self._wake.set()
+
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                changed = self._poll()
+            except Exception:
+                # a flaky network shouldn't end polling, just slow it down
+                changed = False
+            if changed:
+                self._interval = self._min_interval
+            else:
+                self._interval = min(self._interval * self._backoff, self._max_interval)
+            self._wake.wait(self._interval)
+            self._wake.clear()
@@ -0,0 +1,130 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+
+def presenter_handlers() -> Dict[Tuple[str, int], str]:
+    """Maps (filename, first line) of every presenter method to its qualified
+    name, which is how pstats and frames identify code."""
+    from lazysvn.status_presenter import StatusPresenter
+    from lazysvn.log_presenter import LogPresenter
+    from lazysvn.commit_presenter import CommitPresenter
+
+    handlers: Dict[Tuple[str, int], str] = {}
+    for cls in (StatusPresenter, LogPresenter, CommitPresenter):
+        for name, member in vars(cls).items():
+            code = getattr(member, "__code__", None)
+            if code is not None:
+                handlers[(code.co_filename, code.co_firstlineno)] = f"{cls.__name__}.{name}"
+    return handlers
+
+
+class SessionProfiler:
+    """Profiles a whole session.
+
+    cProfile gives exact call counts and times for the UI thread, where key
+    handlers run. A sampling thread snapshots every thread's stack so time spent
+    in workers (status fetches, log loads, staging) shows up too, and the
+    samples are written as collapsed stacks for flamegraph tools.
+    """
+
+    def __init__(self, output_prefix: str, sample_interval: float = 0.005):
+        self._output_prefix = output_prefix
+        self._sample_interval = sample_interval
+        self._profile = cProfile.Profile()
+        self._samples: Counter = Counter()
+        self._sample_count = 0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._start = 0.0
+        self._duration = 0.0
+
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._sampler.start()
+        self._profile.enable()
+
+
+    def stop(self):
+        self._profile.disable()
+        self._stop.set()
+        self._sampler.join()
+        self._duration = time.perf_counter() - self._start
+
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self._sample_interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                    stack.append(f"{module}:{code.co_qualname}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._samples[";".join(reversed(stack))] += 1
+            self._sample_count += 1
+
+
+    def write(self) -> List[str]:
+        pstats_path = self._output_prefix + ".pstats"
+        collapsed_path = self._output_prefix + ".collapsed"
+        report_path = self._output_prefix + ".txt"
+
+        self._profile.dump_stats(pstats_path)
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            for stack, count in self._samples.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(self.report())
+        return [report_path, pstats_path, collapsed_path]
+
+
+    def report(self) -> str:
+        out = io.StringIO()
+        out.write(f"lazysvn profile, session {self._duration:.1f}s, "
+                  f"{self._sample_count} samples every {self._sample_interval * 1000:.0f}ms\n\n")
+
+        stats = pstats.Stats(self._profile, stream=out)
+        handlers = presenter_handlers()
+        rows = []
+        for (filename, lineno, _), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            name = handlers.get((filename, lineno))
+            if name is not None:
+                rows.append((cumtime, name, ncalls, tottime))
+        out.write("Presenter handlers on the UI thread (cProfile)\n")
+        out.write(f"{'handler':<50}{'calls':>8}{'total s':>10}{'own s':>10}{'per call ms':>14}\n")
+        for cumtime, name, ncalls, tottime in sorted(rows, reverse=True):
+            out.write(f"{name:<50}{ncalls:>8}{cumtime:>10.3f}{tottime:>10.3f}"
+                      f"{cumtime / ncalls * 1000:>14.2f}\n")
+
+        # a sample counts toward a handler whenever the handler is on its stack
+        handler_names = {name.split(".", 1)[1] for name in handlers.values()}
+        inclusive: Counter = Counter()
+        for stack, count in self._samples.items():
+            seen = set()
+            for frame in stack.split(";"):
+                qualname = frame.split(":", 1)[-1]
+                if qualname.split(".")[-1] in handler_names and "Presenter." in qualname:
+                    seen.add(qualname)
+            for qualname in seen:
+                inclusive[qualname] += count
+        out.write("\nPresenter handlers across all threads (sampled)\n")
+        out.write(f"{'handler':<50}{'samples':>8}{'approx s':>10}\n")
+        for qualname, count in inclusive.most_common():
+            out.write(f"{qualname:<50}{count:>8}{count * self._sample_interval:>10.3f}\n")
+
+        out.write("\nTop functions by cumulative time on the UI thread\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(30)
+        return out.getvalue()
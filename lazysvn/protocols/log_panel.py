@@ -1,8 +1,10 @@
 
 from textual.widgets import DataTable
+from textual.coordinate import Coordinate
 from rich.text import Text
-from typing import List, Protocol
+from typing import Dict, List, Optional, Protocol
 from enum import Enum
+from lazysvn.revision_ranges import RevisionRanges
 
 class SvnLogPanelProtocol(Protocol):
     def set_columns(self, columns) -> None:
@@ -14,6 +16,29 @@ class SvnLogPanelProtocol(Protocol):
     def append_table_data(self, table_data, sort_col=None) -> None:
         ...
 
+    def prepend_table_data(self, table_data) -> None:
+        ...
+
+    @property
+    def cursor_row(self) -> int:
+        ...
+
+    def revisions_near(self, radius: int) -> List[int]:
+        ...
+
+    @property
+    def marked_revisions(self) -> List[int]:
+        ...
+
+    def toggle_mark(self) -> None:
+        ...
+
+    def select_revision(self, revision: int) -> bool:
+        ...
+
+    def set_merged_revisions(self, merged: Optional[RevisionRanges]) -> None:
+        ...
+
     def next_row(self) -> None:
         ...
 
@@ -38,9 +63,20 @@ class Column(Enum):
     MESSAGE = 3
 
 
+REVISION_STYLE = "#eb6f92"
+MERGED_REVISION_STYLE = "#c4a7e7"
+
+
 class SvnLogPanelImpl(SvnLogPanelProtocol):
+    # at most two marks, for comparing a range of revisions
+    MAX_MARKS = 2
+
     def __init__(self, table: DataTable):
         self._table: DataTable = table
+        # revision -> its cells as they were before being marked
+        self._marked: Dict[int, List[Text]] = {}
+        # revisions merged into the branch chosen in the merge info screen
+        self._merged: Optional[RevisionRanges] = None
 
 
     def set_columns(self, columns) -> None:
@@ -51,9 +87,11 @@ class SvnLogPanelImpl(SvnLogPanelProtocol):
     def set_table_data(self, table_data, sort_col=None) -> None:
         prev_idx = self._table.cursor_row
         self._table.clear()
+        self._marked.clear()
         for row in table_data:
             styled_row: List[Text] = [
-                Text(str(row[Column.REVISION.value]), style="#eb6f92"),
+                Text(str(row[Column.REVISION.value]),
+                     style=self._revision_style(row[Column.REVISION.value])),
                 Text(str(row[Column.AUTHOR.value]), style="#9ccfd8"),
                 Text(str(row[Column.DATE.value][:10]), style="#8ec07c"),
                 Text(str(row[Column.MESSAGE.value]))
@@ -65,7 +103,8 @@ class SvnLogPanelImpl(SvnLogPanelProtocol):
     def append_table_data(self, table_data, sort_col=None) -> None:
         for row in table_data:
             styled_row: List[Text] = [
-                Text(str(row[Column.REVISION.value]), style="#eb6f92"),
+                Text(str(row[Column.REVISION.value]),
+                     style=self._revision_style(row[Column.REVISION.value])),
                 Text(str(row[Column.AUTHOR.value]), style="#9ccfd8"),
                 Text(str(row[Column.DATE.value][:10]), style="#8ec07c"),
                 Text(str(row[Column.MESSAGE.value]))
@@ -73,6 +112,103 @@ class SvnLogPanelImpl(SvnLogPanelProtocol):
             self._table.add_row(*styled_row)
 
 
+    def prepend_table_data(self, table_data) -> None:
+        # add then re-sort instead of rebuilding, existing rows stay as they are
+        prev_idx = self._table.cursor_row
+        for row in table_data:
+            styled_row: List[Text] = [
+                Text(str(row[Column.REVISION.value]), style="bold #f6c177"),
+                Text(str(row[Column.AUTHOR.value]), style="#9ccfd8"),
+                Text(str(row[Column.DATE.value][:10]), style="#8ec07c"),
+                Text(str(row[Column.MESSAGE.value]))
+            ]
+            self._table.add_row(*styled_row)
+        self._table.sort("Revision", key=lambda cell: int(cell.plain), reverse=True)
+        self._table.move_cursor(row=prev_idx + len(table_data))
+
+
+    @property
+    def cursor_row(self) -> int:
+        return self._table.cursor_row
+
+
+    def revisions_near(self, radius: int) -> List[int]:
+        # nearest rows first, so prefetching starts with the likeliest next pick
+        cursor = self._table.cursor_row
+        revisions: List[int] = []
+        for distance in range(1, radius + 1):
+            for row_idx in (cursor + distance, cursor - distance):
+                if 0 <= row_idx < self._table.row_count:
+                    revisions.append(int(self._table.get_row_at(row_idx)[0].plain))
+        return revisions
+
+
+    @property
+    def marked_revisions(self) -> List[int]:
+        return list(self._marked)
+
+
+    def toggle_mark(self) -> None:
+        if self._table.row_count == 0:
+            return
+        cursor_row = self._table.cursor_row
+        revision = int(self._table.get_row_at(cursor_row)[0].plain)
+        if revision in self._marked:
+            self._restore_row(cursor_row, self._marked.pop(revision))
+            return
+
+        if len(self._marked) == self.MAX_MARKS:
+            oldest = next(iter(self._marked))
+            self._restore_row(self._row_index(oldest), self._marked.pop(oldest))
+        cells = self._table.get_row_at(cursor_row)
+        self._marked[revision] = cells
+        for col, cell in enumerate(cells):
+            marked_cell = Text(cell.plain, style=f"bold {cell.style} on #393552")
+            self._table.update_cell_at(Coordinate(cursor_row, col), marked_cell)
+
+
+    def select_revision(self, revision: int) -> bool:
+        row_idx = self._row_index(revision)
+        if row_idx < 0:
+            return False
+        self._table.move_cursor(row=row_idx)
+        return True
+
+
+    def set_merged_revisions(self, merged: Optional[RevisionRanges]) -> None:
+        self._merged = merged
+        for row_idx in range(self._table.row_count):
+            cell = self._table.get_row_at(row_idx)[0]
+            revision = int(cell.plain)
+            style = self._revision_style(revision)
+            if revision in self._marked:
+                # applied when the mark is removed
+                self._marked[revision][0] = Text(cell.plain, style=style)
+            elif str(cell.style) in (REVISION_STYLE, MERGED_REVISION_STYLE) \
+                    and str(cell.style) != style:
+                self._table.update_cell_at(Coordinate(row_idx, 0), Text(cell.plain, style=style))
+
+
+    def _revision_style(self, revision) -> str:
+        if self._merged is not None and int(revision) in self._merged:
+            return MERGED_REVISION_STYLE
+        return REVISION_STYLE
+
+
+    def _row_index(self, revision: int) -> int:
+        for row_idx in range(self._table.row_count):
+            if int(self._table.get_row_at(row_idx)[0].plain) == revision:
+                return row_idx
+        return -1
+
+
+    def _restore_row(self, row_idx: int, cells: List[Text]):
+        if row_idx < 0:
+            return
+        for col, cell in enumerate(cells):
+            self._table.update_cell_at(Coordinate(row_idx, col), cell)
+
+
     def next_row(self) -> None:
         self._table.action_cursor_down()
 
@@ -1,7 +1,10 @@
 
 from textual.widgets import DataTable
+from textual.coordinate import Coordinate
 from rich.text import Text
-from typing import Protocol, Tuple
+from typing import List, Optional, Protocol, Set, Tuple
+from lazysvn.path_tree import PathNode, PathTree
+from lazysvn.svn_xml import Change
 
 
 class SvnStatusPanelProtocol(Protocol):
@@ -21,6 +24,30 @@ class SvnStatusPanelProtocol(Protocol):
     def row(self) -> Tuple[str, ...]:
         ...
 
+    @property
+    def rows(self) -> List[Tuple[str, ...]]:
+        ...
+
+    @property
+    def marked_rows(self) -> List[Tuple[str, ...]]:
+        ...
+
+    def toggle_mark(self) -> None:
+        ...
+
+    def clear_marks(self) -> None:
+        ...
+
+    def set_tree_mode(self, enabled: bool) -> None:
+        ...
+
+    def toggle_node(self) -> None:
+        ...
+
+    @property
+    def subtree_rows(self) -> List[Tuple[str, ...]]:
+        ...
+
     def is_focused(self) -> bool:
         ...
 
@@ -28,9 +55,24 @@ class SvnStatusPanelProtocol(Protocol):
         ...
 
 
+# order of the per-status counts on directory rows
+COUNT_ORDER = "MAD?"
+# other status characters follow, in alphabetical order
+_COUNT_RANK = {status_char: i for i, status_char in enumerate(COUNT_ORDER)}
+DIR_STYLE = "#9ccfd8"
+# trees up to this many changes start fully expanded
+AUTO_EXPAND_LIMIT = 50
+
+
 class SvnStatusPanelImpl(SvnStatusPanelProtocol):
     def __init__(self, table: DataTable):
         self._table: DataTable = table
+        self._marked: Set[str] = set()
+        self._table_data: List[Change] = []
+        # set while the panel shows a directory tree instead of flat paths;
+        # marks then hold tree paths and cover everything below them
+        self._tree: Optional[PathTree] = None
+        self._tree_rows: List[Tuple[int, str, PathNode]] = []
 
 
     def set_columns(self, columns) -> None:
@@ -38,28 +80,108 @@ class SvnStatusPanelImpl(SvnStatusPanelProtocol):
             self._table.add_column(col, key=col)
 
 
+    def _styled_row(self, row, marked: Optional[bool] = None) -> List[Text]:
+        if row[0] == "M":
+            style = "#f6c177"
+        elif row[0] == "A":
+            style = "#8ec07c"
+        else:
+            style = "#6e6a86"
+        if marked is None:
+            marked = row[1] in self._marked
+        if marked:
+            style = f"bold {style} on #393552"
+        return [Text(str(cell), style=style) for cell in row]
+
+
     def set_table_data(self, table_data, sort_col=None) -> None:
+        self._table_data = [Change(row[0], row[1]) for row in table_data]
+        if self._tree is not None:
+            if self._tree.root.count == 0:
+                self._tree = self._new_tree()
+            else:
+                # only the paths that changed status touch the tree
+                self._tree.update(self._table_data)
+            self._build_tree_rows()
+            return
         prev_idx = self._table.cursor_row
         self._table.clear()
+        self._marked.intersection_update(row[1] for row in table_data)
         for row in table_data:
-            if row[0] == "M":
-                styled_row = [
-                    Text(str(cell), style="#f6c177") for cell in row
-                ]
-            elif row[0] == "A":
-                styled_row = [
-                    Text(str(cell), style="#8ec07c") for cell in row
-                ]
-            else:
-                styled_row = [
-                    Text(str(cell), style="#6e6a86") for cell in row
-                ]
-            self._table.add_row(*styled_row)
+            self._table.add_row(*self._styled_row(row))
         if sort_col:
             self._table.sort(sort_col, key=lambda x: x.plain)
         self._table.move_cursor(row=prev_idx)
 
 
+    def set_tree_mode(self, enabled: bool) -> None:
+        if enabled == (self._tree is not None):
+            return
+        self._marked.clear()
+        if enabled:
+            self._tree = self._new_tree()
+            self._build_tree_rows()
+        else:
+            self._tree = None
+            self._tree_rows = []
+            self.set_table_data(self._table_data, "Path")
+
+
+    def _new_tree(self) -> PathTree:
+        return PathTree(self._table_data, expanded=len(self._table_data) <= AUTO_EXPAND_LIMIT)
+
+
+    def _build_tree_rows(self):
+        if self._tree is None:
+            return
+        prev_idx = self._table.cursor_row
+        self._table.clear()
+        self._tree_rows = self._tree.rows()
+        for row in self._tree_rows:
+            self._table.add_row(*self._styled_tree_row(row))
+        self._table.move_cursor(row=prev_idx)
+
+
+    def _styled_tree_row(self, tree_row: Tuple[int, str, PathNode]) -> List[Text]:
+        depth, label, node = tree_row
+        status = node.change.status if node.change is not None else ""
+        indent = "  " * depth
+        if not node.is_dir:
+            # tree marks hold node paths, not the labels shown
+            return self._styled_row((status, f"{indent}  {label}"), node.path in self._marked)
+
+        marker = "▾" if self._tree is not None and self._tree.is_expanded(node) else "▸"
+        style = DIR_STYLE
+        if node.path in self._marked:
+            style = f"bold {style} on #393552"
+        path = Text(f"{indent}{marker} {label}/", style=style)
+        counts = node.counts
+        for status_char in sorted(counts, key=lambda c: (_COUNT_RANK.get(c, len(COUNT_ORDER)), c)):
+            if counts[status_char] > 0:
+                path.append(f" {status_char}{counts[status_char]}", style="#6e6a86")
+        return [Text(status, style=style), path]
+
+
+    def toggle_node(self) -> None:
+        if self._tree is None or self._table.row_count == 0:
+            return
+        node = self._tree_rows[self._table.cursor_row][2]
+        if node.is_dir:
+            self._tree.toggle(node)
+            self._build_tree_rows()
+
+
+    @property
+    def subtree_rows(self) -> List[Tuple[str, ...]]:
+        if self._tree is None:
+            row = self.row
+            return [row] if row[1] != "" else []
+        if self._table.row_count == 0:
+            return []
+        node = self._tree_rows[self._table.cursor_row][2]
+        return [(change.status, change.path) for change in node.changes()]
+
+
     def next_row(self) -> None:
         self._table.action_cursor_down()
 
@@ -72,10 +194,79 @@ class SvnStatusPanelImpl(SvnStatusPanelProtocol):
     def row(self) -> Tuple[str, ...]:
         if self._table.row_count == 0:
             return ("", "")
+        if self._tree is not None:
+            change = self._tree_rows[self._table.cursor_row][2].change
+            return (change.status, change.path) if change is not None else ("", "")
         rich_row = self._table.get_row_at(self._table.cursor_row)
         return (rich_row[0].plain, rich_row[1].plain)
 
 
+    @property
+    def rows(self) -> List[Tuple[str, ...]]:
+        if self._tree is not None:
+            return [(change.status, change.path) for change in self._table_data]
+        rows = []
+        for idx in range(self._table.row_count):
+            rich_row = self._table.get_row_at(idx)
+            rows.append((rich_row[0].plain, rich_row[1].plain))
+        return rows
+
+
+    @property
+    def marked_rows(self) -> List[Tuple[str, ...]]:
+        if self._tree is not None:
+            return [row for row in self.rows if self._is_marked_in_tree(row[1])]
+        return [row for row in self.rows if row[1] in self._marked]
+
+
+    def _is_marked_in_tree(self, path: str) -> bool:
+        tree_path = "/" + path.replace("\\", "/").strip("/")
+        while tree_path:
+            if tree_path in self._marked:
+                return True
+            tree_path = tree_path.rsplit("/", 1)[0]
+        return False
+
+
+    def toggle_mark(self) -> None:
+        if self._table.row_count == 0:
+            return
+        if self._tree is not None:
+            cursor_row = self._table.cursor_row
+            tree_row = self._tree_rows[cursor_row]
+            self._marked.symmetric_difference_update({tree_row[2].path})
+            for col, cell in enumerate(self._styled_tree_row(tree_row)):
+                self._table.update_cell_at(Coordinate(cursor_row, col), cell)
+            self._table.action_cursor_down()
+            return
+        row = self.row
+        if row[1] in self._marked:
+            self._marked.discard(row[1])
+        else:
+            self._marked.add(row[1])
+        cursor_row = self._table.cursor_row
+        for col, cell in enumerate(self._styled_row(row)):
+            self._table.update_cell_at(Coordinate(cursor_row, col), cell)
+        self._table.action_cursor_down()
+
+
+    def clear_marks(self) -> None:
+        if len(self._marked) == 0:
+            return
+        if self._tree is not None:
+            self._marked.clear()
+            self._build_tree_rows()
+            return
+        marked_rows = self.marked_rows
+        self._marked.clear()
+        for idx in range(self._table.row_count):
+            rich_row = self._table.get_row_at(idx)
+            row = (rich_row[0].plain, rich_row[1].plain)
+            if row in marked_rows:
+                for col, cell in enumerate(self._styled_row(row)):
+                    self._table.update_cell_at(Coordinate(idx, col), cell)
+
+
     def is_focused(self) -> bool:
         return self._table.has_focus
 
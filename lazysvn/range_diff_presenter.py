@@ -0,0 +1,90 @@
+from functools import partial
+from textual.worker import get_current_worker
+from lazysvn.range_diff_view import RangeDiffView
+from lazysvn.svn_model import SVNCommandError
+
+
+class RangeDiffPresenter:
+    def __init__(self, range_diff_view, svn_model, rev_a: int, rev_b: int):
+        self._range_diff_view: RangeDiffView = range_diff_view
+        self._svn_model = svn_model
+        self._low, self._high = sorted((rev_a, rev_b))
+        self._diff_focused = False
+
+
+    def on_view_mount(self):
+        self._range_diff_view.set_changelist_title(f"r{self._low}:{self._high}", "loading")
+        self._range_diff_view.give_changelist_panel_focus()
+        self._range_diff_view.run_worker(self.fetch_summary, thread=True)
+
+
+    def fetch_summary(self):
+        try:
+            changes = self._svn_model.range_summary(self._low, self._high)
+        except SVNCommandError as e:
+            self._range_diff_view.app.call_from_thread(self.show_error, e)
+            return
+        self._range_diff_view.app.call_from_thread(self.show_summary, changes)
+
+
+    def show_summary(self, changes):
+        self._range_diff_view.set_changelist_title(
+                f"r{self._low}:{self._high}", f"{len(changes)} paths")
+        self._range_diff_view.set_changelist_panel_data(changes)
+        self.update_diff()
+
+
+    def show_error(self, error: SVNCommandError):
+        self._range_diff_view.set_changelist_title(f"r{self._low}:{self._high}", "failed")
+        self._range_diff_view.app.notify(
+            str(error),
+            title="Range summary failed",
+            severity="error",
+            timeout=10
+        )
+
+
+    def on_key_down(self):
+        if self._diff_focused:
+            self._range_diff_view.scroll_diff_panel_down()
+            return
+        self._range_diff_view.next_changelist_panel_row()
+        self.update_diff()
+
+
+    def on_key_up(self):
+        if self._diff_focused:
+            self._range_diff_view.scroll_diff_panel_up()
+            return
+        self._range_diff_view.prev_changelist_panel_row()
+        self.update_diff()
+
+
+    def on_key_left(self):
+        self._diff_focused = not self._diff_focused
+        if self._diff_focused:
+            self._range_diff_view.give_diff_panel_focus()
+        else:
+            self._range_diff_view.give_changelist_panel_focus()
+
+
+    def update_diff(self):
+        action, path = self._range_diff_view.changelist_panel_row
+        if path == "":
+            self._range_diff_view.set_diff_text("")
+            return
+        self._range_diff_view.run_worker(
+                partial(self.load_diff, action, path),
+                group="range-diff", exclusive=True, thread=True)
+
+
+    def load_diff(self, action: str, path: str):
+        worker = get_current_worker()
+        try:
+            diff = self._svn_model.range_diff(self._low, self._high, path, action)
+        except SVNCommandError as e:
+            diff = e.stderr
+        if not worker.is_cancelled:
+            self._range_diff_view.app.call_from_thread(
+                    self._range_diff_view.set_diff_text,
+                    diff, (self._low, self._high, path), path)
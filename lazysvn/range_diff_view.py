@@ -0,0 +1,166 @@
+from typing import Optional
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.widgets import Footer
+from textual.binding import Binding
+from lazysvn.diff_panel import DiffPanel
+from lazysvn.log_view import ChangelistPanel
+
+
+class RangeDiffView(Screen):
+    BINDINGS = [
+        ("escape", "app.pop_screen", "back"),
+        ("▼/j,j", "on_key_down", "next entry"),
+        ("▲/k,k", "on_key_up", "prev entry"),
+        ("◄ ►/hl,h,left", "on_key_left", "switch panel"),
+        Binding("l,right,tab,shift+tab", "on_key_left", "switch panel", show=False),
+    ]
+
+    DEFAULT_CSS = """
+    RangeDiffView {
+        layout: grid;
+        grid-size: 5 1;
+    }
+
+    RangeDiffView Widget {
+        scrollbar-color: grey;
+        scrollbar-color-hover: grey;
+        scrollbar-background: #1f1d2e;
+        scrollbar-corner-color: #1f1d2e;
+        scrollbar-size: 1 1;
+        background: #1f1d2e;
+    }
+
+    RangeDiffView Footer > .footer--key {
+        background: #383838;
+    }
+
+    RangeDiffView ChangelistPanel {
+        border: solid grey;
+        column-span: 2;
+    }
+
+    RangeDiffView ChangelistPanel .datatable--cursor {
+        background: #403d52;
+    }
+
+    RangeDiffView .range-diff {
+        border: solid grey;
+        column-span: 3;
+        padding: 0 1;
+    }
+
+    RangeDiffView ChangelistPanel:focus-within,
+    RangeDiffView .range-diff:focus {
+        border: solid #8ec07c;
+    }
+    """
+
+
+    def __init__(self, svn_model, rev_a: int, rev_b: int, *args, **kwargs):
+        from lazysvn.range_diff_presenter import RangeDiffPresenter
+        super().__init__(*args, **kwargs)
+        self.title = "Range"
+        self._presenter = RangeDiffPresenter(self, svn_model, rev_a, rev_b)
+
+        # initalized later in on_mount
+        self._changelist_panel: Optional[ChangelistPanel] = None
+        self._diff_panel: Optional[DiffPanel] = None
+
+
+    def compose(self) -> ComposeResult:
+        yield ChangelistPanel()
+        yield DiffPanel(classes="range-diff")
+        yield Footer()
+
+
+    def on_mount(self) -> None:
+        self._changelist_panel = self.query_one(ChangelistPanel)
+        self._diff_panel = self.query_one(".range-diff", DiffPanel)
+        self._diff_panel.border_title = "Diff"
+        self._diff_panel.can_focus = True
+        self._presenter.on_view_mount()
+
+
+    ############################ Keybindings #############################
+
+
+    def action_on_key_down(self):
+        self._presenter.on_key_down()
+
+
+    def action_on_key_up(self):
+        self._presenter.on_key_up()
+
+
+    def action_on_key_left(self):
+        self._presenter.on_key_left()
+
+
+    ######################## Changelist Panel ############################
+
+
+    def set_changelist_title(self, title: str, subtitle: str = ""):
+        if not self._changelist_panel:
+            return
+        self._changelist_panel.border_title = title
+        self._changelist_panel.border_subtitle = subtitle
+
+
+    def set_changelist_panel_data(self, table_data):
+        if not self._changelist_panel:
+            return
+        self._changelist_panel.set_table_data(table_data)
+
+
+    @property
+    def changelist_panel_row(self):
+        if not self._changelist_panel:
+            return ("", "")
+        return self._changelist_panel.row
+
+
+    def give_changelist_panel_focus(self):
+        if not self._changelist_panel:
+            return
+        self._changelist_panel.give_focus()
+
+
+    def next_changelist_panel_row(self):
+        if not self._changelist_panel:
+            return
+        self._changelist_panel.next_row()
+
+
+    def prev_changelist_panel_row(self):
+        if not self._changelist_panel:
+            return
+        self._changelist_panel.prev_row()
+
+
+    ########################### Diff Panel ###############################
+
+
+    def set_diff_text(self, text: str, source=None, title: str = ""):
+        if not self._diff_panel:
+            return
+        self._diff_panel.set_text(text, source)
+        self._diff_panel.border_subtitle = title
+
+
+    def give_diff_panel_focus(self):
+        if not self._diff_panel:
+            return
+        self._diff_panel.focus()
+
+
+    def scroll_diff_panel_down(self):
+        if not self._diff_panel:
+            return
+        self._diff_panel.scroll_down(animate=False)
+
+
+    def scroll_diff_panel_up(self):
+        if not self._diff_panel:
+            return
+        self._diff_panel.scroll_up(animate=False)
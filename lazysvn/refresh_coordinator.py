@@ -0,0 +1,68 @@
+import threading
+from typing import Callable, List, Optional
+
+
+RefreshCallback = Callable[[Optional[Exception]], None]
+
+
+class RefreshCoordinator:
+    """Single-flight runner for an expensive fetch.
+
+    At most one fetch runs at a time. Requests arriving while a fetch is in
+    flight are folded into a single follow-up fetch, and every requester of a
+    given run is called back with that run's outcome (None or the exception).
+    Callbacks run on the worker thread.
+    """
+
+    def __init__(self, fetch: Callable[[], None]):
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._in_flight = False
+        self._waiters: List[RefreshCallback] = []
+        self._queued = False
+        self._queued_waiters: List[RefreshCallback] = []
+
+
+    @property
+    def in_flight(self) -> bool:
+        return self._in_flight
+
+
+    def request(self, callback: Optional[RefreshCallback] = None):
+        with self._lock:
+            if self._in_flight:
+                self._queued = True
+                self._add_waiter(self._queued_waiters, callback)
+                return
+            self._in_flight = True
+            self._waiters = []
+            self._add_waiter(self._waiters, callback)
+        threading.Thread(target=self._run, daemon=True).start()
+
+
+    def _add_waiter(self, waiters: List[RefreshCallback], callback):
+        if callback is not None and callback not in waiters:
+            waiters.append(callback)
+
+
+    def _run(self):
+        while True:
+            error: Optional[Exception] = None
+            try:
+                self._fetch()
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                waiters = self._waiters
+            for waiter in waiters:
+                waiter(error)
+
+            with self._lock:
+                if not self._queued:
+                    self._in_flight = False
+                    self._waiters = []
+                    return
+                self._queued = False
+                self._waiters = self._queued_waiters
+                self._queued_waiters = []
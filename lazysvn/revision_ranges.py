@@ -0,0 +1,76 @@
+import re
+from bisect import bisect_right
+from typing import Iterable, List, Tuple
+
+
+_revision = re.compile(r"^r?(\d+)\*?$", re.MULTILINE)
+
+
+class RevisionRanges:
+    """A set of revisions stored as sorted, disjoint (first, last) ranges, so
+    thousands of merged revisions take a handful of pairs."""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        self._ranges: List[Tuple[int, int]] = []
+        for first, last in sorted(ranges):
+            self._append(first, last)
+
+
+    @classmethod
+    def from_revisions(cls, revisions: Iterable[int]) -> "RevisionRanges":
+        return cls((revision, revision) for revision in revisions)
+
+
+    @classmethod
+    def parse(cls, raw_result: str) -> "RevisionRanges":
+        """Revisions listed one per line by `svn mergeinfo --show-revs`; a
+        trailing * marks a partial merge, which still counts."""
+        return cls.from_revisions(int(match) for match in _revision.findall(raw_result))
+
+
+    def _append(self, first: int, last: int):
+        # callers add in ascending order of first
+        if self._ranges and first <= self._ranges[-1][1] + 1:
+            prev_first, prev_last = self._ranges[-1]
+            self._ranges[-1] = (prev_first, max(prev_last, last))
+        else:
+            self._ranges.append((first, last))
+
+
+    @property
+    def ranges(self) -> List[Tuple[int, int]]:
+        return list(self._ranges)
+
+
+    def __contains__(self, revision: int) -> bool:
+        idx = bisect_right(self._ranges, (revision, float("inf"))) - 1
+        return idx >= 0 and self._ranges[idx][1] >= revision
+
+
+    def covers(self, first: int, last: int) -> bool:
+        """Whether every revision from first to last is in the set."""
+        if first > last:
+            return True
+        idx = bisect_right(self._ranges, (first, float("inf"))) - 1
+        return idx >= 0 and self._ranges[idx][1] >= last
+
+
+    def __len__(self) -> int:
+        return sum(last - first + 1 for first, last in self._ranges)
+
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RevisionRanges) and self._ranges == other._ranges
+
+
+    def __repr__(self) -> str:
+        return f"RevisionRanges({self._ranges!r})"
+
+
+    def union(self, other: "RevisionRanges") -> "RevisionRanges":
+        return RevisionRanges(self._ranges + other._ranges)
+
+
+    def format(self) -> str:
+        return ", ".join(f"r{first}" if first == last else f"r{first}-{last}"
+                         for first, last in reversed(self._ranges))
@@ -1,7 +1,15 @@
 
+import os
+import threading
 from enum import Enum
+from functools import partial
+from lazysvn.caches import format_bytes
 from lazysvn.status_view import StatusView
-from typing import Tuple
+from lazysvn.refresh_coordinator import RefreshCoordinator
+from lazysvn.poller import AdaptivePoller
+from lazysvn.operation_queue import OperationQueue, StagingOperation, STAGE, UNSTAGE
+from lazysvn.svn_model import Change, SVNCommandError
+from typing import List, Optional, Tuple
 
 
 class StatusPanel(Enum):
@@ -9,40 +17,111 @@ class StatusPanel(Enum):
     STAGED = 2
 
 
+def format_diff_summary(summary) -> str:
+    def size(value):
+        return format_bytes(value) if value is not None else "-"
+
+    lines = [f"Diff not loaded: {summary.path}", ""]
+    kind = "binary" if summary.binary else "text"
+    lines.append(f"  type          {kind} {summary.mime_type or ''}".rstrip())
+    lines.append(f"  working size  {size(summary.working_size)}")
+    base_line = f"  base size     {size(summary.base_size)}"
+    if summary.working_size is not None and summary.base_size is not None:
+        delta = summary.working_size - summary.base_size
+        base_line += f"  ({'+' if delta >= 0 else '-'}{format_bytes(abs(delta))})"
+    lines.append(base_line)
+    if summary.line_count is not None:
+        lines.append(f"  lines         {summary.line_count:,}")
+    lines += ["", "Press o to load the diff anyway."]
+    return "\n".join(lines)
+
+
 class StatusPresenter:
     def __init__(self, status_view, svn_model):
         self._status_view: StatusView = status_view
         self._svn_model = svn_model
         self._selected_panel = StatusPanel.UNSTAGED
-        self._local_is_up_to_date = False
+        self._tree_mode = False
+        self._local_is_up_to_date = True
+        self._last_head_revision = None
+        self._refresh_coordinator = RefreshCoordinator(self._svn_model.refresh_status)
+        self._operation_queue = OperationQueue(
+                self.apply_staging_batch,
+                self.on_staging_batch_done)
+        self._update_poller = AdaptivePoller(self.check_for_updates)
+        self._diff_cancelled = threading.Event()
+
+
+    @property
+    def is_busy(self) -> bool:
+        return self._refresh_coordinator.in_flight or not self._operation_queue.is_idle
 
 
     def on_view_mount(self):
         self._status_view.set_unstaged_cols(("Status", "Path"))
         self._status_view.set_staged_cols(("Status", "Path"))
+        self._status_view.set_incoming_cols(("Status", "Path"))
+        if self._svn_model.load_status_snapshot():
+            self.refresh_panel_selection()
+            self.reset_panel_data()
+            self._status_view.set_status_stale(True)
         self.refresh()
         self.post_mount()
 
 
     def refresh(self):
-        self._svn_model.refresh_status()
-        self.refresh_panel_selection()
-        self.reset_view_data()
-        self.update_command_log()
+        # safe to call from any thread; concurrent requests share one svn status
+        self._refresh_coordinator.request(self.on_status_fetched)
+
+
+    def on_status_fetched(self, error: Optional[Exception]) -> None:
+        self._status_view.app.call_from_thread(self.apply_refreshed_status, error)
+
+
+    def apply_refreshed_status(self, error: Optional[Exception]):
+        if error is not None:
+            self._status_view.notify(str(error), title="Error", severity="error")
+            return
+        with self._svn_model.metrics.span("StatusPresenter.apply_refreshed_status"):
+            # keep rows that are still waiting on svn where the user put them
+            for operation in self._operation_queue.outstanding:
+                self.apply_optimistic_move(operation)
+            self.refresh_panel_selection()
+            self.reset_view_data()
+            self.update_command_log()
+            self._status_view.set_status_stale(self._svn_model.status_is_stale)
 
 
     def post_mount(self):
-        self._status_view.run_worker(self.check_for_updates, thread=True)
+        self._update_poller.start()
+
+
+    def on_view_unmount(self):
+        self._update_poller.stop()
 
 
-    def check_for_updates(self) -> None:
-        if not self._svn_model.is_up_to_date():
-            self._status_view.app.call_from_thread(
-                    self._status_view.notify,
+    def check_for_updates(self) -> bool:
+        up_to_date = self._svn_model.is_up_to_date()
+        head_revision = self._svn_model.head_revision
+        # the poller backs off while the repository stays quiet
+        changed = head_revision != self._last_head_revision
+        self._last_head_revision = head_revision
+        self._status_view.app.call_from_thread(self.apply_update_check, up_to_date)
+        return changed
+
+
+    def apply_update_check(self, up_to_date: bool):
+        self._status_view.set_incoming_panel_data(
+                self._svn_model.incoming_changes,
+                sort_col="Path")
+        if not up_to_date and self._local_is_up_to_date:
+            self._status_view.notify(
                     "Run 'svn update' to sync with the repository",
                     title="Working copy out of date",
                     severity="warning",
                     timeout=10)
+        self._local_is_up_to_date = up_to_date
+        self.update_command_log()
 
 
     def refresh_panel_selection(self):
@@ -53,22 +132,96 @@ class StatusPresenter:
 
 
     def reset_view_data(self):
+        self.reset_panel_data()
+        self.update_diff_out()
+
+
+    def reset_panel_data(self):
         self._status_view.set_unstaged_panel_data(
             self._svn_model.unstaged_changes,
             sort_col="Path")
         self._status_view.set_staged_panel_data(
             self._svn_model._added_dirs + self._svn_model.staged_changes,
             sort_col="Path")
-        self.update_diff_out()
 
 
     def update_diff_out(self) -> None:
-        row: Tuple[str, ...] = self.get_selected_row()
-        if row[0] == "?" or row[1] == "":
-            self._status_view.set_diff_text("")
+        with self._svn_model.metrics.span("StatusPresenter.update_diff_out"):
+            # whatever is still streaming belongs to the previous selection
+            self._diff_cancelled.set()
+            row: Tuple[str, ...] = self.get_selected_row()
+            if row[0] == "?" or row[1] == "":
+                self._status_view.set_diff_text("")
+                return
+            filepath = row[1]
+            # word diffs are memoized per diff, and a refresh makes a new one
+            source = (filepath, self._svn_model.diff_generation)
+            diff = self._svn_model.cached_diff(filepath)
+            if diff is not None:
+                self._status_view.set_diff_text(diff, source)
+                return
+            cancelled = threading.Event()
+            self._diff_cancelled = cancelled
+            self._status_view.set_diff_text("", source)
+            self._status_view.run_worker(
+                    partial(self.stream_diff, filepath, cancelled),
+                    group="diff", thread=True)
+
+
+    def stream_diff(self, filepath: str, cancelled: threading.Event):
+        def on_chunk(chunk: str):
+            self._status_view.app.call_from_thread(self.append_diff_chunk, chunk, cancelled)
+
+        try:
+            summary = self._svn_model.diff_summary(filepath)
+            if summary is not None:
+                self._status_view.app.call_from_thread(
+                        self.show_diff_summary, summary, cancelled)
+                return
+            completed = self._svn_model.stream_diff(filepath, on_chunk, cancelled)
+        except SVNCommandError:
+            # shows up as a failed command in the command log
+            completed = False
+        self._status_view.app.call_from_thread(self.finish_diff, completed, cancelled)
+
+
+    def show_diff_summary(self, summary, cancelled: threading.Event):
+        if not cancelled.is_set():
+            self._status_view.set_diff_text(format_diff_summary(summary))
+        self.update_command_log()
+
+
+    def on_key_o(self):
+        filepath = self.get_selected_row()[1]
+        if filepath == "":
             return
-        filepath = row[1]
-        self._status_view.set_diff_text(self._svn_model.diff_file(filepath))
+        self._svn_model.allow_full_diff(filepath)
+        self.update_diff_out()
+
+
+    def on_key_b(self):
+        status, filepath = self.get_selected_row()[:2]
+        if filepath == "":
+            return
+        if status in ("?", "A", "I"):
+            self._status_view.notify(
+                    f"{filepath} has no committed history to blame",
+                    severity="warning",
+                    timeout=3)
+            return
+        self._status_view.show_blame(filepath)
+
+
+    def append_diff_chunk(self, chunk: str, cancelled: threading.Event):
+        # checked on the UI thread so a stale stream never lands in the panel
+        if not cancelled.is_set():
+            self._status_view.append_diff_text(chunk)
+
+
+    def finish_diff(self, completed: bool, cancelled: threading.Event):
+        if completed and not cancelled.is_set():
+            self._status_view.finish_diff_text()
+        self.update_command_log()
 
 
     def update_command_log(self):
@@ -97,34 +250,98 @@ class StatusPresenter:
 
 
     def on_key_space(self):
-        try:
-            if self._selected_panel == StatusPanel.UNSTAGED:
-                row_data = self._status_view.get_unstaged_row()
-                status = row_data[0]
-                filepath = row_data[1]
-                if (filepath == ""):
-                    return
-                if (status == "?"):
-                    self._svn_model.add_file(filepath)
-                self._svn_model.stage_file(filepath)
-            elif self._selected_panel == StatusPanel.STAGED:
-                row_data = self._status_view.get_staged_row()
-                status = row_data[0]
-                filepath = row_data[1]
-                if (filepath == ""):
-                    return
-                self._svn_model.unstage_file(filepath)
-                if (status == "A"):
-                    self._svn_model.revert_file(filepath)
-        except Exception as e:
-            self._status_view.app.notify(str(e), title="Error", severity="error")
-        self.refresh()
+        rows = self.get_selected_marked_rows()
+        if len(rows) == 0:
+            # on a directory in tree mode this is everything below it
+            rows = self.get_selected_subtree_rows()
+        self.stage_or_unstage_rows(rows)
+
+
+    def on_key_v(self):
+        self._status_view.toggle_mark()
+
+
+    def on_key_a(self):
+        self.stage_or_unstage_rows(self.get_selected_rows())
+
+
+    def on_key_d(self):
+        filepath = self.get_selected_row()[1]
+        if filepath == "":
+            return
+        directory = os.path.dirname(filepath)
+        rows = [row for row in self.get_selected_rows()
+                if directory == "" or row[1].startswith(directory + os.sep)]
+        self.stage_or_unstage_rows(rows)
+
+
+    def stage_or_unstage_rows(self, rows: List[Tuple[str, ...]]):
+        changes = [Change(row[0], row[1]) for row in rows if row[1] != ""]
+        if len(changes) == 0:
+            return
+        kind = STAGE if self._selected_panel == StatusPanel.UNSTAGED else UNSTAGE
+        operations = [StagingOperation(kind, change) for change in changes]
+        for operation in operations:
+            self.apply_optimistic_move(operation)
+        for operation in self._operation_queue.enqueue(operations):
+            # the two moves aren't always inverses, e.g. an unstaged A comes
+            # back as ?, so put the row back exactly as it was
+            self._svn_model.restore_changes(
+                    [operation.change], staged=operation.kind == UNSTAGE)
+        self._status_view.clear_marks()
+        self.reset_view_data()
+
+
+    def apply_optimistic_move(self, operation: StagingOperation):
+        if operation.kind == STAGE:
+            self._svn_model.move_to_staged([operation.change])
+        else:
+            self._svn_model.move_to_unstaged([operation.change])
+
+
+    def apply_staging_batch(self, batch: List[StagingOperation]) -> None:
+        self._svn_model.stage_changes(
+                [operation.change for operation in batch if operation.kind == STAGE])
+        self._svn_model.unstage_changes(
+                [operation.change for operation in batch if operation.kind == UNSTAGE])
+
+
+    def on_staging_batch_done(self, batch: List[StagingOperation],
+                              error: Optional[Exception], drained: bool) -> None:
+        self._status_view.app.call_from_thread(
+                self.finish_staging_batch, batch, error, drained)
+
+
+    def finish_staging_batch(self, batch: List[StagingOperation],
+                             error: Optional[Exception], drained: bool):
+        if error is not None:
+            for operation in batch:
+                self._svn_model.restore_changes(
+                        [operation.change], staged=operation.kind == UNSTAGE)
+            self.reset_view_data()
+            self._status_view.notify(str(error), title="Error", severity="error")
+        self.update_command_log()
+        if drained or error is not None:
+            # reconcile the optimistic rows with what svn actually did
+            self.refresh()
 
 
     def on_key_c(self):
+        if not self._operation_queue.is_idle:
+            self._status_view.notify(
+                    "Staging still in progress, try again in a moment",
+                    severity="warning",
+                    timeout=3)
+            return
         self._status_view.app.push_screen('commit')
 
 
+    def on_key_f(self):
+        self._tree_mode = not self._tree_mode
+        self._status_view.set_tree_mode(self._tree_mode)
+        self.update_diff_out()
+
+
     def on_key_t(self):
         self._svn_model.toggle_hide_unversioned()
         self.refresh()
@@ -148,3 +365,26 @@ class StatusPresenter:
              return self._status_view.get_staged_row()
         return ("", "")
 
+
+    def get_selected_rows(self) -> List[Tuple[str, ...]]:
+        if self._selected_panel == StatusPanel.UNSTAGED:
+            return self._status_view.get_unstaged_rows()
+        elif self._selected_panel == StatusPanel.STAGED:
+            return self._status_view.get_staged_rows()
+        return []
+
+
+    def get_selected_marked_rows(self) -> List[Tuple[str, ...]]:
+        if self._selected_panel == StatusPanel.UNSTAGED:
+            return self._status_view.get_unstaged_marked_rows()
+        elif self._selected_panel == StatusPanel.STAGED:
+            return self._status_view.get_staged_marked_rows()
+        return []
+
+
+    def get_selected_subtree_rows(self) -> List[Tuple[str, ...]]:
+        if self._selected_panel == StatusPanel.UNSTAGED:
+            return self._status_view.get_unstaged_subtree_rows()
+        elif self._selected_panel == StatusPanel.STAGED:
+            return self._status_view.get_staged_subtree_rows()
+        return []
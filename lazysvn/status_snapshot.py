@@ -0,0 +1,60 @@
+import hashlib
+import json
+import os
+from collections import namedtuple
+from typing import List, Optional
+from lazysvn.cache_dir import cache_dir
+
+
+SNAPSHOT_VERSION = 1
+
+
+StatusSnapshot = namedtuple(
+    "StatusSnapshot",
+    ["revision", "unstaged_changes", "staged_changes", "added_dirs"]
+)
+
+
+def snapshot_path(local_path: str) -> str:
+    digest = hashlib.sha1(os.path.normpath(local_path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir("status"), digest + ".json")
+
+
+def save_snapshot(local_path: str, snapshot: StatusSnapshot) -> None:
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "local_path": os.path.normpath(local_path),
+        "revision": snapshot.revision,
+        "unstaged_changes": [list(change) for change in snapshot.unstaged_changes],
+        "staged_changes": [list(change) for change in snapshot.staged_changes],
+        "added_dirs": [list(change) for change in snapshot.added_dirs],
+    }
+    path = snapshot_path(local_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    # atomic so a crash mid-write never leaves a truncated snapshot behind
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(local_path: str) -> Optional[StatusSnapshot]:
+    try:
+        with open(snapshot_path(local_path), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("version") != SNAPSHOT_VERSION:
+        return None
+    if data.get("local_path") != os.path.normpath(local_path):
+        return None
+
+    def to_pairs(rows) -> List[tuple]:
+        return [(row[0], row[1]) for row in rows]
+
+    return StatusSnapshot(
+        data.get("revision"),
+        to_pairs(data.get("unstaged_changes", [])),
+        to_pairs(data.get("staged_changes", [])),
+        to_pairs(data.get("added_dirs", [])),
+    )
@@ -6,9 +6,9 @@ from textual.widgets import Footer, RichLog, DataTable
 from textual.binding import Binding
 from textual.containers import Grid
 from lazysvn.svn_status_panel import SvnStatusPanel
-from lazysvn.diff_panel import DiffPanel, DiffText
+from lazysvn.diff_panel import DiffPanel
 from lazysvn.commit_view import CommitView
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from rich.text import Text
 
 
@@ -21,7 +21,13 @@ class StatusView(Screen):
         Binding("l,right", "on_key_right", "switch panel", show=False),
         Binding("tab,shift+tab", "on_key_left", "", show=False),
         ("space", "key_space", "stage/unstage"),
+        ("v", "on_key_v", "mark"),
+        ("a", "on_key_a", "stage/unstage all"),
+        ("d", "on_key_d", "stage/unstage dir"),
         ("t", "on_key_t", "toggle unversioned"),
+        ("o", "on_key_o", "load diff anyway"),
+        ("b", "on_key_b", "blame"),
+        ("f", "on_key_f", "tree/flat"),
     ]
 
     DEFAULT_CSS = """
@@ -33,7 +39,8 @@ class StatusView(Screen):
 
     StatusView .changes-grid {
         layout: grid;
-        grid-size: 1 2;
+        grid-size: 1 3;
+        grid-rows: 2fr 2fr 1fr;
     }
 
     StatusView .output-grid {
@@ -96,6 +103,7 @@ class StatusView(Screen):
         # initalized later in on_mount
         self._unstaged_panel: Optional[SvnStatusPanel] = None
         self._staged_panel: Optional[SvnStatusPanel] = None
+        self._incoming_panel: Optional[SvnStatusPanel] = None
         self._diff_panel: Optional[DiffPanel] = None
 
 
@@ -103,6 +111,7 @@ class StatusView(Screen):
         with Grid(classes="changes-grid"):
             yield SvnStatusPanel(classes="panel", border_title="Unstaged", id="unstaged")
             yield SvnStatusPanel(classes="panel", border_title="Staged", id="staged")
+            yield SvnStatusPanel(classes="panel", border_title="Incoming", id="incoming")
         with Grid(classes="output-grid"):
             yield DiffPanel(classes="diff-panel")
             yield RichLog(classes="cmd-panel", wrap=True)
@@ -112,6 +121,8 @@ class StatusView(Screen):
     def on_mount(self) -> None:
         self._unstaged_panel = self.query_one("#unstaged", SvnStatusPanel)
         self._staged_panel = self.query_one("#staged", SvnStatusPanel)
+        self._incoming_panel = self.query_one("#incoming", SvnStatusPanel)
+        self._incoming_panel.query_one(DataTable).can_focus = False
         self._diff_panel = self.query_one(DiffPanel)
         self._diff_panel.can_focus = False
         self._cmd_log = self.query_one(RichLog)
@@ -124,6 +135,10 @@ class StatusView(Screen):
         self._presenter.on_view_mount()
 
 
+    def on_unmount(self) -> None:
+        self._presenter.on_view_unmount()
+
+
     ############################ Keybindings #############################
 
 
@@ -147,6 +162,18 @@ class StatusView(Screen):
         self._presenter.on_key_space()
 
 
+    def action_on_key_v(self):
+        self._presenter.on_key_v()
+
+
+    def action_on_key_a(self):
+        self._presenter.on_key_a()
+
+
+    def action_on_key_d(self):
+        self._presenter.on_key_d()
+
+
     def action_on_key_c(self):
         self._presenter.on_key_c()
 
@@ -155,6 +182,18 @@ class StatusView(Screen):
         self._presenter.on_key_t()
 
 
+    def action_on_key_o(self):
+        self._presenter.on_key_o()
+
+
+    def action_on_key_b(self):
+        self._presenter.on_key_b()
+
+
+    def action_on_key_f(self):
+        self._presenter.on_key_f()
+
+
     ############################ General ###############################
 
 
@@ -176,6 +215,29 @@ class StatusView(Screen):
             self._staged_panel.prev_row()
 
 
+    def toggle_mark(self):
+        if not self._unstaged_panel or not self._staged_panel:
+            return
+        if self._unstaged_panel.is_focused():
+            self._unstaged_panel.toggle_mark()
+        elif self._staged_panel.is_focused():
+            self._staged_panel.toggle_mark()
+
+
+    def clear_marks(self):
+        if not self._unstaged_panel or not self._staged_panel:
+            return
+        self._unstaged_panel.clear_marks()
+        self._staged_panel.clear_marks()
+
+
+    def set_tree_mode(self, enabled: bool):
+        if not self._unstaged_panel or not self._staged_panel:
+            return
+        self._unstaged_panel.set_tree_mode(enabled)
+        self._staged_panel.set_tree_mode(enabled)
+
+
     def on_data_table_row_highlighted(self):
         self._presenter.on_row_highlighted()
 
@@ -184,6 +246,19 @@ class StatusView(Screen):
         self._presenter.refresh()
 
 
+    @property
+    def is_busy(self) -> bool:
+        return self._presenter.is_busy
+
+
+    def set_status_stale(self, stale: bool):
+        if not self._unstaged_panel or not self._staged_panel:
+            return
+        subtitle = "cached" if stale else ""
+        self._unstaged_panel.border_subtitle = subtitle
+        self._staged_panel.border_subtitle = subtitle
+
+
     ########################## unstaged panel ############################
 
 
@@ -211,6 +286,24 @@ class StatusView(Screen):
         return self._unstaged_panel.row
 
 
+    def get_unstaged_rows(self) -> List[Tuple[str, ...]]:
+        if not self._unstaged_panel:
+            return []
+        return self._unstaged_panel.rows
+
+
+    def get_unstaged_marked_rows(self) -> List[Tuple[str, ...]]:
+        if not self._unstaged_panel:
+            return []
+        return self._unstaged_panel.marked_rows
+
+
+    def get_unstaged_subtree_rows(self) -> List[Tuple[str, ...]]:
+        if not self._unstaged_panel:
+            return []
+        return self._unstaged_panel.subtree_rows
+
+
     ########################### staged panel #############################
 
 
@@ -238,27 +331,77 @@ class StatusView(Screen):
         return self._staged_panel.row
 
 
+    def get_staged_rows(self) -> List[Tuple[str, ...]]:
+        if not self._staged_panel:
+            return []
+        return self._staged_panel.rows
+
+
+    def get_staged_marked_rows(self) -> List[Tuple[str, ...]]:
+        if not self._staged_panel:
+            return []
+        return self._staged_panel.marked_rows
+
+
+    def get_staged_subtree_rows(self) -> List[Tuple[str, ...]]:
+        if not self._staged_panel:
+            return []
+        return self._staged_panel.subtree_rows
+
+
+    ########################## incoming panel ############################
+
+
+    def set_incoming_cols(self, columns):
+        if not self._incoming_panel:
+            return
+        self._incoming_panel.set_columns(columns)
+
+
+    def set_incoming_panel_data(self, table_data, sort_col=None):
+        if not self._incoming_panel:
+            return
+        self._incoming_panel.set_table_data(table_data, sort_col)
+        self._incoming_panel.border_subtitle = (
+                f"{len(table_data)} out of date" if len(table_data) else "")
+
+
     ########################### diff panel ##############################
 
 
-    def set_diff_text(self, text):
+    def show_blame(self, rel_path: str):
+        from lazysvn.blame_view import BlameView
+        self.app.push_screen(BlameView(self._svn_model, rel_path))
+
+
+    def set_diff_text(self, text, source=None):
+        if not self._diff_panel:
+            return
+        self._diff_panel.set_text(text, source)
+
+
+    def append_diff_text(self, text):
         if not self._diff_panel:
             return
-        self.query_one(DiffText).output = text
+        self._diff_panel.append_text(text)
+
+
+    def finish_diff_text(self):
+        if not self._diff_panel:
+            return
+        self._diff_panel.finish_text()
 
 
     ########################## command panell ############################
 
 
-    def append_command_log(self, commands: list[str]):
+    def append_command_log(self, commands):
         if not self._cmd_log or len(commands) == 0:
             return
         text = Text()
-        text.append("cmd: ", style="#f6c177")
-        text.append(commands[0])
-        for command in commands[1:]:
-            text.append("\ncmd: ", style="#f6c177")
-            text.append(command)
+        for idx, command in enumerate(commands):
+            text.append("cmd: " if idx == 0 else "\ncmd: ", style="#f6c177")
+            text.append(command.command)
+            duration_style = "#eb6f92" if command.exit_code != 0 else "#6e6a86"
+            text.append(f" {command.duration * 1000:.0f} ms", style=duration_style)
         self._cmd_log.write(text)
-
-
@@ -0,0 +1,199 @@
+import codecs
+import json
+import locale
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, Protocol
+
+
+CommandResult = namedtuple("CommandResult", ["stdout", "stderr", "returncode"])
+
+
+# stands in for the working copy path in fixtures so they replay from any checkout
+WC_PLACEHOLDER = "@@LAZYSVN_WC@@"
+INDEX_FILE = "commands.jsonl"
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class SvnBackend(Protocol):
+    def run(self, cmd: List[str]) -> CommandResult:
+        ...
+
+    def stream(self, cmd: List[str], on_chunk: Callable[[str], None],
+               cancelled: threading.Event) -> Optional[CommandResult]:
+        """Like run, but hands stdout to on_chunk as it arrives. Returns None
+        if cancelled was set before the command finished."""
+        ...
+
+
+class SubprocessBackend(SvnBackend):
+    def run(self, cmd: List[str]) -> CommandResult:
+        result = subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True)
+        return CommandResult(result.stdout, result.stderr, result.returncode)
+
+
+    def stream(self, cmd: List[str], on_chunk: Callable[[str], None],
+               cancelled: threading.Event) -> Optional[CommandResult]:
+        decoder = codecs.getincrementaldecoder(
+                locale.getpreferredencoding(False))(errors="replace")
+        chunks: List[str] = []
+        # stderr goes to a file so a chatty stderr can't block the stdout pipe
+        with tempfile.TemporaryFile() as stderr_file, \
+                subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file) as proc:
+            assert proc.stdout is not None
+            fd = proc.stdout.fileno()
+            while True:
+                if cancelled.is_set():
+                    proc.kill()
+                    return None
+                data = os.read(fd, STREAM_CHUNK_SIZE)
+                chunk = decoder.decode(data, final=not data)
+                if chunk:
+                    chunks.append(chunk)
+                    on_chunk(chunk)
+                if not data:
+                    break
+            returncode = proc.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(locale.getpreferredencoding(False),
+                                               errors="replace")
+        return CommandResult("".join(chunks), stderr, returncode)
+
+
+def command_key(cmd: List[str], local_path: str) -> List[str]:
+    """The argv a fixture is matched on: no credentials, no temp file names and
+    the working copy path replaced by a placeholder."""
+    key: List[str] = []
+    args = iter(cmd)
+    for arg in args:
+        if arg.startswith("--username=") or arg.startswith("--password="):
+            continue
+        if arg == "--targets":
+            targets_path = next(args, "")
+            try:
+                with open(targets_path, encoding="utf-8") as f:
+                    targets = f.read().splitlines()
+            except OSError:
+                targets = []
+            key.append("--targets")
+            key.append("\n".join(targets).replace(local_path, WC_PLACEHOLDER))
+            continue
+        key.append(arg.replace(local_path, WC_PLACEHOLDER))
+    return key
+
+
+class RecordingBackend(SvnBackend):
+    """Runs commands through another backend and saves each one as a fixture."""
+
+    def __init__(self, inner: SvnBackend, fixture_dir: str, local_path: str):
+        self._inner = inner
+        self._fixture_dir = fixture_dir
+        self._local_path = os.path.normpath(local_path)
+        self._lock = threading.Lock()
+        self._seq = 0
+        os.makedirs(fixture_dir, exist_ok=True)
+        # start a fresh session rather than appending to an older one
+        open(os.path.join(fixture_dir, INDEX_FILE), "w", encoding="utf-8").close()
+
+
+    def run(self, cmd: List[str]) -> CommandResult:
+        key = command_key(cmd, self._local_path)
+        start = time.perf_counter()
+        result = self._inner.run(cmd)
+        self._save(key, result, time.perf_counter() - start)
+        return result
+
+
+    def stream(self, cmd: List[str], on_chunk: Callable[[str], None],
+               cancelled: threading.Event) -> Optional[CommandResult]:
+        key = command_key(cmd, self._local_path)
+        start = time.perf_counter()
+        result = self._inner.stream(cmd, on_chunk, cancelled)
+        # a cancelled command has no complete output to record
+        if result is not None:
+            self._save(key, result, time.perf_counter() - start)
+        return result
+
+
+    def _save(self, key: List[str], result: CommandResult, latency: float):
+        with self._lock:
+            seq = self._seq
+            self._seq += 1
+            stdout_file = f"{seq:06d}.out"
+            with open(os.path.join(self._fixture_dir, stdout_file), "w", encoding="utf-8") as f:
+                f.write(result.stdout.replace(self._local_path, WC_PLACEHOLDER))
+            record = {
+                "seq": seq,
+                "argv": key,
+                "stdout_file": stdout_file,
+                "stderr": result.stderr.replace(self._local_path, WC_PLACEHOLDER),
+                "returncode": result.returncode,
+                "latency": latency,
+            }
+            with open(os.path.join(self._fixture_dir, INDEX_FILE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+class ReplayBackend(SvnBackend):
+    """Serves recorded fixtures back instead of running svn.
+
+    Commands are matched on their normalized argv. Repeated commands are
+    answered in recorded order and the last answer is reused once a command's
+    recordings run out. Each answer is delayed by its recorded latency times
+    latency_scale; 0 replays as fast as possible.
+    """
+
+    def __init__(self, fixture_dir: str, local_path: str, latency_scale: float = 1.0):
+        self._fixture_dir = fixture_dir
+        self._local_path = os.path.normpath(local_path)
+        self._latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._records: Dict[str, List[dict]] = {}
+        self._served: Dict[str, int] = {}
+        with open(os.path.join(fixture_dir, INDEX_FILE), encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self._records.setdefault(self._key(record["argv"]), []).append(record)
+
+
+    def _key(self, argv: List[str]) -> str:
+        return json.dumps(argv)
+
+
+    def run(self, cmd: List[str]) -> CommandResult:
+        key = self._key(command_key(cmd, self._local_path))
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                return CommandResult("", f"no recording for: {' '.join(cmd)}", 1)
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            record = records[min(served, len(records) - 1)]
+
+        if self._latency_scale > 0:
+            time.sleep(record["latency"] * self._latency_scale)
+        with open(os.path.join(self._fixture_dir, record["stdout_file"]), encoding="utf-8") as f:
+            stdout = f.read().replace(WC_PLACEHOLDER, self._local_path)
+        stderr = record["stderr"].replace(WC_PLACEHOLDER, self._local_path)
+        return CommandResult(stdout, stderr, record["returncode"])
+
+
+    def stream(self, cmd: List[str], on_chunk: Callable[[str], None],
+               cancelled: threading.Event) -> Optional[CommandResult]:
+        result = self.run(cmd)
+        for start in range(0, len(result.stdout), STREAM_CHUNK_SIZE):
+            if cancelled.is_set():
+                return None
+            on_chunk(result.stdout[start:start + STREAM_CHUNK_SIZE])
+        return result
@@ -5,6 +5,7 @@ from textual.widget import Widget
 from textual.widgets import DataTable
 from typing import Optional, List
 from lazysvn.protocols.log_panel import SvnLogPanelProtocol, SvnLogPanelImpl
+from lazysvn.revision_ranges import RevisionRanges
 
 class SvnLogPanel(Widget):
     def __init__(self, border_title: str, *args, **kwargs):
@@ -41,6 +42,50 @@ class SvnLogPanel(Widget):
         self._log_panel_impl.append_table_data(table_data)
 
 
+    def prepend_table_data(self, table_data) -> None:
+        if not self._log_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        self._log_panel_impl.prepend_table_data(table_data)
+
+
+    @property
+    def cursor_row(self) -> int:
+        if not self._log_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        return self._log_panel_impl.cursor_row
+
+
+    def revisions_near(self, radius: int) -> List[int]:
+        if not self._log_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        return self._log_panel_impl.revisions_near(radius)
+
+
+    @property
+    def marked_revisions(self) -> List[int]:
+        if not self._log_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        return self._log_panel_impl.marked_revisions
+
+
+    def toggle_mark(self) -> None:
+        if not self._log_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        self._log_panel_impl.toggle_mark()
+
+
+    def select_revision(self, revision: int) -> bool:
+        if not self._log_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        return self._log_panel_impl.select_revision(revision)
+
+
+    def set_merged_revisions(self, merged: Optional[RevisionRanges]) -> None:
+        if not self._log_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        self._log_panel_impl.set_merged_revisions(merged)
+
+
     def next_row(self) -> None:
         if not self._log_panel_impl:
             raise Exception("UnstagedPanel not mounted")
@@ -1,54 +1,149 @@
 
+import json
 import os
-import subprocess
+import re
+import tempfile
+import threading
 import xml.etree.ElementTree as ET
+from urllib.parse import quote, unquote
 from collections import namedtuple
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Set, Tuple
+from lazysvn.caches import CacheStats, StatsCache, estimate_size
+from lazysvn.disk_cache import DiskCache
+from lazysvn.lineage import CopyIndex
+from lazysvn.revision_ranges import RevisionRanges
+from lazysvn.metrics import Metrics
+from lazysvn.svn_backend import SvnBackend, SubprocessBackend
+from lazysvn.parse_worker import ParseWorker, unpack_log, unpack_status
+from lazysvn.status_snapshot import StatusSnapshot, load_snapshot, save_snapshot
+from lazysvn.svn_xml import (
+    Change, Copy, ListEntry, LogEntry, StatusResult, parse_incoming, parse_log, parse_mime_types,
+    parse_base, parse_diff_summary, parse_list, parse_pristine_checksum, parse_repository, parse_status)
 
 
-char_to_status = {
-    "A": "added",
-    "C": "conflicted",
-    "D": "deleted",
-    "I": "ignored",
-    "M": "modified",
-    "R": "replaced",
-    "X": "external",   # an unversioned directory created by an externals definition
-    "?": "unversioned",
-    "!": "missing",    # item is missing (removed by non-svn command) or incomplete
-    "~": "obstructed", # versioned item obstructed by some item of a different kind
-}
+class SVNCommandError(Exception):
+    def __init__(self, message, stderr, returncode=None):
+        super().__init__(message)
+        self.stderr = stderr
+        self.returncode = returncode
 
 
-status_to_char = {v: k for k, v in char_to_status.items()}
+CommandLogEntry = namedtuple("CommandLogEntry", ["command", "duration", "exit_code"])
+# revisions of source merged into target and still eligible, as of target's
+# last change and of source_revision on the source side
+MergeInfo = namedtuple(
+    "MergeInfo",
+    ["source", "target", "target_revision", "source_revision", "merged", "eligible"])
+DiffSummary = namedtuple(
+    "DiffSummary",
+    ["path", "working_size", "base_size", "mime_type", "binary", "line_count"])
 
+DEFAULT_DIFF_SIZE_LIMIT = 4 * 1024 * 1024
+REVISION_DIFF_CACHE_BYTES = 256 * 1024 * 1024
+BLAME_CACHE_BYTES = 128 * 1024 * 1024
+LISTING_CACHE_BYTES = 64 * 1024 * 1024
+MERGE_INFO_CACHE_BYTES = 16 * 1024 * 1024
 
-class SVNCommandError(Exception):
-    def __init__(self, message, stderr):
-        super().__init__(message)
-        self.stderr = stderr
+
+def is_binary_mime_type(mime_type: str | None) -> bool:
+    # the same rule svn uses to decide it can't show a diff
+    if not mime_type:
+        return False
+    mime_type = mime_type.split(";")[0].strip()
+    return not mime_type.startswith("text/") \
+        and mime_type not in ("image/x-xbitmap", "image/x-xpixmap")
+
+
+# svnversion output such as 4123, 4123:4168MS or 4168M
+_wc_revision_range = re.compile(r"^(\d+)(?::(\d+))?[MSP]*$")
 
 
-Change = namedtuple("Change", ["status", "path"])
-LogEntry = namedtuple("LogEntry", ["revision", "author", "date", "msg", "changelist"])
+def fold_actions(actions: List[str]) -> str | None:
+    """Net effect of a path's log actions, oldest first, as one status; None
+    when the path was added and deleted again."""
+    first, last = actions[0], actions[-1]
+    if first == "A":
+        return None if last == "D" else "A"
+    if last == "D":
+        return "D"
+    # any add after the first action means the path was deleted and re-added
+    if first in ("D", "R") or "R" in actions or "A" in actions:
+        return "R"
+    return "M"
+
+
+def count_lines(path: str) -> int:
+    count = 0
+    with open(path, "rb") as f:
+        while block := f.read(1024 * 1024):
+            count += block.count(b"\n")
+    return count
+
 
 class SvnModel:
-    def __init__(self, local_path: str, username: str, password: str):
+    def __init__(self, local_path: str, username: str, password: str,
+                 backend: SvnBackend | None = None, parse_in_process: bool = False,
+                 diff_size_limit: int = DEFAULT_DIFF_SIZE_LIMIT):
         self._local_path = os.path.normpath(local_path)
         self._username = username
         self._password = password
+        self._backend: SvnBackend = backend or SubprocessBackend()
+        # the worker runs svn itself, so it only stands in for the real backend
+        self._parse_worker: ParseWorker | None = None
+        if parse_in_process and type(self._backend) is SubprocessBackend:
+            self._parse_worker = ParseWorker()
 
         # status screen
         self._unstaged_changes: List[Change] = []
         self._added_dirs: List[Change] = []
         self._staged_changes: List[Change] = []
-        self._command_log_queue: List[str] = []
-        self._diff_cache = {}
+        self._command_log_queue: List[CommandLogEntry] = []
+        self._metrics = Metrics()
+        self._diff_cache = StatsCache("diff")
+        # bumped whenever the diff cache is cleared, so a diff that was still
+        # streaming at the time isn't cached against the new status
+        self._diff_generation = 0
+        self._diff_size_limit = diff_size_limit
+        # svn:mime-type of the changed files, read in bulk after each status
+        self._mime_types: Dict[str, str] = {}
+        self._diff_summaries: Dict[str, DiffSummary | None] = {}
+        # paths the user asked to diff regardless of size or type
+        self._full_diff_paths: Set[str] = set()
         self._hide_unversioned = True
+        self._status_is_stale = False
+        self._wc_revision: int | None = None
+        self._head_revision: int | None = None
+        self._incoming_changes: List[Change] = []
 
         # log screen
         self._fetched_log_entries: List[LogEntry] = []
-        self._log_cache: Dict[int, Tuple[str, List[Change]]] = {}
+        # revision -> (date, changelist)
+        self._log_cache = StatsCache("log")
+        self._newest_log_revision: int | None = None
+        # revisions whose log entries are all in the log cache; batches can
+        # leave gaps once the cache has been dropped
+        self._log_coverage = RevisionRanges()
+        # branch and copy points from every log entry fetched
+        self._copy_index = CopyIndex()
+        # (repository uuid, revision, path) -> diff, committed diffs never change
+        self._revision_diff_cache = DiskCache(
+                "revision diffs (disk)", "revision-diffs", REVISION_DIFF_CACHE_BYTES)
+        # (root url, uuid, repository path of the working copy)
+        self._repository: Tuple[str, str, str] | None = None
+        # revision -> (author, date), shared by everything that shows revisions
+        self._revision_info: Dict[int, Tuple[str, str]] = {}
+        # (url, BASE revision) -> revision of every line
+        self._blame_cache = DiskCache("blame (disk)", "blame", BLAME_CACHE_BYTES)
+        # (low, high, repository path) -> changes between the two revisions
+        self._range_summary_cache = StatsCache("range summaries", max_entries=64)
+        # (repository uuid, revision, path) -> children, a listing at a
+        # revision never changes
+        self._listing_cache = StatsCache("listings", max_entries=256)
+        self._listing_disk_cache = DiskCache("listings (disk)", "listings", LISTING_CACHE_BYTES)
+        # (repository uuid, source, target, target revision) -> MergeInfo
+        self._merge_info_cache = StatsCache("merge info", max_entries=32)
+        self._merge_info_disk_cache = DiskCache(
+                "merge info (disk)", "mergeinfo", MERGE_INFO_CACHE_BYTES)
         self._saved_msg = ""
 
 
@@ -67,13 +162,46 @@ class SvnModel:
         return self._command_log_queue
 
 
+    @property
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+
+    @property
+    def status_is_stale(self):
+        return self._status_is_stale
+
+
+    @property
+    def wc_revision(self):
+        return self._wc_revision
+
+
+    @property
+    def head_revision(self):
+        return self._head_revision
+
+
+    @property
+    def incoming_changes(self):
+        return self._incoming_changes
+
+
+    def close(self):
+        if self._parse_worker is not None:
+            self._parse_worker.shutdown()
+
+
     def clear_command_log_queue(self):
         self._command_log_queue = []
 
 
     def refresh_status(self):
-        self._diff_cache = {}
+        self._diff_generation += 1
+        self._diff_cache.clear()
+        self._diff_summaries.clear()
         self.fetch_status()
+        self.fetch_mime_types()
 
 
     def toggle_hide_unversioned(self):
@@ -90,54 +218,84 @@ class SvnModel:
 
 
     def fetch_status(self):
+        if self._parse_worker is not None:
+            blob = self.run_in_parse_worker(
+                    "status", ["--xml", self._local_path],
+                    self._parse_worker.status, self._local_path, self._hide_unversioned)
+            with self._metrics.span("status unpack", "parse"):
+                self._apply_status(unpack_status(blob))
+            return
+
         raw_result = self.run_command("status", ["--xml", self._local_path])
-        root = ET.fromstring(raw_result)
-
-        unstaged_changes: List[Change] = []
-        added_dirs: List[Change] = []
-        target = root.find("target")
-        if target is not None:
-            for entry in target.iter("entry"):
-                path = entry.get("path", "")
-                normalized_path = os.path.normpath(path)
-                if normalized_path.startswith(self._local_path):
-                    # +1 to remove the trailing slash
-                    relative_path = normalized_path[len(self._local_path) + 1:]
-                else:
-                    error_msg = (
-                            f"The path {path} does not start with the expected "
-                            f"local path {self._local_path}.")
-                    raise ValueError(error_msg)
-                wc_status = entry.find("wc-status")
-                status = wc_status.get("item", "") if wc_status is not None else ""
-
-                if status == "added" and os.path.isdir(path):
-                    added_dirs.append(Change(status_to_char[status], relative_path))
-                    continue
-                if self._hide_unversioned and status == "unversioned":
-                    continue
-                unstaged_changes.append(Change(status_to_char[status], relative_path))
-        self._added_dirs = added_dirs
+        with self._metrics.span("status", "parse"):
+            self._parse_status(raw_result)
+
+
+    def _parse_status(self, raw_result: str):
+        self._apply_status(parse_status(raw_result, self._local_path, self._hide_unversioned))
+
+
+    def _apply_status(self, result: StatusResult):
+        self._unstaged_changes = result.unstaged_changes
+        self._added_dirs = result.added_dirs
+        self._staged_changes = result.staged_changes
+        self._status_is_stale = False
+
+
+    def fetch_mime_types(self):
+        rel_paths = [change.path
+                     for change in self._unstaged_changes + self._staged_changes
+                     if change.status not in ("?", "I", "X")]
+        try:
+            raw_result = self.run_targets_command("proplist", ["--xml", "-v"], rel_paths)
+        except SVNCommandError:
+            # without mime types every file is treated as text
+            self._mime_types = {}
+            return
+        if raw_result == "":
+            self._mime_types = {}
+            return
+        with self._metrics.span("proplist", "parse"):
+            self._mime_types = parse_mime_types(raw_result, self._local_path)
+
+
+    def fetch_wc_revision(self) -> int | None:
+        raw_result = self.run_command("info", ["--xml", self._local_path])
+        with self._metrics.span("info", "parse"):
+            entry = ET.fromstring(raw_result).find("entry")
+        if entry is None or "revision" not in entry.attrib:
+            return None
+        self._wc_revision = int(entry.attrib["revision"])
+        return self._wc_revision
+
+
+    def load_status_snapshot(self) -> bool:
+        snapshot = load_snapshot(self._local_path)
+        if snapshot is None:
+            return False
+
+        unstaged_changes = [Change(*change) for change in snapshot.unstaged_changes]
+        if self._hide_unversioned:
+            unstaged_changes = [c for c in unstaged_changes if c.status != "?"]
         self._unstaged_changes = unstaged_changes
+        self._staged_changes = [Change(*change) for change in snapshot.staged_changes]
+        self._added_dirs = [Change(*change) for change in snapshot.added_dirs]
+        self._wc_revision = snapshot.revision
+        self._status_is_stale = True
+        return True
 
-        staged_changes: List[Change] = []
-        for changelist in root.iter("changelist"):
-            if changelist.get("name", "") == "staged":
-                for entry in changelist.iter("entry"):
-                    path = entry.get("path", "")
-                    normalized_path = os.path.normpath(path)
-                    if normalized_path.startswith(self._local_path):
-                        # +1 to remove the trailing slash
-                        relative_path = normalized_path[len(self._local_path) + 1:]
-                    else:
-                        error_msg = (
-                                f"The path {path} does not start with the expected "
-                                f"local path {self._local_path}.")
-                        raise ValueError(error_msg)
-                    wc_status = entry.find("wc-status")
-                    status = wc_status.get("item", "") if wc_status is not None else ""
-                    staged_changes.append(Change(status_to_char[status], relative_path))
-        self._staged_changes = staged_changes
+
+    def save_status_snapshot(self):
+        if self._status_is_stale:
+            # nothing new was learned this session, keep the existing snapshot
+            return
+        snapshot = StatusSnapshot(
+            self.fetch_wc_revision(),
+            self._unstaged_changes,
+            self._staged_changes,
+            self._added_dirs,
+        )
+        save_snapshot(self._local_path, snapshot)
 
 
     def fetch_log(self, revision_from=None, revision_to=None, limit=100):
@@ -156,32 +314,79 @@ class SvnModel:
             args += ["-l", str(limit)]
 
         args += ["--xml", "--verbose", self._local_path]
+        self._fetched_log_entries = self._run_log(args)
+        self._cover_log_batch(self._fetched_log_entries, revision_from, revision_to,
+                              complete=limit is None or len(self._fetched_log_entries) < limit)
+        if len(self._fetched_log_entries) > 0:
+            newest = int(self._fetched_log_entries[0].revision)
+            if self._newest_log_revision is None or newest > self._newest_log_revision:
+                self._newest_log_revision = newest
+
+
+    def fetch_new_logs(self) -> List[LogEntry]:
+        """Entries committed since the newest one fetched so far, newest first."""
+        if self._newest_log_revision is None:
+            return []
+        head_revision = self.fetch_head_revision()
+        if head_revision is None or head_revision <= self._newest_log_revision:
+            return []
+
+        log_entries = self._run_log([
+            "-r", f"HEAD:{self._newest_log_revision + 1}",
+            "--xml", "--verbose", self._local_path])
+        self._cover_log_batch(log_entries, self._newest_log_revision + 1, head_revision,
+                              complete=True)
+        if len(log_entries) > 0:
+            self._newest_log_revision = int(log_entries[0].revision)
+        return log_entries
+
+
+    def _cover_log_batch(self, log_entries: List[LogEntry], revision_from, revision_to,
+                         complete: bool):
+        """Records the revisions a log batch accounts for. The log of a path
+        skips revisions that didn't touch it, so the requested bounds count
+        too, the lower one only when no limit cut the batch short."""
+        revisions = [int(entry.revision) for entry in log_entries if entry.revision is not None]
+        bounds = [int(bound) for bound in (revision_from, revision_to)
+                  if bound is not None and str(bound).isdigit()]
+        if len(bounds) == 2:
+            high = max(bounds + revisions)
+            low = min(bounds) if complete else min(revisions, default=high + 1)
+        elif revisions:
+            high, low = max(revisions), min(revisions)
+        else:
+            return
+        if low <= high:
+            self._log_coverage = self._log_coverage.union(RevisionRanges([(low, high)]))
+
+
+    def _run_log(self, args) -> List[LogEntry]:
+        if self._parse_worker is not None:
+            blob = self.run_in_parse_worker("log", args, self._parse_worker.log)
+            with self._metrics.span("log unpack", "parse"):
+                return self._cache_log_entries(unpack_log(blob))
+
         raw_result = self.run_command("log", args)
+        with self._metrics.span("log", "parse"):
+            return self._parse_log(raw_result)
+
+
+    def _parse_log(self, raw_result: str) -> List[LogEntry]:
+        return self._cache_log_entries(parse_log(raw_result))
+
 
-        log_entries: List[LogEntry] = []
-        root = ET.fromstring(raw_result)
-        for log_entry_element in root.iter("logentry"):
-            revision = log_entry_element.get("revision")
-            author_element = log_entry_element.find("author")
-            author = author_element.text if author_element is not None else None
-            date_element = log_entry_element.find("date")
-            date_text = date_element.text if date_element is not None else None
-            paths_element = log_entry_element.find("paths")
-            changelist: List[Change] = []
-            if paths_element is not None:
-                for path_element in paths_element.iter("path"):
-                    action = path_element.get("action")
-                    path = path_element.text
-                    changelist.append(Change(action, path))
-
-            msg_element = log_entry_element.find("msg")
-            msg = msg_element.text if msg_element is not None else None
-
-            log_entry = LogEntry(revision, author, date_text, msg, [])
-            log_entries.append(log_entry)
-            if revision is not None and date_text is not None:
-                self._log_cache[int(revision)] = (date_text, changelist)
-        self._fetched_log_entries = log_entries
+    def _cache_log_entries(self, log_entries: List[LogEntry]) -> List[LogEntry]:
+        # changelists live in the log cache only, the entries list stays light
+        fetched_log_entries: List[LogEntry] = []
+        for log_entry in log_entries:
+            fetched_log_entries.append(log_entry._replace(changelist=[], copies=()))
+            self._copy_index.add(log_entry.copies)
+            if log_entry.revision is not None and log_entry.date is not None:
+                self._log_cache.put(
+                        int(log_entry.revision), (log_entry.date, log_entry.changelist))
+                self._revision_info[int(log_entry.revision)] = (
+                        log_entry.author or "", log_entry.date)
+        return fetched_log_entries
 
 
     def fetch_more_logs(self, quantity) -> bool:
@@ -201,6 +406,361 @@ class SvnModel:
         return self._log_cache.get(revision, None)
 
 
+    def copies_in(self, revision: int) -> List[Copy]:
+        return self._copy_index.copies_in(revision)
+
+
+    def copy_origin(self, revision: int, path: str | None = None) -> Tuple[Copy, str] | None:
+        """The copy path traces back to as of revision, and the path it was
+        copied from, using only the log fetched so far. Without a path it's a
+        copy made in revision itself, or else the first changed path that lies
+        on a copied branch."""
+        if path is not None:
+            return self._copy_index.origin(path, revision)
+        copies = self._copy_index.copies_in(revision)
+        if copies:
+            return copies[0], copies[0].from_path
+        log_cache_entry = self._log_cache.get(revision)
+        if log_cache_entry is None:
+            return None
+        for _, changed_path in log_cache_entry[1]:
+            found = self._copy_index.origin(changed_path, revision)
+            if found is not None:
+                return found
+        return None
+
+
+    def copy_lineage(self, path: str, revision: int) -> List[Tuple[str, int]]:
+        return self._copy_index.lineage(path, revision)
+
+
+    def copies_from(self, path: str) -> List[Copy]:
+        return self._copy_index.copies_from(path)
+
+
+    def suggested_merge_target(self) -> str:
+        """The newest branch made from this working copy's path, if the log
+        has shown one."""
+        if self._repository is None:
+            return ""
+        copies = self._copy_index.copies_from(self._repository[2])
+        return f"^{copies[0].path}" if copies else ""
+
+
+    def fetch_last_changed_revision(self, repo_path: str) -> int:
+        root, _, _ = self.fetch_repository()
+        raw_result = self.run_command("info", ["--xml", f"{root}{quote(repo_path)}"])
+        with self._metrics.span("info", "parse"):
+            commit = ET.fromstring(raw_result).find("entry/commit")
+        if commit is None or "revision" not in commit.attrib:
+            raise SVNCommandError(f"No last changed revision for {repo_path}", "")
+        return int(commit.attrib["revision"])
+
+
+    def merge_info(self, target_path: str) -> MergeInfo:
+        """Revisions of this working copy's branch merged into target_path and
+        those still eligible. Results are kept per target revision, so only a
+        commit to the target makes svn mergeinfo run again."""
+        root, uuid, source_path = self.fetch_repository()
+        target_revision = self.fetch_last_changed_revision(target_path)
+        key = (uuid, source_path, target_path, target_revision)
+        info = self._merge_info_cache.get(key)
+        if info is None:
+            cached = self._merge_info_disk_cache.get(key)
+            if cached is not None:
+                stored = json.loads(cached)
+                info = MergeInfo(
+                    source_path, target_path, target_revision, stored["source_revision"],
+                    RevisionRanges(stored["merged"]), RevisionRanges(stored["eligible"]))
+        if info is None:
+            source_revision = self.fetch_youngest_revision()
+            source = f"{root}{quote(source_path)}@{source_revision}"
+            target = f"{root}{quote(target_path)}@{target_revision}"
+            merged = self.run_command("mergeinfo", ["--show-revs", "merged", source, target])
+            eligible = self.run_command("mergeinfo", ["--show-revs", "eligible", source, target])
+            with self._metrics.span("mergeinfo", "parse"):
+                info = MergeInfo(
+                    source_path, target_path, target_revision, source_revision,
+                    RevisionRanges.parse(merged), RevisionRanges.parse(eligible))
+            self._store_merge_info(info)
+            return info
+        return self.extend_merge_info(info)
+
+
+    def extend_merge_info(self, info: MergeInfo) -> MergeInfo:
+        """Counts source revisions committed after info was worked out as
+        eligible, which they are until the target changes. Uses the log when
+        it covers them and a range-limited svn mergeinfo otherwise."""
+        newest = self._newest_log_revision
+        if newest is None or newest <= info.source_revision:
+            return info
+
+        if self._log_coverage.covers(info.source_revision + 1, newest):
+            new_revisions = RevisionRanges.from_revisions(
+                    revision for revision in range(info.source_revision + 1, newest + 1)
+                    if revision in self._log_cache)
+        else:
+            root, _, _ = self.fetch_repository()
+            raw_result = self.run_command("mergeinfo", [
+                "--show-revs", "eligible", "-r", f"{info.source_revision + 1}:{newest}",
+                f"{root}{quote(info.source)}@{newest}",
+                f"{root}{quote(info.target)}@{info.target_revision}"])
+            with self._metrics.span("mergeinfo", "parse"):
+                new_revisions = RevisionRanges.parse(raw_result)
+
+        info = info._replace(source_revision=newest, eligible=info.eligible.union(new_revisions))
+        self._store_merge_info(info)
+        return info
+
+
+    def _store_merge_info(self, info: MergeInfo):
+        _, uuid, _ = self.fetch_repository()
+        key = (uuid, info.source, info.target, info.target_revision)
+        self._merge_info_cache.put(key, info)
+        self._merge_info_disk_cache.put(key, json.dumps({
+            "source_revision": info.source_revision,
+            "merged": info.merged.ranges,
+            "eligible": info.eligible.ranges,
+        }))
+
+
+    def fetch_repository(self) -> Tuple[str, str, str]:
+        """Root URL and UUID of the repository and the repository path of the
+        working copy, read once."""
+        if self._repository is None:
+            raw_result = self.run_command("info", ["--xml", self._local_path])
+            with self._metrics.span("info", "parse"):
+                root, uuid, url = parse_repository(raw_result)
+            if root is None or uuid is None or url is None:
+                raise SVNCommandError("No repository info for the working copy", "")
+            self._repository = (root, uuid, unquote(url[len(root):]) or "/")
+        return self._repository
+
+
+    def has_revision_diff(self, revision: int, repo_path: str) -> bool:
+        if self._repository is None:
+            return False
+        return (self._repository[1], revision, repo_path) in self._revision_diff_cache
+
+
+    def revision_diff(self, revision: int, repo_path: str, action: str) -> str:
+        """What revision changed in repo_path, a path as listed in the log."""
+        # a deleted path only exists in the revision before
+        peg_revision = revision - 1 if action == "D" else revision
+        return self._committed_diff(revision, repo_path, peg_revision, ["-c", str(revision)])
+
+
+    def range_diff(self, low: int, high: int, repo_path: str, action: str) -> str:
+        """What changed in repo_path from revision low to revision high."""
+        peg_revision = low if action == "D" else high
+        return self._committed_diff(
+                (low, high), repo_path, peg_revision, ["-r", f"{low}:{high}"])
+
+
+    def _committed_diff(self, revisions, repo_path: str, peg_revision: int, args) -> str:
+        root, uuid, _ = self.fetch_repository()
+        key = (uuid, revisions, repo_path)
+        diff = self._revision_diff_cache.get(key)
+        if diff is not None:
+            return diff
+
+        url = f"{root}{quote(repo_path)}@{peg_revision}"
+        # --depth empty keeps a directory to its own property changes
+        diff = self.run_command("diff", args + ["--depth", "empty", url])
+        self._revision_diff_cache.put(key, diff)
+        return diff
+
+
+    def revision_info(self, revision: int) -> Tuple[str, str] | None:
+        """Author and date of a revision seen in the log or in a blame."""
+        return self._revision_info.get(revision)
+
+
+    def fetch_base(self, rel_path: str) -> Tuple[str, int]:
+        raw_result = self.run_command("info", ["--xml", os.path.join(self._local_path, rel_path)])
+        with self._metrics.span("info", "parse"):
+            url, revision = parse_base(raw_result)
+        if url is None or revision is None:
+            raise SVNCommandError(f"No BASE revision for {rel_path}", "")
+        return url, revision
+
+
+    def base_text(self, rel_path: str) -> str:
+        return self.run_command("cat", [os.path.join(self._local_path, rel_path)])
+
+
+    def stream_blame(self, rel_path: str, base: Tuple[str, int],
+                     on_lines: Callable[[List[Tuple[int, int]]], None],
+                     cancelled: threading.Event) -> bool:
+        """Hands (line index, revision) pairs for the BASE text of rel_path to
+        on_lines as svn produces them; revision 0 means no commit. Authors and
+        dates go to the revision store rather than with every line. Returns
+        False if it was cancelled; only complete blames are cached."""
+        cached = self._blame_cache.get(base)
+        if cached is not None:
+            blame = json.loads(cached)
+            for revision, (author, date) in blame["revisions"].items():
+                self._revision_info.setdefault(int(revision), (author, date))
+            on_lines(list(enumerate(blame["lines"])))
+            return True
+
+        parser = ET.XMLPullParser(events=("end",))
+        line_revisions: List[int] = []
+        revisions: Dict[int, Tuple[str, str]] = {}
+
+        def on_chunk(chunk: str):
+            parser.feed(chunk)
+            batch: List[Tuple[int, int]] = []
+            for _, element in parser.read_events():
+                if element.tag != "entry":
+                    continue
+                commit = element.find("commit")
+                revision = int(commit.get("revision", 0)) if commit is not None else 0
+                if commit is not None and revision not in revisions:
+                    revisions[revision] = (
+                            commit.findtext("author") or "", commit.findtext("date") or "")
+                    self._revision_info.setdefault(revision, revisions[revision])
+                batch.append((int(element.get("line-number", 0)) - 1, revision))
+                line_revisions.append(revision)
+                element.clear()
+            if batch:
+                on_lines(batch)
+
+        result = self.run_streaming_command(
+                "blame", ["--xml", os.path.join(self._local_path, rel_path)],
+                on_chunk, cancelled)
+        if result is None:
+            return False
+        self._blame_cache.put(base, json.dumps({
+            "revisions": {str(rev): info for rev, info in revisions.items()},
+            "lines": line_revisions,
+        }))
+        return True
+
+
+    def fetch_youngest_revision(self) -> int:
+        """Newest revision of the whole repository, which pins what the
+        repository browser shows."""
+        root, _, _ = self.fetch_repository()
+        raw_result = self.run_command("info", ["--xml", "-r", "HEAD", root])
+        with self._metrics.span("info -r HEAD", "parse"):
+            _, revision = parse_base(raw_result)
+        if revision is None:
+            raise SVNCommandError("No HEAD revision for the repository", "")
+        return revision
+
+
+    def has_listing(self, repo_path: str, revision: int) -> bool:
+        if self._repository is None:
+            return False
+        key = (self._repository[1], revision, repo_path)
+        return key in self._listing_cache or key in self._listing_disk_cache
+
+
+    def list_directory(self, repo_path: str, revision: int) -> List[ListEntry]:
+        """Immediate children of a repository directory at a revision."""
+        root, uuid, _ = self.fetch_repository()
+        key = (uuid, revision, repo_path)
+        entries = self._listing_cache.get(key)
+        if entries is not None:
+            return entries
+
+        cached = self._listing_disk_cache.get(key)
+        if cached is not None:
+            entries = [ListEntry(*entry) for entry in json.loads(cached)]
+        else:
+            raw_result = self.run_command(
+                    "list", ["--xml", "--depth", "immediates",
+                             f"{root}{quote(repo_path)}@{revision}"])
+            with self._metrics.span("list", "parse"):
+                entries = parse_list(raw_result)
+            self._listing_disk_cache.put(key, json.dumps(entries))
+        self._listing_cache.put(key, entries)
+        return entries
+
+
+    def range_summary(self, rev_a: int, rev_b: int) -> List[Change]:
+        """Paths under the working copy that changed between two revisions."""
+        low, high = sorted((rev_a, rev_b))
+        root, _, wc_repo_path = self.fetch_repository()
+        key = (low, high, wc_repo_path)
+        changes = self._range_summary_cache.get(key)
+        if changes is not None:
+            return changes
+
+        changes = self._range_summary_from_log(low, high, wc_repo_path)
+        if changes is None:
+            raw_result = self.run_command("diff", [
+                "--summarize", "--xml", "-r", f"{low}:{high}",
+                f"{root}{quote(wc_repo_path)}@{high}"])
+            with self._metrics.span("diff --summarize", "parse"):
+                changes = sorted(parse_diff_summary(raw_result, root), key=lambda c: c.path)
+        self._range_summary_cache.put(key, changes)
+        return changes
+
+
+    def _range_summary_from_log(self, low: int, high: int,
+                                wc_repo_path: str) -> List[Change] | None:
+        # only when the log cache holds every revision after low up to high
+        if not self._log_coverage.covers(low + 1, high):
+            return None
+
+        prefix = wc_repo_path.rstrip("/") + "/"
+        actions: Dict[str, List[str]] = {}
+        for revision, (_, changelist) in sorted(self._log_cache.items()):
+            if not low < revision <= high:
+                continue
+            # the log lists a copied directory as one path, svn diff --summarize
+            # lists everything in it
+            for copy in self._copy_index.copies_in(revision):
+                if copy.path == wc_repo_path or copy.path.startswith(prefix) \
+                        or prefix.startswith(copy.path.rstrip("/") + "/"):
+                    return None
+            for action, path in changelist:
+                if path == wc_repo_path or path.startswith(prefix):
+                    actions.setdefault(path, []).append(action)
+
+        changes: List[Change] = []
+        for path, path_actions in sorted(actions.items()):
+            status = fold_actions(path_actions)
+            if status is not None:
+                changes.append(Change(status, path))
+        return changes
+
+
+    @property
+    def diff_generation(self) -> int:
+        return self._diff_generation
+
+
+    @property
+    def caches(self) -> Dict[str, StatsCache]:
+        return {cache.name: cache
+                for cache in [self._diff_cache, self._log_cache, self._range_summary_cache,
+                              self._revision_diff_cache, self._blame_cache,
+                              self._listing_cache, self._listing_disk_cache,
+                              self._merge_info_cache, self._merge_info_disk_cache]}
+
+
+    def cache_stats(self) -> List[CacheStats]:
+        stats = [cache.stats() for cache in self.caches.values()]
+        entries = self._fetched_log_entries
+        stats.append(CacheStats(
+            "fetched log entries", len(entries), estimate_size(entries, len(entries)),
+            0, 0, 0, 0))
+        return stats
+
+
+    def drop_cache(self, name: str) -> bool:
+        cache = self.caches.get(name)
+        if cache is None:
+            return False
+        cache.drop()
+        if cache is self._log_cache:
+            self._log_coverage = RevisionRanges()
+        return True
+
+
     def add_file(self, rel_path: str):
         self.run_command("add", ["-N", os.path.join(self._local_path, rel_path)])
 
@@ -217,15 +777,147 @@ class SvnModel:
         self.run_command("revert", ["-R", os.path.join(self._local_path, rel_path)])
 
 
+    def add_files(self, rel_paths: List[str]):
+        self.run_targets_command("add", ["-N"], rel_paths)
+
+
+    def stage_files(self, rel_paths: List[str]):
+        self.run_targets_command("changelist", ["staged"], rel_paths)
+
+
+    def unstage_files(self, rel_paths: List[str]):
+        self.run_targets_command("changelist", ["--remove"], rel_paths)
+
+
+    def revert_files(self, rel_paths: List[str]):
+        self.run_targets_command("revert", ["-R"], rel_paths)
+
+
+    def stage_changes(self, changes: List[Change]):
+        self.add_files([change.path for change in changes if change.status == "?"])
+        self.stage_files([change.path for change in changes])
+
+
+    def unstage_changes(self, changes: List[Change]):
+        self.unstage_files([change.path for change in changes])
+        self.revert_files([change.path for change in changes if change.status == "A"])
+
+
+    def move_to_staged(self, changes: List[Change]):
+        # mirrors what stage_changes does to svn status, without asking svn
+        self.restore_changes(
+            [Change("A" if change.status == "?" else change.status, change.path)
+             for change in changes],
+            staged=True)
+
+
+    def move_to_unstaged(self, changes: List[Change]):
+        unstaged: List[Change] = []
+        for change in changes:
+            if change.status != "A":
+                unstaged.append(change)
+            elif not self._hide_unversioned:
+                unstaged.append(Change("?", change.path))
+        self._place_changes({change.path for change in changes}, unstaged=unstaged)
+
+
+    def restore_changes(self, changes: List[Change], staged: bool):
+        paths = {change.path for change in changes}
+        if not staged:
+            self._place_changes(paths, unstaged=changes)
+            return
+        added_dirs = [change for change in changes if change.status == "A"
+                      and os.path.isdir(os.path.join(self._local_path, change.path))]
+        staged_changes = [change for change in changes if change not in added_dirs]
+        self._place_changes(paths, staged=staged_changes, added_dirs=added_dirs)
+
+
+    def _place_changes(self, paths, unstaged=None, staged=None, added_dirs=None):
+        # build new lists rather than mutating, a status fetch may be reading them
+        self._unstaged_changes = [
+            c for c in self._unstaged_changes if c.path not in paths] + (unstaged or [])
+        self._staged_changes = [
+            c for c in self._staged_changes if c.path not in paths] + (staged or [])
+        self._added_dirs = [
+            c for c in self._added_dirs if c.path not in paths] + (added_dirs or [])
+
+
     def diff_file(self, rel_path: str) -> str:
-        if (rel_path in self._diff_cache):
-            return self._diff_cache[rel_path]
+        diff = self._diff_cache.get(rel_path)
+        if diff is not None:
+            return diff
 
         diff = self.run_command("diff", [os.path.join(self._local_path, rel_path)])
-        self._diff_cache[rel_path] = diff
+        self._diff_cache.put(rel_path, diff)
         return diff
 
 
+    def diff_summary(self, rel_path: str) -> DiffSummary | None:
+        """What to show instead of the diff for binary files and files over the
+        size limit, or None when the diff should be shown as usual."""
+        if rel_path in self._full_diff_paths:
+            return None
+        if rel_path in self._diff_summaries:
+            return self._diff_summaries[rel_path]
+        summary = self._make_diff_summary(rel_path)
+        self._diff_summaries[rel_path] = summary
+        return summary
+
+
+    def _make_diff_summary(self, rel_path: str) -> DiffSummary | None:
+        path = os.path.join(self._local_path, rel_path)
+        mime_type = self._mime_types.get(rel_path)
+        binary = is_binary_mime_type(mime_type)
+        working_size = os.path.getsize(path) if os.path.isfile(path) else None
+        if not binary and working_size is not None and working_size <= self._diff_size_limit:
+            return None
+
+        # a deleted file diffs its whole BASE text, so that size counts too
+        base_size = self.fetch_base_size(rel_path)
+        if not binary and max(working_size or 0, base_size or 0) <= self._diff_size_limit:
+            return None
+        line_count = count_lines(path) if not binary and working_size is not None else None
+        return DiffSummary(rel_path, working_size, base_size, mime_type, binary, line_count)
+
+
+    def fetch_base_size(self, rel_path: str) -> int | None:
+        # the pristine copy in .svn holds the BASE text, so no server round trip
+        raw_result = self.run_command("info", ["--xml", os.path.join(self._local_path, rel_path)])
+        with self._metrics.span("info", "parse"):
+            wcroot, checksum = parse_pristine_checksum(raw_result)
+        if wcroot is None or checksum is None:
+            return None
+        checksum = checksum.removeprefix("$sha1$")
+        pristine = os.path.join(
+                wcroot, ".svn", "pristine", checksum[:2], checksum + ".svn-base")
+        try:
+            return os.path.getsize(pristine)
+        except OSError:
+            return None
+
+
+    def allow_full_diff(self, rel_path: str):
+        self._full_diff_paths.add(rel_path)
+
+
+    def cached_diff(self, rel_path: str) -> str | None:
+        return self._diff_cache.get(rel_path)
+
+
+    def stream_diff(self, rel_path: str, on_chunk: Callable[[str], None],
+                    cancelled: threading.Event) -> bool:
+        """Hands the diff to on_chunk as svn produces it. Returns False if it was
+        cancelled; only complete diffs are cached."""
+        generation = self._diff_generation
+        diff = self.run_streaming_command(
+                "diff", [os.path.join(self._local_path, rel_path)], on_chunk, cancelled)
+        if diff is None:
+            return False
+        if generation == self._diff_generation:
+            self._diff_cache.put(rel_path, diff)
+        return True
+
+
     def commit_staged(self, message: str):
         if len(self._staged_changes) == 0 and len(self._added_dirs) == 0:
             raise SVNCommandError("Nothing to commit", "")
@@ -234,13 +926,14 @@ class SvnModel:
             self.changelist_commit(message)
             return
 
-        commit_paths = [os.path.join(self._local_path, change.path)
-                        for change_list in [self._added_dirs, self._staged_changes] 
+        commit_paths = [change.path
+                        for change_list in [self._added_dirs, self._staged_changes]
                         for change in change_list]
 
-        self.run_command(
+        self.run_targets_command(
             "commit",
-            ["--depth=empty", "-m", message] + commit_paths
+            ["--depth=empty", "-m", message],
+            commit_paths
         )
 
 
@@ -248,28 +941,78 @@ class SvnModel:
         self.run_command("commit", ["--changelist", "staged", "-m", message, self._local_path])
 
 
-    def is_up_to_date(self) -> bool:
-        raw_result = self.run_command("status", ["-u", "--xml", self._local_path])
-        root = ET.fromstring(raw_result)
+    def fetch_head_revision(self) -> int | None:
+        """Last revision that changed this working copy's URL, as of HEAD."""
+        raw_result = self.run_command("info", ["-r", "HEAD", "--xml", self._local_path])
+        with self._metrics.span("info -r HEAD", "parse"):
+            commit = ET.fromstring(raw_result).find("entry/commit")
+        if commit is None or "revision" not in commit.attrib:
+            return None
+        self._head_revision = int(commit.attrib["revision"])
+        return self._head_revision
 
-        against = root.find(".//against")
-        if against is None:
+
+    def is_up_to_date(self) -> bool:
+        # two cheap calls first, the full status -u crawl only when they disagree.
+        # A mixed-revision working copy is only as new as its oldest item.
+        revision_range = self.fetch_wc_revision_range()
+        head_revision = self.fetch_head_revision()
+        if revision_range is not None and head_revision is not None \
+                and head_revision <= revision_range[0]:
+            self._incoming_changes = []
             return True
-        head_rev = int(against.attrib["revision"])
+        return len(self.fetch_incoming()) == 0
 
-        for entry in root.findall(".//entry"):
-            wc_status = entry.find(".//wc-status")
-            if wc_status and "revision" in wc_status.attrib:
-                wc_rev = int(wc_status.attrib["revision"])
-                if wc_rev < head_rev:
-                    return False
 
-        return True
+    def fetch_wc_revision_range(self) -> Tuple[int, int] | None:
+        """Lowest and highest BASE revision in the working copy, as reported by
+        svnversion. None when it can't tell, e.g. svnversion isn't installed."""
+        args = ["-n", self._local_path]
+        cmd = ["svnversion"] + args
+        start = self._metrics.now()
+        exit_code = 0
+        stdout_bytes = 0
+        try:
+            stdout = self.external_command(cmd)
+            stdout_bytes = len(stdout)
+        except SVNCommandError as e:
+            exit_code = e.returncode if e.returncode is not None else 1
+            return None
+        except OSError:
+            exit_code = 127
+            return None
+        finally:
+            self._record_command("svnversion", args, start, exit_code, stdout_bytes,
+                                 program=None)
+        match = _wc_revision_range.match(stdout.strip())
+        if match is None:
+            return None
+        low = int(match.group(1))
+        return low, int(match.group(2) or low)
+
+
+    def fetch_incoming(self) -> List[Change]:
+        raw_result = self.run_command("status", ["-u", "--xml", self._local_path])
+        with self._metrics.span("status -u", "parse"):
+            self._incoming_changes = parse_incoming(raw_result, self._local_path)
+        return self._incoming_changes
+
+
+    def run_targets_command(self, subcommand: str, args, rel_paths: List[str]):
+        # one process for any number of paths, and no ARG_MAX limit
+        if len(rel_paths) == 0:
+            return ""
+        with tempfile.NamedTemporaryFile(
+                "w", suffix=".targets", delete=False, encoding="utf-8") as targets:
+            targets.write("\n".join(os.path.join(self._local_path, rel_path)
+                                    for rel_path in rel_paths))
+        try:
+            return self.run_command(subcommand, args + ["--targets", targets.name])
+        finally:
+            os.remove(targets.name)
 
 
-    def run_command(self, subcommand: str, args, **kwargs):
-        if subcommand != "status" and subcommand != "diff":
-            self._command_log_queue.append(f"svn {subcommand} {" ".join(args)}")
+    def build_command(self, subcommand: str, args) -> List[str]:
         cmd = ["svn", "--non-interactive"]
 
         if self._username:
@@ -278,22 +1021,87 @@ class SvnModel:
         if self._password:
             cmd.append(f"--password={self._password}")
 
-        cmd += [subcommand] + args
-        return self.external_command(cmd, **kwargs)
+        return cmd + [subcommand] + args
 
 
-    def external_command(self, cmd) -> str:
+    def run_command(self, subcommand: str, args, **kwargs):
+        cmd = self.build_command(subcommand, args)
+        start = self._metrics.now()
+        exit_code = 0
+        stdout_bytes = 0
         try:
-            result = subprocess.run(
-                    cmd, 
-                    check=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    text=True)
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            command = " ".join(cmd)
-            if self._password and self._password in command:
-                command = command.replace(self._password, "********")
-            raise SVNCommandError(f"command: {command}\n\nmsg: {e.stderr}", e.stderr)
+            stdout = self.external_command(cmd, **kwargs)
+            stdout_bytes = len(stdout)
+            return stdout
+        except SVNCommandError as e:
+            exit_code = e.returncode if e.returncode is not None else 1
+            raise
+        finally:
+            self._record_command(subcommand, args, start, exit_code, stdout_bytes)
+
+
+    def run_streaming_command(self, subcommand: str, args,
+                              on_chunk: Callable[[str], None],
+                              cancelled: threading.Event) -> str | None:
+        cmd = self.build_command(subcommand, args)
+        start = self._metrics.now()
+        exit_code = 0
+        stdout_bytes = 0
+
+        def count_chunk(chunk: str):
+            nonlocal stdout_bytes
+            stdout_bytes += len(chunk)
+            on_chunk(chunk)
 
+        try:
+            return self.external_stream(cmd, count_chunk, cancelled)
+        except SVNCommandError as e:
+            exit_code = e.returncode if e.returncode is not None else 1
+            raise
+        finally:
+            self._record_command(subcommand, args, start, exit_code, stdout_bytes)
+
+
+    def run_in_parse_worker(self, subcommand: str, args, job, *job_args) -> bytes:
+        cmd = self.build_command(subcommand, args)
+        start = self._metrics.now()
+        returncode, stderr, stdout_bytes, blob = job(cmd, *job_args)
+        self._record_command(subcommand, args, start, returncode, stdout_bytes)
+        if returncode != 0:
+            raise self._command_error(cmd, stderr, returncode)
+        return blob
+
+
+    def _record_command(self, subcommand: str, args, start: float,
+                        exit_code: int, stdout_bytes: int, program: str | None = "svn"):
+        # program is None for a tool that is its own subcommand, like svnversion
+        duration = self._metrics.now() - start
+        self._metrics.record(subcommand, "svn", start, duration,
+                             exit_code=exit_code, stdout_bytes=stdout_bytes)
+        command = f"{program} {subcommand}" if program else subcommand
+        self._command_log_queue.append(CommandLogEntry(
+            f"{command} {" ".join(args)}", duration, exit_code))
+
+
+    def external_command(self, cmd) -> str:
+        result = self._backend.run(cmd)
+        if result.returncode != 0:
+            raise self._command_error(cmd, result.stderr, result.returncode)
+        return result.stdout
+
+
+    def external_stream(self, cmd, on_chunk: Callable[[str], None],
+                        cancelled: threading.Event) -> str | None:
+        result = self._backend.stream(cmd, on_chunk, cancelled)
+        if result is None:
+            return None
+        if result.returncode != 0:
+            raise self._command_error(cmd, result.stderr, result.returncode)
+        return result.stdout
+
+
+    def _command_error(self, cmd, stderr: str, returncode: int) -> SVNCommandError:
+        command = " ".join(cmd)
+        if self._password and self._password in command:
+            command = command.replace(self._password, "********")
+        return SVNCommandError(f"command: {command}\n\nmsg: {stderr}", stderr, returncode)
@@ -1,8 +1,9 @@
 
+from textual import on
 from textual.app import ComposeResult
 from textual.widget import Widget
 from textual.widgets import DataTable
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from lazysvn.protocols.status_panel import SvnStatusPanelProtocol, SvnStatusPanelImpl
 
 
@@ -23,6 +24,12 @@ class SvnStatusPanel(Widget):
         table.cursor_type = "row"
 
 
+    @on(DataTable.RowSelected)
+    def on_row_selected(self, event: DataTable.RowSelected) -> None:
+        event.stop()
+        self.toggle_node()
+
+
     def set_columns(self, columns) -> None:
         if not self._status_panel_impl:
             raise Exception("UnstagedPanel not mounted")
@@ -54,6 +61,32 @@ class SvnStatusPanel(Widget):
         return self._status_panel_impl.row
 
 
+    @property
+    def rows(self) -> List[Tuple[str, ...]]:
+        if not self._status_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        return self._status_panel_impl.rows
+
+
+    @property
+    def marked_rows(self) -> List[Tuple[str, ...]]:
+        if not self._status_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        return self._status_panel_impl.marked_rows
+
+
+    def toggle_mark(self) -> None:
+        if not self._status_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        self._status_panel_impl.toggle_mark()
+
+
+    def clear_marks(self) -> None:
+        if not self._status_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        self._status_panel_impl.clear_marks()
+
+
     def is_focused(self) -> bool:
         if not self._status_panel_impl:
             raise Exception("UnstagedPanel not mounted")
@@ -65,3 +98,22 @@ class SvnStatusPanel(Widget):
             raise Exception("UnstagedPanel not mounted")
         self._status_panel_impl.give_focus()
 
+
+
+    def set_tree_mode(self, enabled: bool) -> None:
+        if not self._status_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        self._status_panel_impl.set_tree_mode(enabled)
+
+
+    def toggle_node(self) -> None:
+        if not self._status_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        self._status_panel_impl.toggle_node()
+
+
+    @property
+    def subtree_rows(self) -> List[Tuple[str, ...]]:
+        if not self._status_panel_impl:
+            raise Exception("UnstagedPanel not mounted")
+        return self._status_panel_impl.subtree_rows
@@ -0,0 +1,192 @@
+import os
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+
+char_to_status = {
+    "A": "added",
+    "C": "conflicted",
+    "D": "deleted",
+    "I": "ignored",
+    "M": "modified",
+    "R": "replaced",
+    "X": "external",   # an unversioned directory created by an externals definition
+    "?": "unversioned",
+    "!": "missing",    # item is missing (removed by non-svn command) or incomplete
+    "~": "obstructed", # versioned item obstructed by some item of a different kind
+}
+
+
+status_to_char = {v: k for k, v in char_to_status.items()}
+
+
+Change = namedtuple("Change", ["status", "path"])
+# a path copied in revision, e.g. a branch created from trunk
+Copy = namedtuple("Copy", ["revision", "path", "from_path", "from_revision"])
+LogEntry = namedtuple(
+    "LogEntry", ["revision", "author", "date", "msg", "changelist", "copies"], defaults=[()])
+ListEntry = namedtuple("ListEntry", ["name", "kind", "size", "revision", "author", "date"])
+StatusResult = namedtuple("StatusResult", ["unstaged_changes", "added_dirs", "staged_changes"])
+
+
+def relative_path(path: str, local_path: str) -> str:
+    normalized_path = os.path.normpath(path)
+    if not normalized_path.startswith(local_path):
+        error_msg = (
+                f"The path {path} does not start with the expected "
+                f"local path {local_path}.")
+        raise ValueError(error_msg)
+    # +1 to remove the trailing slash
+    return normalized_path[len(local_path) + 1:]
+
+
+def parse_status(raw_result: str, local_path: str, hide_unversioned: bool) -> StatusResult:
+    root = ET.fromstring(raw_result)
+
+    unstaged_changes: List[Change] = []
+    added_dirs: List[Change] = []
+    target = root.find("target")
+    if target is not None:
+        for entry in target.iter("entry"):
+            path = entry.get("path", "")
+            rel_path = relative_path(path, local_path)
+            wc_status = entry.find("wc-status")
+            status = wc_status.get("item", "") if wc_status is not None else ""
+
+            if status == "added" and os.path.isdir(path):
+                added_dirs.append(Change(status_to_char[status], rel_path))
+                continue
+            if hide_unversioned and status == "unversioned":
+                continue
+            unstaged_changes.append(Change(status_to_char[status], rel_path))
+
+    staged_changes: List[Change] = []
+    for changelist in root.iter("changelist"):
+        if changelist.get("name", "") == "staged":
+            for entry in changelist.iter("entry"):
+                rel_path = relative_path(entry.get("path", ""), local_path)
+                wc_status = entry.find("wc-status")
+                status = wc_status.get("item", "") if wc_status is not None else ""
+                staged_changes.append(Change(status_to_char[status], rel_path))
+    return StatusResult(unstaged_changes, added_dirs, staged_changes)
+
+
+def parse_log(raw_result: str) -> List[LogEntry]:
+    """Log entries with their changelists and copies filled in."""
+    log_entries: List[LogEntry] = []
+    root = ET.fromstring(raw_result)
+    for log_entry_element in root.iter("logentry"):
+        revision = log_entry_element.get("revision")
+        author_element = log_entry_element.find("author")
+        author = author_element.text if author_element is not None else None
+        date_element = log_entry_element.find("date")
+        date_text = date_element.text if date_element is not None else None
+        paths_element = log_entry_element.find("paths")
+        changelist: List[Change] = []
+        copies: List[Copy] = []
+        if paths_element is not None:
+            for path_element in paths_element.iter("path"):
+                action = path_element.get("action")
+                path = path_element.text
+                changelist.append(Change(action, path))
+                copyfrom_path = path_element.get("copyfrom-path")
+                copyfrom_rev = path_element.get("copyfrom-rev")
+                if copyfrom_path is not None and copyfrom_rev is not None \
+                        and revision is not None:
+                    copies.append(Copy(int(revision), path, copyfrom_path, int(copyfrom_rev)))
+
+        msg_element = log_entry_element.find("msg")
+        msg = msg_element.text if msg_element is not None else None
+
+        log_entries.append(LogEntry(revision, author, date_text, msg, changelist, copies))
+    return log_entries
+
+
+def parse_incoming(raw_result: str, local_path: str) -> List[Change]:
+    """Out-of-date paths from `svn status -u --xml`, with their repository status."""
+    root = ET.fromstring(raw_result)
+    incoming_changes: List[Change] = []
+    for entry in root.iter("entry"):
+        repos_status = entry.find("repos-status")
+        if repos_status is None:
+            continue
+        status = repos_status.get("item", "none")
+        if status == "none":
+            continue
+        rel_path = relative_path(entry.get("path", ""), local_path)
+        incoming_changes.append(Change(status_to_char.get(status, "*"), rel_path))
+    return incoming_changes
+
+
+def parse_mime_types(raw_result: str, local_path: str) -> Dict[str, str]:
+    """svn:mime-type of each target in `svn proplist --xml -v`, by relative path."""
+    root = ET.fromstring(raw_result)
+    mime_types: Dict[str, str] = {}
+    for target in root.iter("target"):
+        for prop in target.iter("property"):
+            if prop.get("name") == "svn:mime-type":
+                rel_path = relative_path(target.get("path", ""), local_path)
+                mime_types[rel_path] = (prop.text or "").strip()
+    return mime_types
+
+
+def parse_pristine_checksum(raw_result: str) -> Tuple[Optional[str], Optional[str]]:
+    """Working copy root and BASE checksum of a file from `svn info --xml`."""
+    wc_info = ET.fromstring(raw_result).find("entry/wc-info")
+    if wc_info is None:
+        return None, None
+    wcroot = wc_info.findtext("wcroot-abspath")
+    checksum = wc_info.findtext("checksum")
+    return wcroot, checksum
+
+
+def parse_repository(raw_result: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Repository root URL, UUID and the entry's URL from `svn info --xml`."""
+    entry = ET.fromstring(raw_result).find("entry")
+    if entry is None:
+        return None, None, None
+    return (entry.findtext("repository/root"), entry.findtext("repository/uuid"),
+            entry.findtext("url"))
+
+
+def parse_diff_summary(raw_result: str, root_url: str) -> List[Change]:
+    """Changed paths from `svn diff --summarize --xml`, as repository paths."""
+    changes: List[Change] = []
+    for path_element in ET.fromstring(raw_result).iter("path"):
+        url = path_element.text or ""
+        item = path_element.get("item", "none")
+        # "none" means only the properties changed
+        status = status_to_char.get(item, "M") if item != "none" else "M"
+        changes.append(Change(status, unquote(url[len(root_url):])))
+    return changes
+
+
+def parse_base(raw_result: str) -> Tuple[Optional[str], Optional[int]]:
+    """URL and BASE revision of a working copy item from `svn info --xml`."""
+    entry = ET.fromstring(raw_result).find("entry")
+    if entry is None or "revision" not in entry.attrib:
+        return None, None
+    return entry.findtext("url"), int(entry.attrib["revision"])
+
+
+def parse_list(raw_result: str) -> List[ListEntry]:
+    """Children listed by `svn list --xml`, directories first, each group by name."""
+    entries = []
+    for entry in ET.fromstring(raw_result).iter("entry"):
+        name = entry.findtext("name") or ""
+        if name in ("", "."):
+            continue
+        commit = entry.find("commit")
+        size = entry.findtext("size")
+        entries.append(ListEntry(
+            name,
+            entry.get("kind", "file"),
+            int(size) if size is not None else None,
+            int(commit.get("revision", 0)) if commit is not None else None,
+            commit.findtext("author") if commit is not None else None,
+            commit.findtext("date") if commit is not None else None,
+        ))
+    entries.sort(key=lambda e: (e.kind != "dir", e.name))
+    return entries
@@ -0,0 +1,13 @@
+from lazysvn.blame_view import split_lines
+
+
+def test_split_lines_at_line_feeds_only():
+    text = "a\x0bb\nc\x0cd\x1e\n e\x85\n"
+
+    assert split_lines(text) == ["a\x0bb", "c\x0cd\x1e", " e\x85"]
+
+
+def test_split_lines_crlf_and_trailing_text():
+    assert split_lines("a\r\nb\r\nc") == ["a", "b", "c"]
+    assert split_lines("a\n\n") == ["a", ""]
+    assert split_lines("") == []
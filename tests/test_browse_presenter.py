@@ -0,0 +1,39 @@
+from unittest.mock import MagicMock
+from lazysvn.browse_presenter import BrowsePresenter
+from lazysvn.svn_xml import ListEntry
+
+
+ENTRIES = [ListEntry("a.py", "file", 10, 5, "ann", "2024-01-01T00:00:00.000000Z")]
+
+
+def make_presenter():
+    view = MagicMock()
+    presenter = BrowsePresenter(view, MagicMock())
+    presenter.refresh()
+    presenter.show_revision(120)
+    return presenter, view
+
+
+def test_listings_from_before_a_refresh_are_dropped():
+    presenter, view = make_presenter()
+    node = MagicMock(id=1, data=("/trunk", None))
+    presenter.on_node_expanded(node)
+    generation = view.run_worker.call_args.args[0].args[-1]
+
+    # r at an unchanged HEAD replaces every node
+    presenter.refresh()
+    presenter.show_revision(120)
+    presenter.show_children(node, generation, ENTRIES)
+
+    view.set_node_children.assert_not_called()
+
+
+def test_listings_for_current_nodes_are_shown():
+    presenter, view = make_presenter()
+    node = MagicMock(id=1, data=("/trunk", None))
+    presenter.on_node_expanded(node)
+    generation = view.run_worker.call_args.args[0].args[-1]
+
+    presenter.show_children(node, generation, ENTRIES)
+
+    view.set_node_children.assert_called_once_with(node, ENTRIES)
@@ -0,0 +1,74 @@
+from lazysvn.diff_panel import DiffDocument
+
+
+def lines(document):
+    return [document.line(i) for i in range(document.line_count)]
+
+
+def test_lines_without_trailing_newline():
+    document = DiffDocument("a\nbb\nccc")
+
+    assert lines(document) == ["a", "bb", "ccc"]
+    assert document.max_width == 3
+
+
+def test_crlf_lines_drop_the_carriage_return():
+    document = DiffDocument("-foo bar\r\n+foo baz\r\n")
+
+    assert lines(document) == ["-foo bar", "+foo baz"]
+    assert document.max_width == 8
+
+
+def test_width_counts_cells():
+    assert DiffDocument("+\tx\n").max_width == 9
+    assert DiffDocument("+中文\n").max_width == 5
+
+
+def test_streamed_text_splits_on_whole_lines():
+    document = DiffDocument()
+    document.append("@@ -1 +1 @@\n-ol")
+    assert document.line_count == 1
+    document.append("d\n+new")
+    assert lines(document) == ["@@ -1 +1 @@", "-old"]
+    document.finish()
+
+    assert lines(document) == ["@@ -1 +1 @@", "-old", "+new"]
+    assert document.hunk_of(2) == 0
+
+
+HUNK = (
+    "Index: a.py\n"
+    "===\n"
+    "--- a.py\n"
+    "+++ a.py\n"
+    "@@ -1,3 +1,3 @@\n"
+    " context\n"
+    "-old value here\n"
+    "+new value here\n"
+    "-completely different\n"
+    "+1234 5678 90\n"
+)
+
+
+def test_hunk_word_spans_pair_removed_and_added_lines():
+    document = DiffDocument(HUNK)
+
+    spans = document.hunk_word_spans(document.hunk_of(6))
+
+    # offsets include the leading -/+; the unrelated pair gets none
+    assert spans == {6: [(1, 4)], 7: [(1, 4)]}
+
+
+def test_hunk_word_spans_wait_for_the_whole_hunk():
+    document = DiffDocument()
+    document.append(HUNK[:HUNK.index("-completely")])
+
+    assert document.hunk_word_spans(0) is None
+    document.append(HUNK[HUNK.index("-completely"):])
+    assert document.hunk_word_spans(0) == {6: [(1, 4)], 7: [(1, 4)]}
+
+
+def test_word_diff_skips_large_hunks():
+    document = DiffDocument("@@ -1,1500 +1,1500 @@\n-a b\n+a c\n")
+
+    assert document.hunk_word_spans(0) == {}
@@ -0,0 +1,70 @@
+from lazysvn.lineage import CopyIndex
+from lazysvn.svn_xml import Copy
+
+
+BRANCH = Copy(50, "/branches/rel", "/trunk", 49)
+TAG = Copy(80, "/tags/1.0", "/branches/rel", 79)
+REBRANCH = Copy(90, "/branches/rel", "/trunk", 89)
+
+
+def make_index():
+    index = CopyIndex()
+    index.add([TAG, BRANCH])
+    index.add([REBRANCH])
+    return index
+
+
+def test_add_ignores_copies_seen_before():
+    index = make_index()
+    index.add([BRANCH, TAG])
+
+    assert len(index) == 3
+    assert index.copies_in(50) == [BRANCH]
+    assert index.copies_in(51) == []
+
+
+def test_origin_of_a_path_below_the_copy():
+    index = make_index()
+
+    assert index.origin("/branches/rel/src/a.py", 60) == (BRANCH, "/trunk/src/a.py")
+
+
+def test_origin_picks_the_newest_copy_at_the_revision():
+    index = make_index()
+
+    assert index.origin("/branches/rel", 89) == (BRANCH, "/trunk")
+    assert index.origin("/branches/rel", 95) == (REBRANCH, "/trunk")
+    assert index.origin("/branches/rel", 49) is None
+    assert index.origin("/trunk/a.py", 100) is None
+
+
+def test_lineage_follows_every_copy():
+    index = make_index()
+
+    assert index.lineage("/tags/1.0/a.py", 85) == [
+        ("/tags/1.0/a.py", 85),
+        ("/branches/rel/a.py", 79),
+        ("/trunk/a.py", 49),
+    ]
+
+
+def test_lineage_stops_on_a_cycle():
+    index = CopyIndex()
+    index.add([Copy(10, "/a", "/b", 10), Copy(10, "/b", "/a", 10)])
+
+    assert len(index.lineage("/a", 12)) == CopyIndex.MAX_HOPS + 1
+
+
+def test_copies_from_newest_first():
+    index = make_index()
+
+    assert index.copies_from("/trunk") == [REBRANCH, BRANCH]
+    assert index.copies_from("/branches/rel") == [TAG]
+
+
+def test_clear():
+    index = make_index()
+    index.clear()
+
+    assert len(index) == 0
+    assert index.origin("/branches/rel", 95) is None
@@ -0,0 +1,107 @@
+import threading
+from lazysvn.operation_queue import OperationQueue, StagingOperation, STAGE, UNSTAGE
+from lazysvn.svn_xml import Change
+
+
+class Recorder:
+    def __init__(self, block_first=False):
+        self.applied = []
+        self.done = []
+        self.release = threading.Event()
+        if not block_first:
+            self.release.set()
+        self.started = threading.Event()
+        # set after the last batch is reported, which is after the queue idles
+        self.drained = threading.Event()
+
+    def apply_batch(self, batch):
+        self.started.set()
+        self.release.wait(5)
+        self.applied.append(batch)
+
+    def on_batch_done(self, batch, error, drained):
+        self.done.append((batch, error, drained))
+        if drained:
+            self.drained.set()
+
+
+def make_queue(recorder):
+    return OperationQueue(recorder.apply_batch, recorder.on_batch_done)
+
+
+def test_runs_queued_operations_as_one_batch():
+    recorder = Recorder()
+    queue = make_queue(recorder)
+    operations = [StagingOperation(STAGE, Change("M", "a.py")),
+                  StagingOperation(STAGE, Change("M", "b.py"))]
+
+    assert queue.enqueue(operations) == []
+    assert recorder.drained.wait(5)
+    assert queue.is_idle
+    assert recorder.applied == [operations]
+    assert recorder.done == [(operations, None, True)]
+
+
+def test_opposite_operations_cancel_out():
+    recorder = Recorder(block_first=True)
+    queue = make_queue(recorder)
+    queue.enqueue([StagingOperation(STAGE, Change("M", "busy.py"))])
+    assert recorder.started.wait(5)
+
+    stage = StagingOperation(STAGE, Change("A", "new.py"))
+    unstage = StagingOperation(UNSTAGE, Change("A", "new.py"))
+    queue.enqueue([stage])
+    cancelled = queue.enqueue([unstage])
+    recorder.release.set()
+
+    assert cancelled == [stage]
+    assert queue.wait_until_idle(5)
+    assert [op.change.path for batch in recorder.applied for op in batch] == ["busy.py"]
+
+
+def test_same_operation_twice_keeps_the_latest():
+    recorder = Recorder(block_first=True)
+    queue = make_queue(recorder)
+    queue.enqueue([StagingOperation(STAGE, Change("M", "busy.py"))])
+    assert recorder.started.wait(5)
+
+    queue.enqueue([StagingOperation(STAGE, Change("M", "a.py"))])
+    queue.enqueue([StagingOperation(STAGE, Change("?", "a.py"))])
+    assert [op.change for op in queue.outstanding] == [
+        Change("M", "busy.py"), Change("?", "a.py")]
+    recorder.release.set()
+    assert queue.wait_until_idle(5)
+    assert recorder.applied[1] == [StagingOperation(STAGE, Change("?", "a.py"))]
+
+
+def test_reports_errors_and_keeps_draining():
+    done = []
+    drained = threading.Event()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def apply_batch(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise RuntimeError("svn failed")
+
+    def on_batch_done(*args):
+        done.append(args)
+        if args[2]:
+            drained.set()
+
+    queue = OperationQueue(apply_batch, on_batch_done)
+    first = [StagingOperation(STAGE, Change("M", "a.py"))]
+    second = [StagingOperation(UNSTAGE, Change("M", "b.py"))]
+    queue.enqueue(first)
+    assert started.wait(5)
+    queue.enqueue(second)
+    release.set()
+
+    assert drained.wait(5)
+    assert calls == [first, second]
+    assert str(done[0][1]) == "svn failed" and done[0][2] is False
+    assert done[1] == (second, None, True)
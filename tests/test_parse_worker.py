@@ -0,0 +1,73 @@
+import subprocess
+import pytest
+from lazysvn import parse_worker
+from lazysvn.parse_worker import pack_columns, unpack_columns, unpack_log, unpack_status
+from lazysvn.svn_xml import parse_log, parse_status
+
+
+LOG_XML = (
+    '<?xml version="1.0"?><log>'
+    '<logentry revision="51"><author>ann</author><date>2024-01-02T10:00:00.000000Z</date>'
+    '<paths><path action="M" kind="file">/trunk/a.py</path>'
+    '<path action="A" kind="file">/trunk/ü.py</path></paths>'
+    '<msg>two\nlines</msg></logentry>'
+    '<logentry revision="50"><author>bob</author><date>2024-01-01T10:00:00.000000Z</date>'
+    '<paths><path action="A" kind="dir" copyfrom-path="/trunk" copyfrom-rev="49">'
+    '/branches/rel</path></paths><msg></msg></logentry>'
+    '<logentry revision="49"><date>2024-01-01T09:00:00.000000Z</date><msg>no author</msg>'
+    '</logentry>'
+    '</log>')
+
+
+def fake_run(stdout):
+    def run(cmd):
+        return subprocess.CompletedProcess(cmd, 0, stdout, "")
+    return run
+
+
+def test_columns_round_trip():
+    blob = pack_columns([
+        ("text", ["a", None, "", "ü\nx"]),
+        ("number", [1, -2, 2 ** 40]),
+        ("empty", []),
+    ])
+    columns = unpack_columns(blob)
+
+    assert columns["text"] == ["a", None, "", "ü\nx"]
+    assert list(columns["number"]) == [1, -2, 2 ** 40]
+    assert columns["empty"] == []
+
+
+def test_log_matches_parsing_in_process(monkeypatch):
+    monkeypatch.setattr(parse_worker, "_run", fake_run(LOG_XML))
+
+    returncode, _, stdout_size, blob = parse_worker.run_log(["svn", "log"])
+
+    assert returncode == 0
+    assert stdout_size == len(LOG_XML)
+    assert unpack_log(blob) == parse_log(LOG_XML)
+
+
+def test_status_matches_parsing_in_process(monkeypatch, tmp_path):
+    wc = str(tmp_path)
+    status_xml = (
+        f'<status><target path="{wc}">'
+        f'<entry path="{wc}/a.py"><wc-status item="modified"/></entry>'
+        f'<entry path="{wc}/new.txt"><wc-status item="unversioned"/></entry>'
+        '</target><changelist name="staged">'
+        f'<entry path="{wc}/b.py"><wc-status item="added"/></entry>'
+        '</changelist></status>')
+    monkeypatch.setattr(parse_worker, "_run", fake_run(status_xml))
+
+    for hide_unversioned in (True, False):
+        _, _, _, blob = parse_worker.run_status(["svn", "status"], wc, hide_unversioned)
+        assert unpack_status(blob) == parse_status(status_xml, wc, hide_unversioned)
+
+
+@pytest.mark.parametrize("run", [parse_worker.run_log, parse_worker.run_status])
+def test_failures_pass_stderr_back(monkeypatch, run):
+    monkeypatch.setattr(parse_worker, "_run", lambda cmd: subprocess.CompletedProcess(
+            cmd, 1, "", "svn: E155007: not a working copy"))
+    args = (["svn"],) if run is parse_worker.run_log else (["svn"], "/wc", True)
+
+    assert run(*args) == (1, "svn: E155007: not a working copy", 0, b"")
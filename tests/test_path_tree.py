@@ -0,0 +1,110 @@
+import random
+from lazysvn.path_tree import PathTree
+from lazysvn.svn_xml import Change
+
+
+def labels(tree):
+    return [(depth, label) for depth, label, _ in tree.rows()]
+
+
+def counts(node):
+    return {status: count for status, count in node.counts.items() if count}
+
+
+def test_rows_collapse_single_directory_chains():
+    tree = PathTree([Change("M", "trunk/src/a.py"), Change("A", "trunk/src/b.py"),
+                     Change("M", "trunk/README")], expanded=True)
+
+    assert labels(tree) == [(0, "trunk"), (1, "src"), (2, "a.py"), (2, "b.py"), (1, "README")]
+
+
+def test_only_expanded_directories_have_rows():
+    tree = PathTree([Change("M", "a/x.py"), Change("M", "b/y.py")])
+    assert labels(tree) == [(0, "a"), (0, "b")]
+
+    a = tree.rows()[0][2]
+    tree.toggle(a)
+    assert labels(tree) == [(0, "a"), (1, "x.py"), (0, "b")]
+    tree.toggle(a)
+    assert labels(tree) == [(0, "a"), (0, "b")]
+
+
+def test_counts_per_status():
+    tree = PathTree([Change("M", "a/x.py"), Change("M", "a/b/y.py"),
+                     Change("?", "a/b/z.py"), Change("D", "c.py")])
+
+    assert tree.root.count == 4
+    assert counts(tree.root) == {"M": 2, "?": 1, "D": 1}
+    a = tree.root.children[0]
+    assert counts(a) == {"M": 2, "?": 1}
+    assert counts(a.children[0]) == {"M": 1, "?": 1}
+
+
+def test_update_applies_only_the_difference():
+    tree = PathTree([Change("M", "a/x.py"), Change("M", "a/y.py"), Change("?", "b/z.py")])
+    a = tree.root.children[0]
+    tree.toggle(a)
+
+    tree.update([Change("M", "a/x.py"), Change("A", "a/y.py"), Change("M", "c/w.py")])
+
+    # the expanded node survived the update
+    assert tree.root.children[0] is a
+    assert tree.is_expanded(a)
+    assert counts(a) == {"M": 1, "A": 1}
+    assert counts(tree.root) == {"M": 2, "A": 1}
+    assert labels(tree) == [(0, "a"), (1, "x.py"), (1, "y.py"), (0, "c")]
+
+
+def test_update_matches_a_tree_built_from_scratch():
+    rng = random.Random(7)
+    paths = [f"d{rng.randrange(5)}/s{rng.randrange(5)}/f{i}.py" for i in range(300)]
+    tree = PathTree()
+    for _ in range(10):
+        changes = [Change(rng.choice("MAD?"), path)
+                   for path in rng.sample(paths, rng.randrange(len(paths)))]
+        tree.update(changes)
+        expected = PathTree(changes)
+
+        assert tree.root.count == expected.root.count == len(changes)
+        assert counts(tree.root) == counts(expected.root)
+        for node, expected_node in zip(tree.root.children, expected.root.children):
+            assert node.path == expected_node.path
+            assert counts(node) == counts(expected_node)
+
+
+def test_removing_the_last_change_removes_the_directory():
+    tree = PathTree([Change("M", "a/x.py"), Change("M", "b/y.py")])
+    tree.root.children
+
+    tree.update([Change("M", "b/y.py")])
+
+    assert [child.name for child in tree.root.children] == ["b"]
+
+
+def test_changes_lists_the_whole_subtree():
+    changes = [Change("M", "a/x.py"), Change("A", "a/b"), Change("A", "a/b/y.py"),
+               Change("M", "c.py")]
+    tree = PathTree(changes)
+    a = tree.root.children[0]
+
+    assert sorted(a.changes()) == sorted(changes[:3])
+    a.children
+    assert sorted(a.changes()) == sorted(changes[:3])
+
+
+def test_windows_separators_share_directories():
+    tree = PathTree([Change("M", "a\\x.py"), Change("M", "a/y.py")], expanded=True)
+
+    assert labels(tree) == [(0, "a"), (1, "x.py"), (1, "y.py")]
+
+
+def test_toggling_a_nested_directory_of_an_expanded_tree():
+    tree = PathTree([Change("M", "a/b/c/x"), Change("M", "a/b/d/y"), Change("M", "a/z"),
+                     Change("M", "q/r")], expanded=True)
+    c = next(node for _, label, node in tree.rows() if label == "c")
+
+    tree.toggle(c)
+
+    assert labels(tree) == [(0, "a"), (1, "b"), (2, "c"), (2, "d"), (3, "y"), (1, "z"),
+                            (0, "q"), (1, "r")]
+    assert not tree.is_expanded(c)
@@ -0,0 +1,115 @@
+import pytest
+from lazysvn.svn_backend import CommandResult
+from lazysvn.svn_model import SvnModel, fold_actions
+from lazysvn.svn_xml import Change
+
+
+ROOT = "file:///repo"
+
+
+class LogBackend:
+    """Serves svn info and svn log for a trunk where every revision modifies
+    one file, and answers svn diff --summarize with a marker entry."""
+
+    def __init__(self, head: int, copies=None):
+        self.head = head
+        # revision -> (copied path, copied from path)
+        self.copies = copies or {}
+        self.commands = []
+
+    def run(self, cmd):
+        self.commands.append(cmd)
+        subcommand, args = cmd[2], cmd[3:]
+        if subcommand == "info":
+            return CommandResult(
+                f'<info><entry revision="{self.head}"><url>{ROOT}/trunk</url>'
+                f'<repository><root>{ROOT}</root><uuid>u-1</uuid></repository>'
+                f'<commit revision="{self.head}"/></entry></info>', "", 0)
+        if subcommand == "log":
+            return CommandResult(self.log_xml(args), "", 0)
+        if subcommand == "diff":
+            return CommandResult(
+                '<diff><paths><path item="modified" kind="file">'
+                f'{ROOT}/trunk/from-svn.py</path></paths></diff>', "", 0)
+        return CommandResult("", f"unexpected {cmd}", 1)
+
+    def log_xml(self, args):
+        high, low = self.head, 1
+        if "-r" in args:
+            bounds = [self.head if bound == "HEAD" else int(bound)
+                      for bound in args[args.index("-r") + 1].split(":")]
+            high, low = max(bounds), min(bounds)
+        limit = int(args[args.index("-l") + 1]) if "-l" in args else high
+        entries = "".join(
+            f'<logentry revision="{revision}"><author>a</author>'
+            '<date>2024-01-01T00:00:00.000000Z</date><paths>'
+            f'<path action="M" kind="file">/trunk/f{revision}.py</path>'
+            f'{self.copy_xml(revision)}</paths><msg></msg></logentry>'
+            for revision in range(high, low - 1, -1)[:limit])
+        return f"<log>{entries}</log>"
+
+    def copy_xml(self, revision):
+        if revision not in self.copies:
+            return ""
+        path, from_path = self.copies[revision]
+        return (f'<path action="A" kind="dir" copyfrom-path="{from_path}" '
+                f'copyfrom-rev="{revision - 1}">{path}</path>')
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    backend = LogBackend(head=1000)
+    return SvnModel(str(tmp_path / "wc"), None, None, backend=backend), backend
+
+
+def ran_diff(backend) -> bool:
+    return any(cmd[2] == "diff" for cmd in backend.commands)
+
+
+def test_fold_actions():
+    assert fold_actions(["M", "M"]) == "M"
+    assert fold_actions(["A", "M"]) == "A"
+    assert fold_actions(["A", "M", "D"]) is None
+    assert fold_actions(["M", "D"]) == "D"
+    assert fold_actions(["D", "A"]) == "R"
+    assert fold_actions(["M", "R", "M"]) == "R"
+
+
+def test_summary_from_the_log_when_it_covers_the_range(model):
+    model, backend = model
+    model.fetch_log(limit=100)
+
+    changes = model.range_summary(950, 953)
+
+    assert changes == [Change("M", f"/trunk/f{revision}.py") for revision in (951, 952, 953)]
+    assert not ran_diff(backend)
+
+
+def test_summary_asks_svn_across_a_dropped_cache(model):
+    model, backend = model
+    model.fetch_log(limit=100)
+    assert model.drop_cache("log")
+    backend.head = 1005
+    assert len(model.fetch_new_logs()) == 5
+    assert model.fetch_more_logs(100)
+
+    # r901-1000 were dropped, so the log alone would miss them
+    changes = model.range_summary(850, 1003)
+
+    assert changes == [Change("M", "/trunk/from-svn.py")]
+    assert ran_diff(backend)
+
+
+def test_summary_asks_svn_when_a_directory_was_copied(model):
+    model, backend = model
+    backend.copies = {952: ("/trunk/lib", "/vendor/lib"), 960: ("/tags/1.0", "/trunk")}
+    model.fetch_log(limit=100)
+
+    # the copy to /tags/1.0 is outside the working copy and doesn't matter
+    assert not any(change.path == "/tags/1.0" for change in model.range_summary(955, 965))
+    assert not ran_diff(backend)
+
+    # the log would list /trunk/lib alone, svn lists its contents too
+    assert model.range_summary(950, 953) == [Change("M", "/trunk/from-svn.py")]
+    assert ran_diff(backend)
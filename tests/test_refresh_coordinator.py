@@ -0,0 +1,102 @@
+import threading
+from lazysvn.refresh_coordinator import RefreshCoordinator
+
+
+class BlockingFetch:
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Semaphore(0)
+        self.release = threading.Semaphore(0)
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        self.started.release()
+        assert self.release.acquire(timeout=5)
+        if self.error is not None:
+            raise self.error
+
+
+def collect(results, done):
+    def callback(error):
+        results.append(error)
+        done.release()
+    return callback
+
+
+def test_single_request_runs_one_fetch():
+    fetch = BlockingFetch()
+    coordinator = RefreshCoordinator(fetch)
+    results = []
+    done = threading.Semaphore(0)
+
+    coordinator.request(collect(results, done))
+    assert coordinator.in_flight
+    fetch.release.release()
+
+    assert done.acquire(timeout=5)
+    assert results == [None]
+    assert fetch.calls == 1
+
+
+def test_requests_during_a_fetch_share_one_follow_up():
+    fetch = BlockingFetch()
+    coordinator = RefreshCoordinator(fetch)
+    first, queued = [], []
+    done = threading.Semaphore(0)
+
+    coordinator.request(collect(first, done))
+    assert fetch.started.acquire(timeout=5)
+    queued_callback = collect(queued, done)
+    for _ in range(5):
+        coordinator.request(queued_callback)
+    coordinator.request()
+
+    fetch.release.release()
+    assert done.acquire(timeout=5)
+    assert fetch.started.acquire(timeout=5)
+    fetch.release.release()
+    assert done.acquire(timeout=5)
+
+    assert fetch.calls == 2
+    assert first == [None]
+    # a callback requested several times is called back once per run
+    assert queued == [None]
+
+
+def test_each_run_reports_its_own_error():
+    fetch = BlockingFetch()
+    coordinator = RefreshCoordinator(fetch)
+    first, second = [], []
+    done = threading.Semaphore(0)
+    error = RuntimeError("svn status failed")
+
+    fetch.error = error
+    coordinator.request(collect(first, done))
+    assert fetch.started.acquire(timeout=5)
+    coordinator.request(collect(second, done))
+    fetch.release.release()
+    assert done.acquire(timeout=5)
+
+    fetch.error = None
+    assert fetch.started.acquire(timeout=5)
+    fetch.release.release()
+    assert done.acquire(timeout=5)
+
+    assert first == [error]
+    assert second == [None]
+
+
+def test_request_after_completion_starts_a_new_fetch():
+    fetch = BlockingFetch()
+    coordinator = RefreshCoordinator(fetch)
+    results = []
+    done = threading.Semaphore(0)
+
+    for _ in range(2):
+        coordinator.request(collect(results, done))
+        fetch.release.release()
+        assert done.acquire(timeout=5)
+
+    assert fetch.calls == 2
+    assert results == [None, None]
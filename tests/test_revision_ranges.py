@@ -0,0 +1,44 @@
+from lazysvn.revision_ranges import RevisionRanges
+
+
+def test_parse_merges_adjacent_revisions():
+    ranges = RevisionRanges.parse("r1\nr2\nr3*\nr7\nr9\nr8\n")
+
+    assert ranges.ranges == [(1, 3), (7, 9)]
+    assert len(ranges) == 6
+    assert ranges.format() == "r7-9, r1-3"
+
+
+def test_parse_ignores_other_output():
+    assert RevisionRanges.parse("") == RevisionRanges()
+    assert RevisionRanges.parse("svn: warning\nr5\n").ranges == [(5, 5)]
+
+
+def test_contains():
+    ranges = RevisionRanges([(1, 3), (7, 9)])
+
+    assert [revision for revision in range(12) if revision in ranges] == [1, 2, 3, 7, 8, 9]
+
+
+def test_overlapping_ranges_are_merged():
+    assert RevisionRanges([(5, 10), (1, 6), (12, 12), (11, 11)]).ranges == [(1, 12)]
+
+
+def test_union():
+    left = RevisionRanges([(1, 3)])
+    right = RevisionRanges.from_revisions([4, 8])
+
+    assert left.union(right).ranges == [(1, 4), (8, 8)]
+    # neither side changes
+    assert left.ranges == [(1, 3)]
+
+
+def test_covers():
+    ranges = RevisionRanges([(801, 900), (1001, 1005)])
+
+    assert ranges.covers(801, 900)
+    assert ranges.covers(850, 850)
+    assert not ranges.covers(850, 1003)
+    assert not ranges.covers(700, 801)
+    assert ranges.covers(5, 4)
+    assert not RevisionRanges().covers(1, 1)
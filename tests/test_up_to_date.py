@@ -0,0 +1,70 @@
+import pytest
+from lazysvn.svn_backend import CommandResult
+from lazysvn.svn_model import SvnModel
+from lazysvn.svn_xml import Change
+
+
+class UpToDateBackend:
+    """Answers the up-to-date check: svnversion, info -r HEAD and status -u."""
+
+    def __init__(self, svnversion, head: int, incoming: bool):
+        self.svnversion = svnversion
+        self.head = head
+        self.incoming = incoming
+        self.commands = []
+
+    def run(self, cmd):
+        self.commands.append(cmd)
+        wc = cmd[-1]
+        if cmd[0] == "svnversion":
+            if self.svnversion is None:
+                raise FileNotFoundError("svnversion")
+            return CommandResult(self.svnversion, "", 0)
+        subcommand = cmd[2]
+        if subcommand == "info":
+            return CommandResult(
+                f'<info><entry revision="{self.head}" path="{wc}">'
+                f'<commit revision="{self.head}"/></entry></info>', "", 0)
+        if subcommand == "status":
+            entry = (f'<entry path="{wc}/sub/a.py"><wc-status item="normal"/>'
+                     '<repos-status item="modified"/></entry>') if self.incoming else ""
+            return CommandResult(
+                f'<status><target path="{wc}">{entry}'
+                f'<against revision="{self.head}"/></target></status>', "", 0)
+        return CommandResult("", f"unexpected {cmd}", 1)
+
+
+def make_model(tmp_path, monkeypatch, backend):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return SvnModel(str(tmp_path / "wc"), None, None, backend=backend)
+
+
+def ran_status(backend) -> bool:
+    return any(cmd[0] == "svn" and cmd[2] == "status" for cmd in backend.commands)
+
+
+def test_single_revision_working_copy_at_head_skips_status(tmp_path, monkeypatch):
+    backend = UpToDateBackend("120", head=120, incoming=False)
+    model = make_model(tmp_path, monkeypatch, backend)
+
+    assert model.is_up_to_date()
+    assert not ran_status(backend)
+
+
+def test_mixed_revision_working_copy_asks_status(tmp_path, monkeypatch):
+    # the root is at 120 but a subtree is still at 100, and HEAD changed it since
+    backend = UpToDateBackend("100:120M", head=120, incoming=True)
+    model = make_model(tmp_path, monkeypatch, backend)
+
+    assert not model.is_up_to_date()
+    assert ran_status(backend)
+    assert model.incoming_changes == [Change("M", "sub/a.py")]
+
+
+@pytest.mark.parametrize("svnversion", [None, "Unversioned directory"])
+def test_unknown_revision_range_asks_status(tmp_path, monkeypatch, svnversion):
+    backend = UpToDateBackend(svnversion, head=120, incoming=False)
+    model = make_model(tmp_path, monkeypatch, backend)
+
+    assert model.is_up_to_date()
+    assert ran_status(backend)